@@ -0,0 +1,130 @@
+"""
+Micro-benchmark and accuracy check of c_variable_counter.
+
+Counts the variables and functions of large generated C files with the current tokenizer-based
+counter and with the previous per-line regex counter (reproduced below as `legacy_counter`) and
+prints the throughput of both, in lines per second. Before that, both counters run over a small
+accuracy corpus of hand-counted snippets and the disagreements are printed.
+
+    python benchmarks/c_counter_benchmark.py --files 20 --lines 20000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import c_source
+from perfeq.helpers.c_variable_counter import c_variable_counter
+
+# (description, source, expected variables, expected functions)
+ACCURACY_CORPUS = [
+    ("globals", "int a = 1;\nfloat b;\nchar c = 'x';", 3, 0),
+    ("several declarators", "int a, b = f(1, 2), *c;", 3, 0),
+    ("array declarations", "char name[100];\nint values[3] = {1, 2, 3}, n;", 3, 0),
+    ("pointer declaration", "static const char *name = \"a;b\";", 1, 0),
+    ("multi-line declaration", "unsigned long\n    total =\n    0;", 1, 0),
+    ("declaration in a comment", "/* int a; */\n// int b;\nint c;", 1, 0),
+    ("declaration in a string", "char *s = \"int a; int b;\";", 1, 0),
+    ("declaration in a macro", "#define DECLARE(x) \\\n    int x;\nint y;", 1, 0),
+    ("prototypes", "void f();\nint g(int a, char *b);", 0, 2),
+    ("multi-line definition", "static int\nsum(int a,\n    int b)\n{\n    return a + b;\n}", 0, 1),
+    ("brace on the same line", "int main(void) {\n    return 0;\n}", 0, 1),
+    ("locals and statements", "int main() {\n    int x = 0;\n    x = x * 2;\n    printf(\"%d\", x);\n    return x;\n}", 1, 1),
+    ("for initialization", "void f() {\n    for (int i = 0; i < 10; i++) {}\n}", 1, 1),
+    ("typedef struct", "typedef struct {\n    int id;\n    char name[10];\n} record;", 3, 0),
+    ("struct with variables", "struct point { int x, y; } origin;", 4, 0),
+    ("forward declaration", "struct node;", 0, 0),
+    ("enum", "enum color {RED, GREEN};\nenum color c;", 1, 0),
+    ("struct initializer", "record r = {1, \"a\"};", 1, 0),
+]
+
+
+def legacy_counter(code):
+    """
+    The counter used before the tokenizer-based one: matches three regular expressions
+    against each stripped line of the code.
+    """
+    function_pattern = re.compile(r'^[\w\s\*]+[\w\*]+\s*\([\w\s,]*\)\s*[{;]?$', re.MULTILINE)
+    variable_pattern = re.compile(r"\b(?!struct\b)([a-zA-Z_]\w*)\b\s+([a-zA-Z_]\w*(?:\s*,\s*[a-zA-Z_]\w*)*)\s*(;|=)")
+    struct_pattern = re.compile(r'^\s*(typedef\s+)?struct(\s+\w+)?(\s*(\{[^}]*\})?)?\s*?', re.MULTILINE | re.DOTALL)
+
+    function_count = 0
+    variable_count = 0
+    for line in code.splitlines():
+        line = line.strip()
+        if function_pattern.match(line):
+            function_count += 1
+        elif variable_pattern.match(line):
+            declarations = variable_pattern.match(line).group(2)
+            variable_count += len([var.strip() for var in declarations.split(',') if var.strip()])
+        elif struct_pattern.match(line):
+            variable_count += 1
+    return variable_count, function_count
+
+
+def check_accuracy():
+    """
+    Runs both counters over the accuracy corpus and prints the snippets where they miss the expected counts.
+
+    Returns:
+        int: The number of snippets the current counter gets wrong.
+    """
+    errors = {"legacy": 0, "current": 0}
+    print(f"{'snippet':<28}{'expected':>10}{'legacy':>10}{'current':>10}")
+    for description, source, variables, functions in ACCURACY_CORPUS:
+        expected = (variables, functions)
+        legacy = legacy_counter(source)
+        current = c_variable_counter(source)
+        errors["legacy"] += legacy != expected
+        errors["current"] += current != expected
+        if legacy != expected or current != expected:
+            print(f"{description:<28}{str(expected):>10}{str(legacy):>10}{str(current):>10}")
+    print(f"wrong counts: legacy {errors['legacy']}, current {errors['current']} of {len(ACCURACY_CORPUS)} snippets\n")
+    return errors["current"]
+
+
+def measure(counter, sources, repeat):
+    """
+    Returns the best wall time, in seconds, of `repeat` runs of `counter` over every source.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for source in sources:
+            counter(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if check_accuracy():
+        raise SystemExit("The current counter misses the expected counts")
+
+    rng = random.Random(args.seed)
+    sources = [c_source(args.lines, rng) for _ in range(args.files)]
+    total_lines = sum(source.count("\n") for source in sources)
+    legacy = [legacy_counter(source) for source in sources]
+    current = [c_variable_counter(source) for source in sources]
+    if legacy != current:
+        print("note: the counters disagree on the generated files")
+
+    print(f"{args.files} files, {total_lines} lines")
+    before = measure(legacy_counter, sources, args.repeat)
+    after = measure(c_variable_counter, sources, args.repeat)
+    print(f"before: {total_lines / before:12.0f} lines/s")
+    print(f"after:  {total_lines / after:12.0f} lines/s ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Generation of synthetic Python and C corpora for the benchmarks.
+
+    python benchmarks/corpus.py /tmp/corpus --files 1000 --lines 200
+"""
+import argparse
+import os
+import random
+
+NAMES = ["user_name", "userAge", "total", "maxRetries", "file_path", "apiEndpoint", "x", "tempValue", "item_count"]
+FUNCTIONS = ["calculate_sum", "formatUser", "check_status", "updateBalance", "run", "ParseInput", "load_data"]
+C_TYPES = ["int", "float", "double", "char", "long"]
+
+
+def python_source(lines, rng):
+    """
+    Builds a Python source with about `lines` lines, mixing naming styles, assignments and functions.
+    """
+    body = ["import os", ""]
+    while len(body) < lines:
+        kind = rng.random()
+        if kind < 0.3:
+            name = rng.choice(FUNCTIONS) + str(len(body))
+            body += [f"def {name}(a, b):", '    """Docstring."""', f"    {rng.choice(NAMES)} = a + b", "    return a * b", ""]
+        elif kind < 0.8:
+            body.append(f"{rng.choice(NAMES)}{len(body)} = {rng.randint(0, 1000)}")
+        elif kind < 0.9:
+            body.append("if os.sep == '/' :  print('a very long line that goes past the limit of characters per line of pylint')")
+        else:
+            body.append(f"# comment {len(body)}")
+    return "\n".join(body[:lines]) + "\n"
+
+
+def c_source(lines, rng):
+    """
+    Builds a C source with about `lines` lines, mixing naming styles, declarations, structs and functions.
+    """
+    body = ["#include <stdio.h>", ""]
+    while len(body) < lines:
+        kind = rng.random()
+        if kind < 0.25:
+            name = rng.choice(FUNCTIONS) + str(len(body))
+            body += [f"int {name}(int a, int b) {{", f"    int {rng.choice(NAMES)} = a + b;", "    return a * b;", "}", ""]
+        elif kind < 0.75:
+            body.append(f"{rng.choice(C_TYPES)} {rng.choice(NAMES)}{len(body)} = {rng.randint(0, 1000)};")
+        elif kind < 0.85:
+            body += ["typedef struct {", f"    int {rng.choice(NAMES)};", f"}} info_{len(body)};", ""]
+        else:
+            body.append(f"void {rng.choice(FUNCTIONS)}{len(body)}();")
+    return "\n".join(body[:lines]) + "\n"
+
+
+def generate_corpus(directory, files, lines, languages=(".py", ".c"), seed=0, per_directory=1000):
+    """
+    Writes a synthetic corpus to `directory`.
+
+    Args:
+        directory (str): Destination directory. It is created if needed.
+        files (int): Number of files.
+        lines (int): Average number of lines per file (each file has between half and one and a half times it).
+        languages (tuple): Extensions of the generated files, used in turns.
+        seed (int): Seed of the random generator, so the same arguments always produce the same corpus.
+        per_directory (int): Maximum number of files per subdirectory.
+
+    Returns:
+        list: The paths of the generated files.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for index in range(files):
+        language = languages[index % len(languages)]
+        subdirectory = os.path.join(directory, f"part_{index // per_directory:04d}")
+        os.makedirs(subdirectory, exist_ok=True)
+        path = os.path.join(subdirectory, f"file_{index:06d}{language}")
+        size = max(1, rng.randint(lines // 2, lines + lines // 2))
+        source = python_source(size, rng) if language == ".py" else c_source(size, rng)
+        with open(path, "w", encoding="utf8") as file:
+            file.write(source)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--languages", default=".py,.c")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_corpus(args.directory, args.files, args.lines, tuple(args.languages.split(",")), args.seed)
+    print(f"{len(paths)} files written to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
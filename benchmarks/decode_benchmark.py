@@ -0,0 +1,143 @@
+"""
+Micro-benchmark of decode_output.
+
+Decodes synthetic cpplint outputs with the current single-pass decoder and with the previous
+multi-pass decoder (reproduced below as `legacy_decode`) and prints the throughput of both, in
+output lines per second. The naming_check outputs are no longer generated: the naming warnings
+are produced in-process by the NamingChecker and are not decoded.
+
+    python benchmarks/decode_benchmark.py --files 2000 --lines 200
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perfeq.helpers.analyzer_registry import get_analyzer
+from perfeq.helpers.analyzers_helper import decode_output
+from perfeq.models.quantity_info import QuantityInfo
+from perfeq.models.warning_message import WarningMessage
+from perfeq.utils.enums import TypesOfWarning
+
+
+def make_outputs(files, lines):
+    """
+    Builds synthetic cpplint outputs for `files` C files with `lines` output lines each.
+
+    Returns:
+        dict: The outputs by file, by analyzer name.
+    """
+    outputs = {}
+    for index in range(files):
+        path = f"C:\\corpus\\file_{index}.c"
+        cpplint = []
+        for line in range(1, lines):
+            cpplint.append(f"{path}:{line}:  Missing space before {{  [whitespace/braces] [5]")
+        outputs[path] = {"cpplint": "\n".join(cpplint)}
+    return outputs
+
+
+def legacy_decode(warnings):
+    """
+    The decoder used before the single-pass one: prefixes every line with its key, then runs
+    the naming_check and the cpplint decoders one after the other over the remaining lines.
+    """
+    decoded = {}
+    quantity_info = {}
+
+    def add(key, message, line, type_of_warning):
+        info = quantity_info.setdefault(key, QuantityInfo())
+        if type_of_warning == TypesOfWarning.FUNCTION:
+            info.warnings_functions_qty += 1
+        elif type_of_warning == TypesOfWarning.VARIABLE:
+            info.warnings_variables_qty += 1
+        else:
+            info.warnings_formatting_qty += 1
+        decoded.setdefault(key, []).append(WarningMessage(message, int(line), type_of_warning))
+
+    def process_warning(key, value):
+        return key, [key + ";" + line for output in value for line in output.splitlines() if line != '']
+
+    outputs = {}
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(process_warning, key, list(value.values())) for key, value in warnings.items()]
+        for future in as_completed(futures):
+            key, processed = future.result()
+            outputs.setdefault(key, []).extend(processed)
+
+    non_decoded = {}
+    for key, value in outputs.items():
+        for output in value:
+            if "WARN" in output:
+                message_line = output.split("WARN:")[1].split("]")
+                message = message_line[1].strip()
+                add(key, message, message_line[0].replace("[", "").strip(),
+                    TypesOfWarning.FUNCTION if "Functions" in message else TypesOfWarning.VARIABLE)
+            else:
+                non_decoded.setdefault(key, []).append(output)
+
+    for key, value in non_decoded.items():
+        for output in value:
+            if ".c" in output:
+                output = output.split(";", 1)[1].split(":", 1)
+                if len(output) < 2:
+                    continue
+                message_line = output[1].split(":", 1)[1].split(":")
+                if len(message_line) < 2:
+                    continue
+                add(key, message_line[1].strip(), message_line[0], TypesOfWarning.FORMATTING)
+    return decoded
+
+
+def single_pass_decode(warnings):
+    """
+    Decodes the outputs with `decode_output`, as the workers do when each analyzer finishes.
+    """
+    return {
+        key: [
+            warning_message
+            for name, output in outputs.items()
+            for warning_message in decode_output(get_analyzer(name), output)
+        ]
+        for key, outputs in warnings.items()
+    }
+
+
+def measure(decode, warnings, repeat):
+    """
+    Returns the best wall time, in seconds, of `repeat` runs of `decode`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(warnings)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings = make_outputs(args.files, args.lines)
+    total_lines = sum(output.count("\n") + 1 for outputs in warnings.values() for output in outputs.values())
+    legacy = sum(len(value) for value in legacy_decode(warnings).values())
+    current = sum(len(value) for value in single_pass_decode(warnings).values())
+    if legacy != current:
+        raise SystemExit(f"The decoders disagree: {legacy} warnings before, {current} after")
+
+    print(f"{total_lines} output lines, {current} warnings")
+    before = measure(legacy_decode, warnings, args.repeat)
+    after = measure(single_pass_decode, warnings, args.repeat)
+    print(f"before: {total_lines / before:12.0f} lines/s")
+    print(f"after:  {total_lines / after:12.0f} lines/s ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
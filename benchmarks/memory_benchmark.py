@@ -0,0 +1,92 @@
+"""
+Memory benchmark of the warning models.
+
+Builds the same synthetic warnings three times and prints the memory held by each representation,
+measured with tracemalloc:
+
+    legacy     one object with a __dict__ per warning and one copy of the message text per occurrence
+               (the WarningMessage used before, reproduced below as `LegacyWarningMessage`)
+    slotted    one slotted WarningMessage per warning, with interned message texts
+    columnar   the WarningStore of a run: typed arrays plus a table of distinct messages
+
+    python benchmarks/memory_benchmark.py --files 2000 --warnings 500
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perfeq.models.warning_message import WarningMessage
+from perfeq.models.warning_store import WarningStore
+from perfeq.utils.enums import TypesOfWarning
+
+NAMES = ["userName", "maxRetries", "apiEndpoint", "tempValue", "filePath"]
+
+
+class LegacyWarningMessage:
+    def __init__(self, message, line, type):
+        self.message = message
+        self.line = line
+        self.type = type
+
+
+def make_warnings(file_index, count):
+    """
+    Yields (message, line, type) tuples like the ones of a C file: mostly repeated cpplint messages
+    and some naming messages that mention an identifier. Every message is a new string, as the ones
+    returned by the decoders.
+    """
+    for line in range(1, count + 1):
+        if line % 4:
+            yield "".join(["Missing space before {  ", "[whitespace/braces] [5]"]), line, TypesOfWarning.FORMATTING
+        else:
+            name = f"{NAMES[line % len(NAMES)]}{file_index % 50}"
+            yield f"Variables should be named in snake_case or UPPER_CASE ({name})", line, TypesOfWarning.VARIABLE
+
+
+def build_legacy(files, count):
+    return [[LegacyWarningMessage(*warning) for warning in make_warnings(index, count)] for index in range(files)]
+
+
+def build_slotted(files, count):
+    return [[WarningMessage(*warning) for warning in make_warnings(index, count)] for index in range(files)]
+
+
+def build_columnar(files, count):
+    store = WarningStore()
+    for index in range(files):
+        store.add(f"file_{index}.c", [WarningMessage(*warning) for warning in make_warnings(index, count)])
+    return store
+
+
+def measure(build, files, count):
+    """
+    Returns the memory, in bytes, still held by the result of `build`.
+    """
+    tracemalloc.start()
+    result = build(files, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--warnings", type=int, default=500, help="number of warnings per file")
+    args = parser.parse_args()
+
+    total = args.files * args.warnings
+    print(f"{total} warnings in {args.files} files\n")
+    legacy = None
+    for name, build in (("legacy", build_legacy), ("slotted", build_slotted), ("columnar", build_columnar)):
+        size = measure(build, args.files, args.warnings)
+        legacy = legacy or size
+        print(f"{name:<10}{size / 2 ** 20:10.1f} MB{size / total:10.1f} bytes/warning{legacy / size:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Times each stage of the PerfeQ pipeline over a synthetic corpus and writes the results to a JSON file.
+
+    python benchmarks/run_benchmarks.py --files 10000 --lines 300 --output benchmark.json
+
+Each stage records its wall and CPU time and the RSS high-water mark of the process when it ends
+(which never decreases, so it is not the memory of the stage alone). With --trace-memory the
+peak of the memory allocated by each stage is also measured, with tracemalloc (much slower).
+
+Stages:
+    discovery      PathHelper.get_content (walk and read every file)
+    counters       SourceFile parsing, python_variable_counter / c_variable_counter and NamingChecker
+                   (only on the languages whose analyzers do not check names, as in the workers)
+    analyzers      analyzer execution and decoding in the workers (AnalysisEngine with one thread) over a
+                   sample of the files
+    decode         decode_output and complete_batch over synthetic analyzer outputs
+    emission       Code metrics, the corpus aggregator and the rows of --output-format, with the
+                   WarningStore of the JSONL and Parquet formats released after each file (as
+                   Perfeq.store_result does)
+
+The analyzers stage is skipped when cpplint or pylint are not installed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.decode_benchmark import make_outputs
+from perfeq.analyzer.engine import AnalysisEngine, count_variables
+from perfeq.helpers.analyzer_registry import get_analyzer, select_analyzers
+from perfeq.helpers.analyzers_helper import complete_batch, decode_output
+from perfeq.helpers.metrics_aggregator import MetricsAggregator
+from perfeq.helpers.naming_checker import NamingChecker
+from perfeq.helpers.path_helper import PathHelper
+from perfeq.helpers.profiler import peak_rss_kb
+from perfeq.helpers.result_writer import CsvResultWriter, JsonLinesResultWriter, ParquetResultWriter
+from perfeq.models.code import Code
+from perfeq.models.source_file import SourceFile
+from perfeq.models.warning_store import WarningStore
+from perfeq.utils.enums import LANGUAGES, Executors, OutputFormats
+
+
+class Stage:
+    def __init__(self, results, name, items):
+        """
+        Context manager that records the wall and CPU time of a stage in `results`.
+
+        Args:
+            results (dict): The dictionary where the stage is recorded, by name.
+            name (str): Name of the stage.
+            items (int): Number of items (files, lines...) processed by the stage.
+        """
+        self.results = results
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.traced = tracemalloc.get_traced_memory()[0]
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall
+        self.results[self.name] = {
+            "wall_seconds": wall,
+            "cpu_seconds": time.process_time() - self.cpu,
+            "items": self.items,
+            "items_per_second": self.items / wall if wall else None,
+            "process_max_rss_kb": peak_rss_kb(),
+        }
+        if tracemalloc.is_tracing():
+            self.results[self.name]["peak_allocated_kb"] = (tracemalloc.get_traced_memory()[1] - self.traced) // 1024
+        print(f"{self.name:<10} {wall:10.3f}s {self.items:>10} items")
+
+
+def analyzers_available():
+    """
+    Checks whether the analyzers used by PerfeQ are installed.
+
+    Returns:
+        str: None if they are all installed, otherwise the reason why the analyzers stage is skipped.
+    """
+    missing = [command for command in ("cpplint",) if shutil.which(command) is None]
+    try:
+        import pylint  # noqa: F401
+    except ImportError:
+        missing.append("pylint")
+    return f"not installed: {', '.join(missing)}" if missing else None
+
+
+def open_writer(directory, output_format):
+    """
+    Opens the writer of an output format the way Perfeq.open_writer does: only the formats with a table
+    of warnings go through a WarningStore.
+
+    Args:
+        directory (str): The results directory.
+        output_format (OutputFormats): The output format.
+
+    Returns:
+        tuple: The result writer and its WarningStore, or None for the CSV format.
+    """
+    def path(name):
+        return os.path.join(directory, f"{name}.{output_format.value}")
+
+    if output_format == OutputFormats.CSV:
+        return CsvResultWriter(path("perfeq_output")), None
+    store = WarningStore()
+    writer_class = JsonLinesResultWriter if output_format == OutputFormats.JSONL else ParquetResultWriter
+    return writer_class(path("perfeq_output"), path("perfeq_warnings"), path("perfeq_messages"), store), store
+
+
+def run(args):
+    stages = {}
+    skipped = {}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, "corpus")
+        generate_corpus(corpus, args.files, args.lines, tuple(args.languages.split(",")), args.seed)
+
+        with Stage(stages, "discovery", args.files):
+            codes = PathHelper(corpus).get_content(parallel=True)
+
+        counts = {}
+        naming_warnings = {}
+        # Como nos workers, o verificador de nomes só roda nas linguagens cujos analisadores não verificam os nomes
+        analyzers = select_analyzers()
+        checkers = {
+            language: NamingChecker(language)
+            for language in LANGUAGES.values()
+            if not any(analyzer.checks_naming for analyzer in analyzers[language])
+        }
+        with Stage(stages, "counters", len(codes)):
+            for code in codes:
+                language = LANGUAGES[code['language']]
+                source = SourceFile(code['path'], language, code['file'])
+                identifiers = []
+                counts[code['path']] = (*count_variables(source, identifiers), source.lines_of_code)
+                checker = checkers.get(language)
+                naming_warnings[code['path']] = checker.check(identifiers) if checker else []
+
+        analyzer_warnings = {}
+        reason = analyzers_available()
+        if reason:
+            skipped["analyzers"] = reason
+            print(f"analyzers  skipped ({reason})")
+        else:
+            sample = [{'path': code['path'], 'language': code['language']} for code in codes[:args.analyzer_sample]]
+            with Stage(stages, "analyzers", len(sample)):
+                for batch_results in AnalysisEngine(1, Executors.THREAD).run(sample):
+                    for result in batch_results:
+                        analyzer_warnings[result['path']] = result['warnings']
+
+        # Os workers já devolvem os avisos decodificados, então o decodificador é medido com saídas sintéticas
+        outputs = make_outputs(len(codes), args.lines // 5)
+        lines = sum(
+            output.count("\n") + 1 if isinstance(output, str) else len(output)
+            for value in outputs.values()
+            for output in value.values()
+        )
+        with Stage(stages, "decode", lines):
+            results = complete_batch([
+                {
+                    'path': code['path'],
+                    # Os avisos dos analisadores da amostra entram nas contagens, como nos resultados do engine
+                    'warnings': analyzer_warnings.get(code['path'], []) + [
+                        warning_message
+                        for name, output in value.items()
+                        for warning_message in decode_output(get_analyzer(name), output)
+                    ],
+                    'naming_warnings': naming_warnings[code['path']],
+                }
+                for code, value in zip(codes, outputs.values())
+            ])
+
+        with Stage(stages, "emission", len(codes)):
+            writer, store = open_writer(os.path.join(directory, "results"), OutputFormats(args.output_format))
+            aggregator = MetricsAggregator()
+            for result in results:
+                variables_qty, functions_qty, lines_of_code = counts[result['path']]
+                quantity_info = result['quantity_info']
+                code = Code(
+                    result['path'],
+                    store.add(result['path'], result['warnings']) if store is not None else result['warnings'],
+                    lines_of_code,
+                    variables_qty,
+                    functions_qty,
+                    quantity_info.warnings_variables_qty,
+                    quantity_info.warnings_functions_qty,
+                    quantity_info.warnings_formatting_qty,
+                )
+                writer.write(code)
+                aggregator.add(code)
+                if store is not None:
+                    store.release()
+            writer.close()
+
+    return stages, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="number of files of the corpus (1 to 100000)")
+    parser.add_argument("--lines", type=int, default=100, help="average number of lines per file")
+    parser.add_argument("--languages", default=".py,.c", help="extensions of the generated files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--analyzer-sample", type=int, default=100, help="number of files run through the analyzers")
+    parser.add_argument(
+        "--output-format", choices=[output_format.value for output_format in OutputFormats],
+        default=OutputFormats.CSV.value, help="format written by the emission stage (parquet requires pyarrow)",
+    )
+    parser.add_argument("--output", default="benchmark.json", help="path of the JSON results file")
+    parser.add_argument("--trace-memory", action="store_true", help="measure the memory allocated by each stage")
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    stages, skipped = run(args)
+    try:
+        perfeq_version = version("perfeq")
+    except PackageNotFoundError:
+        perfeq_version = "unknown"
+    report = {
+        "perfeq_version": perfeq_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "corpus": {"files": args.files, "lines": args.lines, "languages": args.languages, "seed": args.seed},
+        "stages": stages,
+        "skipped": skipped,
+    }
+    with open(args.output, "w", encoding="utf8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
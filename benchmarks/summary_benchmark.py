@@ -0,0 +1,85 @@
+"""
+Benchmark of the corpus summary.
+
+Fills a MetricsAggregator with the counts of synthetic files spread over Python and C files and
+many directories, and times the summary computed with NumPy against the same statistics computed
+with a loop over the files (the mean and percentiles of each metric, per language). Requires NumPy.
+
+    python benchmarks/summary_benchmark.py --files 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perfeq.helpers.metrics_aggregator import COUNT_COLUMNS, RATIOS, MetricsAggregator
+
+
+def build_aggregator(files, directories, seed):
+    generator = random.Random(seed)
+    aggregator = MetricsAggregator()
+    for index in range(files):
+        extension = ".py" if index % 3 else ".c"
+        lines = generator.randint(1, 2000)
+        variables = generator.randint(0, 200)
+        functions = generator.randint(0, 50)
+        variable_warnings = generator.randint(0, variables)
+        function_warnings = generator.randint(0, functions)
+        formatting_warnings = generator.randint(0, lines // 4)
+        aggregator.add_counts(f"src/dir_{index % directories}/file_{index}{extension}", (
+            lines,
+            variable_warnings + function_warnings + formatting_warnings,
+            variable_warnings,
+            variables,
+            function_warnings,
+            functions,
+            formatting_warnings,
+        ))
+    return aggregator
+
+
+def loop_summary(aggregator):
+    """
+    Computes the mean and the 50th, 90th and 99th percentiles of each metric, per language, one file at a time.
+    """
+    values = {}
+    counts = [aggregator.counts[column] for column in COUNT_COLUMNS]
+    for index in range(len(aggregator.paths)):
+        row = dict(zip(COUNT_COLUMNS, (column[index] for column in counts)))
+        language = aggregator.languages[index]
+        for metric, (numerator, denominator) in RATIOS.items():
+            ratio = row[numerator] * 100 / row[denominator] if row[denominator] else 0.0
+            values.setdefault((language, metric), []).append(ratio)
+    return {
+        key: (statistics.fmean(ratios), statistics.quantiles(ratios, n=100, method="inclusive"))
+        for key, ratios in values.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000000)
+    parser.add_argument("--directories", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    aggregator = build_aggregator(args.files, args.directories, args.seed)
+    print(f"{args.files} files in {args.directories} directories\n")
+
+    start = time.perf_counter()
+    summary = aggregator.summary()
+    vectorized = time.perf_counter() - start
+    print(f"{'numpy':<8}{vectorized * 1000:10.1f} ms  (corpus, languages and {len(summary['directories'])} directories)")
+
+    start = time.perf_counter()
+    loop_summary(aggregator)
+    loop = time.perf_counter() - start
+    print(f"{'loop':<8}{loop * 1000:10.1f} ms  (languages only){loop / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
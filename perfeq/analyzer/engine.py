@@ -0,0 +1,388 @@
+import math
+import os
+from collections import defaultdict, deque
+from functools import partial
+from itertools import islice
+
+from perfeq.constants import ANALYZER_TIMEOUT, ENGINE_BATCH_SIZE, ENGINE_BATCHES_PER_WORKER
+from perfeq.helpers.analyzer_registry import analyzer_concurrency, get_analyzer, select_analyzers
+from perfeq.helpers.analyzers_helper import decode_output
+from perfeq.helpers.batch_helper import build_argv, split_in_chunks
+from perfeq.helpers.c_variable_counter import c_variable_counter
+from perfeq.helpers.naming_checker import NamingChecker
+from perfeq.helpers.output_spool import OutputSpool
+from perfeq.helpers.path_helper import PathHelper
+from perfeq.helpers.profiler import Profiler
+from perfeq.helpers.python_variable_counter import python_variable_counter
+from perfeq.helpers.source_reader import get_source_reader
+from perfeq.models.source_file import SourceFile
+from perfeq.utils.enums import LANGUAGES, Executors, Languages
+
+
+def decode_run(analyzer, spool, paths, returncode, stdout, stderr):
+    """
+    Splits the output of an analyzer command by file and decodes it, as soon as the command finishes.
+
+    Args:
+        analyzer (Analyzer): The analyzer of the command.
+        spool (OutputSpool): Receives the raw output of each file, or None.
+        paths (list): Paths of the files in the chunk.
+        returncode (int): The exit status of the command.
+        stdout (str): The standard output.
+        stderr (str): The standard error.
+
+    Returns:
+        tuple: A dictionary mapping each path to its list of WarningMessage, and a dictionary mapping
+        the path of each file whose output could not be read to the reason.
+    """
+    output = analyzer.select_output(returncode, stdout, stderr)
+    try:
+        routed_outputs = analyzer.route(output, paths)
+    except ValueError as error:
+        if spool:
+            for path in paths:
+                spool.write(path, analyzer.name, output)
+        return {}, {path: f"{analyzer.name}: unreadable output ({error})" for path in paths}
+    warnings = {}
+    for path, routed in routed_outputs.items():
+        if spool:
+            spool.write(path, analyzer.name, routed)
+        warnings[path] = decode_output(analyzer, routed)
+    return warnings, {}
+
+
+def schedule_commands(scheduler, analyzers, paths, spool=None):
+    """
+    Schedules the external analyzers over a batch of files. A persistent analyzer receives the whole
+    batch at once; a batch-capable analyzer runs over chunks of files that fit in a command line; the
+    others run once per file. The output of each command is decoded by `decode_run` as soon as it finishes.
+
+    Args:
+        scheduler (CommandScheduler): The scheduler of the run.
+        analyzers (list): The enabled analyzers of the language of the files; the in-process ones are skipped.
+        paths (list): Paths of the files in the batch.
+        spool (OutputSpool): Receives the raw output of each file, or None.
+
+    Returns:
+        list: (analyzer, future) tuples, one per chunk of files, with the future returned by `CommandScheduler.submit`.
+    """
+    futures = []
+    for analyzer in analyzers:
+        if analyzer.in_process:
+            continue
+        argv = build_argv(analyzer.command)
+        if analyzer.persistent:
+            chunks = [paths]
+        elif analyzer.batch:
+            chunks = split_in_chunks(analyzer.command, paths)
+        else:
+            chunks = [[path] for path in paths]
+        handler = partial(decode_run, analyzer, spool)
+        for chunk in chunks:
+            futures.append((analyzer, scheduler.submit(analyzer.name, argv, chunk, handler, analyzer.persistent)))
+    return futures
+
+
+def collect_warnings(futures):
+    """
+    Waits for the analyzer commands of a batch and gathers their decoded warnings by file.
+
+    Args:
+        futures (list): The (analyzer, future) tuples returned by `schedule_commands`.
+
+    Returns:
+        tuple: A dictionary mapping each path to its list of WarningMessage, and a dictionary
+        mapping each path to the list of reasons why an analyzer failed on it.
+    """
+    warnings = defaultdict(list)
+    failures = defaultdict(list)
+    for _, future in futures:
+        runs, chunk_failures = future.result()
+        for run_warnings, run_failures in runs:
+            for path, decoded in run_warnings.items():
+                warnings[path].extend(decoded)
+            for path, reason in run_failures.items():
+                failures[path].append(reason)
+        for path, reason in chunk_failures.items():
+            failures[path].append(reason)
+    return warnings, failures
+
+
+def count_variables(source, identifiers=None):
+    """
+    Counts the variables and functions of a parsed file with the counter of its language.
+
+    Args:
+        source (SourceFile): The parsed file.
+        identifiers (list): If given, receives the (name, line, TypesOfWarning) tuples of the identifiers found.
+
+    Returns:
+        tuple: The number of variables and the number of functions.
+    """
+    if source.language == Languages.PYTHON:
+        return python_variable_counter(source, identifiers)
+    return c_variable_counter(source.text, identifiers)
+
+
+def analyze_file(code, language, naming_checker, profiler):
+    """
+    Reads a file and counts its lines, variables and functions, checking the names it declares. The
+    content of the file is released when the function returns.
+
+    Args:
+        code (dict): Dictionary with 'path' and 'language' keys.
+        language (Languages): The programming language of the file.
+        naming_checker (NamingChecker): The naming checker of the language, or None if an analyzer
+            already checks the names.
+        profiler (Profiler): The profiler of the batch.
+
+    Returns:
+        dict: The keys 'path', 'naming_warnings', 'lines_of_code', 'variables_qty' and 'functions_qty',
+        or None if the file cannot be read.
+    """
+    with profiler.span("read", "io", file=code['path']):
+        code = PathHelper.read_code(code)
+    if not code:
+        return None
+    # Cada arquivo é analisado sintaticamente uma única vez e o artefato serve a todos os consumidores
+    with profiler.span("parse", "counters", file=code['path']):
+        source = SourceFile(code['path'], language, code['file'])
+    identifiers = []
+    with profiler.span("counters", "counters", file=code['path']):
+        variable_count, function_count = count_variables(source, identifiers)
+    # Os nomes encontrados pelos contadores são verificados no próprio processo, sem o naming_check
+    naming_warnings = []
+    if naming_checker:
+        with profiler.span("naming", "analyzer", file=code['path']):
+            naming_warnings = naming_checker.check(identifiers)
+    return {
+        'path': code['path'],
+        'naming_warnings': naming_warnings,
+        'lines_of_code': source.lines_of_code,
+        'variables_qty': variable_count,
+        'functions_qty': function_count,
+    }
+
+
+def analyze_batch(language, codes, profile=False, naming_rules=None, analyzers=None, spool_dir=None, check_naming=None):
+    """
+    Analyzes a batch of files written in the same language.
+
+    The result depends only on the given file descriptors, so batches can be analyzed
+    concurrently by threads or processes. The files are read by the worker itself, one at a time,
+    and the threads of a process share the byte budget of its SourceReader while they count a file.
+    The budget only bounds the counting: it holds the on-disk size of the file, while the file is
+    kept as a decoded str (up to four times as large), and the in-process analyzers run over the
+    whole batch before it, reading the files themselves. The external analyzer commands, pylint
+    included, are run by the CommandScheduler of the engine in their own processes.
+    The output of each analyzer is decoded right after it runs, so only the decoded warnings
+    are sent back.
+
+    Args:
+        language (Languages): The programming language of the files.
+        codes (list): Dictionaries with 'path' and 'language' keys.
+        profile (bool): Whether the time spent in each step is recorded.
+        naming_rules (dict): Custom naming rules. Defaults to `NAMING_RULES`.
+        analyzers (list): Names of the in-process analyzers to run (names are sent to the workers
+            instead of the analyzers themselves). Defaults to the enabled in-process analyzers of the language.
+        spool_dir (str): If given, the raw output of each analyzer for each file is also written to this
+            directory (see `OutputSpool`).
+        check_naming (bool): Whether the built-in naming checker runs. Defaults to True when no enabled
+            analyzer of the language checks the names (see `Analyzer.checks_naming`).
+
+    Returns:
+        tuple: A list with one dictionary per readable file, in the order of `codes`, with the keys 'path',
+        'warnings' (the WarningMessage list of the in-process analyzers), 'naming_warnings',
+        'lines_of_code', 'variables_qty' and 'functions_qty'; and the list of profiling events
+        (empty if `profile` is False).
+    """
+    profiler = Profiler(profile)
+    if analyzers is None:
+        analyzers = [analyzer.name for analyzer in select_analyzers()[language] if analyzer.in_process]
+    if check_naming is None:
+        check_naming = not any(analyzer.checks_naming for analyzer in select_analyzers()[language])
+    spool = OutputSpool(spool_dir) if spool_dir else None
+    paths = [code['path'] for code in codes]
+    warnings = defaultdict(list)
+    for name in analyzers:
+        analyzer = get_analyzer(name)
+        with profiler.span(name, "analyzer", files=paths):
+            outputs = analyzer.run(paths)
+        with profiler.span("decode", "analyzer", files=paths):
+            for path, output in outputs.items():
+                if spool:
+                    spool.write(path, name, output)
+                warnings[path].extend(decode_output(analyzer, output))
+        # A saída bruta não é mantida enquanto os arquivos são lidos
+        outputs = None
+
+    naming_checker = NamingChecker(language, naming_rules) if check_naming else None
+    reader = get_source_reader()
+    results = []
+    for code in codes:
+        with reader.reserve(code['path']):
+            result = analyze_file(code, language, naming_checker, profiler)
+        if result:
+            result['warnings'] = warnings[result['path']]
+            results.append(result)
+    return results, profiler.events
+
+
+class NullProgressBar:
+    """
+    Progress bar of the runs without progress rendering: ignores every update.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def update(self, count):
+        pass
+
+
+class AnalysisEngine:
+    def __init__(
+        self,
+        jobs=None,
+        executor=Executors.PROCESS,
+        batch_size=ENGINE_BATCH_SIZE,
+        profiler=None,
+        naming_rules=None,
+        timeout=ANALYZER_TIMEOUT,
+        progress=True,
+        analyzer_config=None,
+        spool_dir=None,
+    ):
+        """
+        Initializes the engine that distributes the analysis over a pool of workers, while the
+        external analyzer commands run in a CommandScheduler.
+
+        Args:
+            jobs (int): Number of workers. Defaults to the number of CPUs.
+            executor (Executors): Whether the workers are processes or threads.
+            batch_size (int): Maximum number of files analyzed by a worker at once.
+            profiler (Profiler): Profiler that receives the events recorded by the workers.
+            naming_rules (dict): Custom naming rules. Defaults to `NAMING_RULES`.
+            timeout (float): Seconds an external analyzer may spend per file before it is killed.
+            progress (bool): Whether a progress bar is shown.
+            analyzer_config (dict): The analyzers enabled or disabled and their concurrency limits, as
+                returned by `load_analyzer_config`.
+            spool_dir (str): If given, the raw output of each analyzer for each file is also written,
+                compressed, to this directory (see `OutputSpool`).
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.executor = executor
+        self.batch_size = batch_size
+        self.profiler = profiler or Profiler()
+        self.naming_rules = naming_rules
+        self.timeout = timeout
+        self.progress = progress
+        self.analyzers = select_analyzers(analyzer_config)
+        self.concurrency = analyzer_concurrency(analyzer_config)
+        self.spool_dir = spool_dir
+
+    def make_batches(self, codes):
+        """
+        Groups the files by language and splits each group in batches, small enough
+        to keep every worker busy. The groups follow the order of `Languages` and the files of
+        each group keep their order in `codes`.
+
+        Args:
+            codes (list): Dictionaries with 'path' and 'language' keys.
+
+        Yields:
+            tuple: (language, batch) for each batch, as it is needed.
+        """
+        for language in Languages:
+            group = [code for code in codes if LANGUAGES.get(code['language']) == language]
+            if not group:
+                continue
+            size = max(1, min(self.batch_size, math.ceil(len(group) / self.jobs)))
+            for start in range(0, len(group), size):
+                yield language, group[start:start + size]
+
+    def submit_batch(self, executor, scheduler, spool, language, batch):
+        """
+        Submits a batch to the pool and its external analyzer commands to the scheduler.
+
+        Returns:
+            tuple: The batch, the future of `analyze_batch` and the futures of the commands.
+        """
+        future = executor.submit(
+            analyze_batch,
+            language,
+            batch,
+            self.profiler.enabled,
+            self.naming_rules,
+            [analyzer.name for analyzer in self.analyzers[language] if analyzer.in_process],
+            self.spool_dir,
+            not any(analyzer.checks_naming for analyzer in self.analyzers[language]),
+        )
+        command_futures = schedule_commands(scheduler, self.analyzers[language], [code['path'] for code in batch], spool)
+        return batch, future, command_futures
+
+    def run(self, codes):
+        """
+        Analyzes all the files in the pool, showing a single progress bar.
+
+        Args:
+            codes (list): Dictionaries with 'path' and 'language' keys.
+
+        Yields:
+            list: The file results of each batch, as returned by `analyze_batch`, with the warnings of the
+            external analyzers added to 'warnings' and the key 'analyzer_failures' (the reasons
+            why an analyzer failed on the file, such as a timeout). Batches are yielded in a deterministic
+            order, grouped by language and in the order of `codes` within each language (see
+            `make_batches`), as soon as they and every batch before them are finished. At most
+            `ENGINE_BATCHES_PER_WORKER` batches per worker are in flight at a time.
+        """
+        if not codes:
+            return
+        # O pool, o asyncio e o tqdm só são importados quando há arquivos a analisar
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        from perfeq.helpers.command_scheduler import CommandScheduler
+
+        executor_class = ProcessPoolExecutor if self.executor == Executors.PROCESS else ThreadPoolExecutor
+        scheduler = CommandScheduler(self.jobs, self.concurrency, timeout=self.timeout, profiler=self.profiler)
+        spool = OutputSpool(self.spool_dir) if self.spool_dir else None
+        batches = self.make_batches(codes)
+        with executor_class(max_workers=self.jobs) as executor, scheduler:
+            in_flight = deque(
+                self.submit_batch(executor, scheduler, spool, language, batch)
+                for language, batch in islice(batches, ENGINE_BATCHES_PER_WORKER * self.jobs)
+            )
+            with self.open_progress_bar(len(codes)) as pbar:
+                while in_flight:
+                    batch, future, command_futures = in_flight.popleft()
+                    # Um lote novo entra no lugar do primeiro, que já vai ser entregue
+                    following = next(batches, None)
+                    if following:
+                        in_flight.append(self.submit_batch(executor, scheduler, spool, *following))
+                    batch_results, events = future.result()
+                    warnings, failures = collect_warnings(command_futures)
+                    for result in batch_results:
+                        result['warnings'].extend(warnings.get(result['path'], []))
+                        result['analyzer_failures'] = failures.get(result['path'], [])
+                    self.profiler.add_events(events)
+                    pbar.update(len(batch))
+                    yield batch_results
+
+    def open_progress_bar(self, total):
+        """
+        Opens the progress bar of a run.
+
+        Args:
+            total (int): Number of files of the run.
+
+        Returns:
+            The tqdm progress bar, or a NullProgressBar when the progress is not shown.
+        """
+        if not self.progress:
+            return NullProgressBar()
+        from tqdm import tqdm
+
+        return tqdm(total=total, desc="Running Analyzers", unit="file")
@@ -0,0 +1,74 @@
+import os
+
+from perfeq.helpers.dedup_helper import DuplicatesWriter, read_duplicates
+from perfeq.helpers.metrics_aggregator import MetricsAggregator, numpy_available
+from perfeq.helpers.result_writer import CsvResultWriter, read_result_rows
+from perfeq.helpers.shard_helper import find_partials, order_partials
+
+
+def merge_shards(path, partials=None, quiet=False):
+    """
+    Combines the partial results files of a sharded run (`perfeq --shard i/N`) into the results file
+    and the summary of the whole corpus, as a single run over the directory would have written them.
+    The duplicates files written next to the partial files by `--dedup` are also combined.
+
+    Args:
+        path (str): The analyzed directory; the results are written to its `results` directory.
+        partials (list): Paths of the partial CSV files, one per shard. Defaults to the
+            `perfeq_output.shard-i-of-N.csv` files in the `results` directory.
+        quiet (bool): Whether the summary table and the status messages are omitted.
+
+    Returns:
+        dict: The number of 'files', the paths of the 'outputs' and of the 'summary' (None when NumPy
+        is not installed) and the 'duplicates', in the shape of the `--json` report.
+
+    Raises:
+        ValueError: If the partial files are not the complete set of shards of a single run.
+    """
+    results_dir = os.path.join(path, "results")
+    partials = order_partials(partials or find_partials(results_dir))
+
+    rows = {}
+    for partial in partials:
+        rows.update(read_result_rows(partial))
+    output_path = os.path.join(results_dir, "perfeq_output.csv")
+    # As linhas são gravadas em um arquivo temporário que substitui o CSV apenas no final
+    CsvResultWriter(output_path, kept_rows=list(rows.values())).close()
+    if not quiet:
+        print(f"{len(rows)} arquivos de {len(partials)} partes combinados em {output_path}")
+
+    # Cada parte executada com --dedup grava as suas duplicatas ao lado do seu CSV parcial
+    duplicates = {}
+    duplicates_paths = [
+        os.path.join(os.path.dirname(partial), "perfeq_duplicates." + os.path.basename(partial)[len("perfeq_output."):])
+        for partial in partials
+    ]
+    duplicates_paths = [duplicates_path for duplicates_path in duplicates_paths if os.path.exists(duplicates_path)]
+    for duplicates_path in duplicates_paths:
+        duplicates.update(read_duplicates(duplicates_path))
+    if duplicates_paths:
+        DuplicatesWriter(os.path.join(results_dir, "perfeq_duplicates.csv"), duplicates).close()
+
+    summary_path = None
+    if numpy_available():
+        aggregator = MetricsAggregator()
+        for row in rows.values():
+            aggregator.add_row(row)
+        summary = aggregator.summary()
+        summary_path = os.path.join(results_dir, "perfeq_summary.json")
+        aggregator.write_summary(summary, summary_path)
+        if not quiet:
+            aggregator.print_summary(summary)
+            print(f"Resumo salvo em {summary_path}")
+    elif not quiet:
+        print("Resumo do corpus não gerado: instale o numpy (pip install perfeq[summary])")
+
+    return {
+        'files': len(rows),
+        'results': [],
+        'outputs': [output_path],
+        'summary': summary_path,
+        'trace': None,
+        'analyzer_failures': {},
+        'duplicates': duplicates,
+    }
@@ -1,196 +1,479 @@
 import os
-import subprocess
-import pickle
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from tqdm import tqdm
-
-from perfeq.constants import C_COMANDS, PYTHON_COMANDS
-from perfeq.helpers.analyzers_helper import AnalyzersHelper
-from perfeq.helpers.c_variable_counter import c_variable_counter
+import sys
+
+from perfeq.analyzer.engine import AnalysisEngine
+from perfeq.constants import ANALYZER_FAILURES_SHOWN, ANALYZER_TIMEOUT, PROFILE_TOP_FILES
+from perfeq.helpers.analyzers_helper import complete_batch
+from perfeq.helpers.change_helper import MtimeManifest, git_changed_files
+from perfeq.helpers.dedup_helper import DuplicatesWriter, group_duplicates, read_duplicates
+from perfeq.helpers.metrics_aggregator import MetricsAggregator, numpy_available
 from perfeq.helpers.path_helper import PathHelper
-from perfeq.helpers.python_variable_counter import python_variable_counter
+from perfeq.helpers.profiler import Profiler
+from perfeq.helpers.result_cache import CACHED_RESULT_KEYS, ResultCache, cache_settings
+from perfeq.helpers.result_writer import CsvResultWriter, JsonLinesResultWriter, ParquetResultWriter, read_result_rows
+from perfeq.helpers.shard_helper import partial_name
 from perfeq.models.code import Code
-from perfeq.utils.enums import Languages
+from perfeq.models.warning_store import WarningStore
+from perfeq.utils.enums import Executors, OutputFormats
 
 
 class Perfeq:
-    def __init__(self, path):
-        self.path_helper = PathHelper(path)
-        self.codes = self.path_helper.get_content(True)
-        self.current_code = None
-        self.current_path = None
-        self.current_language = None
-        self.code_outputs = {}
-        self.counter = {}
-        self.warnings = {}
+    def __init__(
+        self,
+        path,
+        jobs=None,
+        executor=Executors.PROCESS,
+        use_cache=True,
+        include=None,
+        exclude=None,
+        resume=False,
+        changed_since=None,
+        mtime_manifest=False,
+        profile=None,
+        naming_rules=None,
+        output_format=OutputFormats.CSV,
+        timeout=ANALYZER_TIMEOUT,
+        quiet=False,
+        shard=None,
+        analyzer_config=None,
+        spool_dir=None,
+        dedup=False,
+    ):
+        self.profile = profile
+        # Sem barra de progresso, mensagens de andamento, tabela do resumo e relatório do profile
+        self.quiet = quiet
+        self.profiler = Profiler(profile is not None)
+        # Parte (índice a partir de 1, número de partes) de uma execução distribuída, ou None
+        self.shard = shard
+        self.path_helper = PathHelper(path, include, exclude, shard)
+        # Apenas os caminhos são guardados, o conteúdo é lido pelos workers
+        with self.profiler.span("discovery", "stage", children=True):
+            self.codes = list(self.path_helper.iter_files())
+        # Uma parte de uma execução distribuída sempre grava o seu CSV parcial, mesmo com um único arquivo
+        self.single_file = len(self.codes) == 1 and shard is None
+        self.engine = AnalysisEngine(
+            jobs,
+            executor,
+            profiler=self.profiler,
+            naming_rules=naming_rules,
+            timeout=timeout,
+            progress=not quiet,
+            analyzer_config=analyzer_config,
+            spool_dir=spool_dir,
+        )
+        self.cache = ResultCache(settings=cache_settings(naming_rules, self.engine.analyzers)) if use_cache else None
+        self.cache_keys = {}
+        self.resume = resume
+        self.output_format = output_format
+        self.changed_since = changed_since
+        self.manifest = MtimeManifest(self.get_manifest_path()) if mtime_manifest else None
+        self.writer = None
+        # Se apenas um arquivo de cada grupo de arquivos idênticos é analisado
+        self.dedup = dedup
+        # Duplicatas de cada representante, que recebem o resultado dele sem serem analisadas
+        self.duplicates = {}
+        self.duplicates_writer = None
+        # Avisos do arquivo sendo gravado, em colunas, e a tabela de mensagens da execução; apenas os
+        # formatos com tabela de avisos precisam dele
+        self.warning_store = WarningStore() if output_format != OutputFormats.CSV and not self.single_file else None
+        # Contagens de cada arquivo, usadas no resumo do corpus
+        self.aggregator = MetricsAggregator()
+        # Arquivos em que algum analisador falhou (e.g. excedeu o tempo limite), com os motivos
+        self.analyzer_failures = {}
+        self.summary = None
+        self.summary_path = None
         self.result = []
-        self.lock = Lock()  # Lock para sincronizar o acesso à contagem
         self.remaining_files = len(self.codes)  # Número total de arquivos a serem processados
 
     def analyze(self):
         """
         Analyzes the provided code files in parallel and collects the metrics and warnings.
+        When analyzing multiple files, the result of each file is written to the CSV file as soon as it is available.
+        """
+        self.run()
+        self.print_result()
+        self.print_analyzer_failures()
+        if self.profiler.enabled and not self.quiet:
+            self.print_profile()
+
+    def run(self):
+        """
+        Analyzes the provided code files and writes the results files, the summary of the corpus and the
+        profiling trace, without printing the results (see `analyze` and `get_report`).
+        """
+        pending = self.codes
+        if not self.single_file and (self.changed_since or self.manifest):
+            pending = self.start_incremental_run()
+        elif not self.single_file:
+            self.writer = self.open_writer()
+            pending = [code for code in self.codes if code['path'] not in self.writer.done_ids]
+            if len(pending) < len(self.codes):
+                self.info(f"Retomando análise: {len(self.codes) - len(pending)} arquivos já estão em {self.writer.path}")
+                for row in read_result_rows(self.writer.path).values():
+                    self.aggregator.add_row(row)
+
+        self.info(f"Iniciando análise em paralelo ({len(pending)} arquivos no total, {self.engine.jobs} workers)")
+
+        # Apenas um arquivo de cada grupo de conteúdo igual é analisado
+        if self.dedup and not self.single_file:
+            with self.profiler.span("dedup", "stage", children=True):
+                pending = self.group_duplicates(pending)
+
+        # Arquivos que já estão no cache não são analisados novamente
+        if self.cache:
+            with self.profiler.span("cache", "stage", children=True):
+                pending = self.load_cached_results(pending)
+
+        # Executa os analisadores e os contadores em paralelo; os workers já devolvem os avisos decodificados
+        with self.profiler.span("analysis", "stage", children=True):
+            for batch_results in self.engine.run(pending):
+                self.store_batch(batch_results)
+
+        if self.cache:
+            self.cache.close()
+        if self.writer:
+            self.writer.close()
+        if self.duplicates_writer:
+            self.duplicates_writer.close()
+        if self.manifest:
+            self.manifest.save(self.codes)
+        # O resumo de uma execução distribuída é gerado pelo `perfeq merge`, a partir de todas as partes
+        if not self.single_file and not self.shard:
+            self.write_summary()
+        if self.profiler.enabled:
+            self.write_trace()
+
+    def info(self, message):
+        """
+        Prints a message about the progress of the run, unless the run is quiet.
+
+        Args:
+            message (str): The message.
+        """
+        if not self.quiet:
+            print(message)
+
+    def get_output_path(self, name="perfeq_output"):
+        """
+        Returns the path of a results file of multiple code files, with the extension of the output format.
+
+        Args:
+            name (str): The name of the file: `perfeq_output` (metrics of each file), `perfeq_warnings`
+                or `perfeq_messages`.
+
+        Returns:
+            str: The path of the file, such as `results/perfeq_output.csv`, or the partial results file
+            of the shard in a sharded run, such as `results/perfeq_output.shard-2-of-8.csv`.
+        """
+        if self.shard and name == "perfeq_output":
+            name = partial_name(self.shard)
+        return os.path.join(self.path_helper.dir_path, "results", f"{name}.{self.output_format.value}")
+
+    def open_writer(self):
         """
-        print(f"Iniciando análise em paralelo ({self.remaining_files} arquivos no total)")
+        Opens the writer of the output format. The CSV format has only the metrics of each file; the
+        JSON Lines and Parquet formats also have a table of warnings and a table of messages.
 
-        # Primeiro, faz a contagem de variáveis e funções para cada arquivo
+        Returns:
+            The result writer.
+        """
+        if self.output_format == OutputFormats.CSV:
+            return CsvResultWriter(self.get_output_path(), self.resume)
+        writer_class = JsonLinesResultWriter if self.output_format == OutputFormats.JSONL else ParquetResultWriter
+        return writer_class(
+            self.get_output_path(),
+            self.get_output_path("perfeq_warnings"),
+            self.get_output_path("perfeq_messages"),
+            self.warning_store,
+        )
+
+    def get_manifest_path(self):
+        """
+        Returns the path of the manifest used by the incremental analysis based on modification times.
+
+        Returns:
+            str: The path of the `results/perfeq_manifest.json` file.
+        """
+        return os.path.join(self.path_helper.dir_path, "results", "perfeq_manifest.json")
+
+    def start_incremental_run(self):
+        """
+        Opens the CSV writer of an incremental run. The rows of the files that did not change since
+        the base git revision (or since the last run, when using the modification time manifest) are
+        kept from the existing CSV file; rows of files that no longer exist are dropped. With `dedup`,
+        a duplicate whose representative changed or no longer exists is analyzed again.
+
+        Returns:
+            list: The code files that changed, or that have no row yet, and still have to be analyzed.
+        """
+        if self.changed_since:
+            changed = git_changed_files(self.path_helper.path, self.changed_since)
+        else:
+            changed = self.manifest.changed(self.codes)
+
+        # O resultado de uma duplicata foi copiado do seu representante: ela muda junto com ele
+        duplicates_path = self.get_duplicates_path()
+        if self.dedup and os.path.exists(duplicates_path):
+            paths = {code['path'] for code in self.codes}
+            changed = set(changed)
+            changed.update(
+                os.path.realpath(code_id)
+                for code_id, duplicate_of in read_duplicates(duplicates_path).items()
+                if duplicate_of not in paths or os.path.realpath(duplicate_of) in changed
+            )
+
+        output_path = self.get_output_path()
+        previous_rows = read_result_rows(output_path) if os.path.exists(output_path) else {}
+        pending = []
+        kept_rows = []
         for code in self.codes:
-            self.current_code = code['file']
-            self.current_path = code['path']
-            if code['language'] == '.py':
-                self.current_language = Languages.PYTHON
-                variable_count, function_count = python_variable_counter(self.current_code)
-            elif code['language'] == '.c':
-                self.current_language = Languages.C
-                variable_count, function_count = c_variable_counter(self.current_code.splitlines())
+            if code['path'] in previous_rows and os.path.realpath(code['path']) not in changed:
+                kept_rows.append(previous_rows[code['path']])
+                self.aggregator.add_row(previous_rows[code['path']])
             else:
-                continue
+                pending.append(code)
+        self.writer = CsvResultWriter(output_path, kept_rows=kept_rows)
+        self.info(f"Análise incremental: {len(pending)} arquivos alterados, {len(kept_rows)} mantidos de {output_path}")
+        return pending
 
-            self.counter[self.current_path] = (variable_count, function_count)
+    def get_duplicates_path(self):
+        """
+        Returns the path of the file that marks the duplicates of a run with `dedup`.
 
-        # Executa os analisadores em paralelo
-        outputs = self.run_analyzers_parallel()
-        self.code_outputs.update(outputs)
+        Returns:
+            str: The path of `results/perfeq_duplicates.csv`, or of the file of the shard in a sharded run.
+        """
+        name = f"perfeq_duplicates.shard-{self.shard[0]}-of-{self.shard[1]}.csv" if self.shard else "perfeq_duplicates.csv"
+        return os.path.join(self.path_helper.dir_path, "results", name)
 
-        # Decodifica os avisos e armazena os resultados
-        analyzers_helper = AnalyzersHelper(self.code_outputs)
-            
-        self.warnings = analyzers_helper.decode_analyzers()
-        warning_quantity_infos = analyzers_helper.quantity_info
-        self.store_result(warning_quantity_infos)
-        self.print_result()
+    def group_duplicates(self, codes):
+        """
+        Groups the code files with the same content (see `group_duplicates`) and opens the file that
+        marks the duplicates. The marks of a previous run are kept for the files whose rows are kept
+        (e.g. when resuming), as long as neither the file nor its representative is analyzed again or
+        was removed.
 
-    def store_result(self, warning_quantity_infos):
+        Args:
+            codes (list): The code files to be analyzed.
+
+        Returns:
+            list: The representative of each group, which still has to be analyzed.
         """
-        Stores the analysis result for each code file.
+        representatives, self.duplicates = group_duplicates(codes)
+        path = self.get_duplicates_path()
+        kept = {}
+        if (self.resume or self.changed_since or self.manifest) and os.path.exists(path):
+            pending = {code['path'] for code in codes}
+            unchanged = {code['path'] for code in self.codes} - pending
+            kept = {
+                code_id: duplicate_of
+                for code_id, duplicate_of in read_duplicates(path).items()
+                if code_id in unchanged and duplicate_of in unchanged
+            }
+        self.duplicates_writer = DuplicatesWriter(path, kept)
+        self.info(f"{len(codes) - len(representatives)} arquivos duplicados receberão o resultado de um dos {len(self.duplicates)} representantes")
+        return representatives
+
+    def load_cached_results(self, codes):
         """
-        for code in self.codes:
-            self.current_code = code['file']
-            self.current_path = code['path']
-            variable_count, function_count = self.counter[self.current_path]
-            warning_quantity_info = warning_quantity_infos[self.current_path]
-            result = Code(
-                self.current_path,
-                self.warnings[self.current_path],
-                len(self.current_code.splitlines()),
-                variable_count,
-                function_count,
-                warning_quantity_info.warnings_variables_qty,
-                warning_quantity_info.warnings_functions_qty,
-                warning_quantity_info.warnings_formatting_qty,
+        Stores the results of the files that are already in the cache.
+
+        Args:
+            codes (list): The code files to be analyzed.
+
+        Returns:
+            list: The code files that are not in the cache and still have to be analyzed.
+        """
+        pending = []
+        for code in codes:
+            key = self.cache.make_key(code)
+            cached = self.cache.get(key)
+            if cached is None:
+                self.cache_keys[code['path']] = key
+                pending.append(code)
+                continue
+            self.store_result(
+                code['path'],
+                cached['warnings'],
+                cached['quantity_info'],
+                cached['lines_of_code'],
+                cached['variables_qty'],
+                cached['functions_qty'],
+            )
+        # Libera o banco para as outras execuções que compartilham o cache (e.g. partes na mesma máquina)
+        self.cache.commit()
+        self.info(f"{len(codes) - len(pending)} arquivos encontrados no cache")
+        return pending
+
+    def store_batch(self, batch_results):
+        """
+        Completes the results of a batch of code files, whose analyzer outputs were already decoded by
+        the workers, and stores them.
+
+        Args:
+            batch_results (list): The results of the batch, as returned by the analysis engine.
+        """
+        complete_batch(batch_results)
+
+        cached_items = []
+        for result in batch_results:
+            path = result['path']
+            if result['analyzer_failures']:
+                # O resultado incompleto não vai para o cache, para que o arquivo seja analisado de novo
+                for failed_path in [path, *self.duplicates.get(path, [])]:
+                    self.analyzer_failures[failed_path] = result['analyzer_failures']
+            elif self.cache:
+                cached_items.append((self.cache_keys.get(path), {key: result[key] for key in CACHED_RESULT_KEYS}))
+            self.store_result(
+                path,
+                result['warnings'],
+                result['quantity_info'],
+                result['lines_of_code'],
+                result['variables_qty'],
+                result['functions_qty'],
             )
+        if self.cache:
+            self.cache.put_many(cached_items)
+
+    def store_result(self, path, warnings, quantity_info, lines_of_code, variables_qty, functions_qty):
+        """
+        Stores the analysis result of a code file. When analyzing multiple files the result is written
+        straight to the results file instead of being kept in memory; with a table of warnings, they go
+        through the columnar warning store, which releases them once they are written. The result of
+        a representative is also stored for each of its duplicates, which are marked in the duplicates file.
+        """
+        result = Code(
+            path,
+            self.warning_store.add(path, warnings) if self.warning_store is not None else warnings,
+            lines_of_code,
+            variables_qty,
+            functions_qty,
+            quantity_info.warnings_variables_qty,
+            quantity_info.warnings_functions_qty,
+            quantity_info.warnings_formatting_qty,
+        )
+        if self.writer:
+            with self.profiler.span("emission", "stage", file=path):
+                self.writer.write(result)
+            self.aggregator.add(result)
+            if self.warning_store is not None:
+                self.warning_store.release()
+        else:
             self.result.append(result)
+        for duplicate in self.duplicates.get(path, []):
+            self.store_result(duplicate, warnings, quantity_info, lines_of_code, variables_qty, functions_qty)
+            self.duplicates_writer.write(duplicate, path)
 
     def print_result(self):
         """
-        Prints the result based on the number of codes.
+        Prints the result based on the number of codes. The result of a single file is printed even
+        when the run is quiet; the paths of the results files and the summary table are not.
         """
-        if len(self.codes) == 1:
+        if self.single_file:
             self.print_single_result()
             return
-        self.print_multiple_result()
+        if not self.quiet:
+            self.print_multiple_result()
+            self.print_summary()
 
     def print_single_result(self):
         """
         Prints the result of the first element in the result list.
         """
+        if not self.result:
+            return
         code = self.result[0]
         code.print_result()
 
     def print_multiple_result(self):
         """
-        Generates a CSV file containing the analysis results for multiple code segments.
+        Prints the path of the CSV file containing the analysis results for multiple code segments.
         """
-        path = os.path.join(self.path_helper.dir_path, "results")
-        os.makedirs(path, exist_ok=True)
-        with open(os.path.join(path, "perfeq_output.csv"), "w") as file:
-            file.write(
-                "code_id,LOC,warnings_qty,WPL,variable_warnings_qty,variables_qty,VWPV,function_warnings_qty,functions_qty,FWPF,formatting_warnings_qty,FWPL\n"
-            )
-            for code in self.result:
-                file.write(code.print_multiple_result())
-                file.write("\n")
+        print(f"Resultados salvos em {', '.join(self.writer.paths)}")
 
-    def run_analyzers_parallel(self):
+    def print_analyzer_failures(self):
         """
-        Executes analyzers for all code files in parallel.
-
-        Returns:
-            dict: A dictionary mapping file paths to their analyzer outputs.
+        Prints the files whose results are incomplete because an analyzer failed on them
+        (to the standard error when the run is quiet).
         """
-        outputs = {}
-
-        def process_file(code):
-            """
-            Runs analyzers for a single file and returns the results.
-
-            Args:
-                code (dict): Dictionary with 'file', 'path', and 'language' keys.
+        if not self.analyzer_failures:
+            return
+        file = sys.stderr if self.quiet else sys.stdout
+        print(
+            f"\nAnalisadores falharam em {len(self.analyzer_failures)} arquivos (os avisos desses analisadores não foram contados):",
+            file=file,
+        )
+        for path, reasons in list(self.analyzer_failures.items())[:ANALYZER_FAILURES_SHOWN]:
+            print(f"  {path}: {'; '.join(reasons)}", file=file)
+        if len(self.analyzer_failures) > ANALYZER_FAILURES_SHOWN:
+            print(f"  ... e mais {len(self.analyzer_failures) - ANALYZER_FAILURES_SHOWN} arquivos", file=file)
 
-            Returns:
-                tuple: The file path and its analyzer outputs.
-            """
-            self.current_code = code['file']
-            self.current_path = code['path']
-            self.current_language = (
-                Languages.PYTHON if code['language'] == '.py' else Languages.C if code['language'] == '.c' else None
-            )
-            result = self.run_analyzers()
+    def write_summary(self):
+        """
+        Computes the distribution of the metrics in the corpus, in each language and in each directory
+        and writes it to `results/perfeq_summary.json`. Requires NumPy.
+        """
+        if not numpy_available():
+            self.info("Resumo do corpus não gerado: instale o numpy (pip install perfeq[summary])")
+            return
+        with self.profiler.span("summary", "stage", children=True):
+            self.summary = self.aggregator.summary()
+        self.summary_path = os.path.join(self.path_helper.dir_path, "results", "perfeq_summary.json")
+        self.aggregator.write_summary(self.summary, self.summary_path)
 
-            # Atualiza o contador de arquivos restantes
-            with self.lock:
-                self.remaining_files -= 1
-                print(f"{self.remaining_files} arquivos restantes...")
+    def print_summary(self):
+        """
+        Prints the distribution of the metrics in the corpus and in each language.
+        """
+        if self.summary is None:
+            return
+        self.aggregator.print_summary(self.summary)
+        print(f"Resumo salvo em {self.summary_path}")
 
-            return code['path'], result
+    def get_trace_path(self):
+        """
+        Returns the path of the Chrome trace of the run.
 
-        # Executa em paralelo usando ThreadPoolExecutor
-        with ThreadPoolExecutor() as executor:
-            future_to_code = {
-                executor.submit(process_file, code): code for code in self.codes
-            }
-            for future in as_completed(future_to_code):
-                file_path, output = future.result()
-                outputs[file_path] = output
-        return outputs
-
-    def run_analyzers(self):
-        """
-        Executes a set of analyzer commands based on the current programming language
-        and displays progress using a progress bar.
-        """
-        commands = (
-            PYTHON_COMANDS
-            if self.current_language == Languages.PYTHON
-            else C_COMANDS
-            if self.current_language == Languages.C
-            else ""
-        )
-        if not commands:
-            return []
-        
-        outputs = []
+        Returns:
+            str: The path given to `--profile`, or `results/perfeq_trace.json`.
+        """
+        if self.profile:
+            return self.profile
+        # As partes de uma execução distribuída podem rodar na mesma máquina
+        name = f"perfeq_trace.shard-{self.shard[0]}-of-{self.shard[1]}.json" if self.shard else "perfeq_trace.json"
+        return os.path.join(self.path_helper.dir_path, "results", name)
 
-        # Barra de progresso usando tqdm
-        with tqdm(total=len(commands), desc="Running Analyzers", unit="command") as pbar:
-            for command in commands:
-                command += self.current_path
-                result = self.run_process(command)
-                if result.returncode == 0 or self.current_language == Languages.PYTHON:
-                    outputs.append(result.stdout)
-                else:
-                    outputs.append(result.stderr)
-                # Atualiza a barra de progresso
-                pbar.update(1)
+    def write_trace(self):
+        """
+        Writes the Chrome trace of the run.
+        """
+        self.profiler.write_trace(self.get_trace_path())
 
-        return outputs
+    def print_profile(self):
+        """
+        Prints the time spent in each stage and the slowest files, and the path of the Chrome trace of the run.
+        """
+        self.profiler.print_report(PROFILE_TOP_FILES)
+        print(f"\nTrace salvo em {self.get_trace_path()}")
 
-    def run_process(self, command):
+    def get_report(self):
         """
-        Executes a given command in the shell.
+        Returns the outcome of the run as a JSON-serializable object, for the `--json` mode.
 
         Returns:
-            subprocess.CompletedProcess: The result of the executed command.
+            dict: The number of 'files'; the 'results' of a single file (path, metrics and warnings);
+            the paths of the results files of multiple files ('outputs'), of the 'summary' and of the
+            profiling 'trace'; the 'analyzer_failures' by path; and the representative of each of the
+            'duplicates' found in this run, by path.
         """
-        return subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        return {
+            'files': len(self.codes),
+            'results': [code.to_dict() for code in self.result],
+            'outputs': self.writer.paths if self.writer else [],
+            'summary': self.summary_path,
+            'trace': self.get_trace_path() if self.profiler.enabled else None,
+            'analyzer_failures': self.analyzer_failures,
+            'duplicates': {
+                duplicate: path for path, duplicates in self.duplicates.items() for duplicate in duplicates
+            },
+        }
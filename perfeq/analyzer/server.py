@@ -0,0 +1,265 @@
+import ipaddress
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from perfeq.analyzer.engine import analyze_batch, collect_warnings, schedule_commands
+from perfeq.constants import ANALYZER_TIMEOUT
+from perfeq.helpers.analyzer_registry import analyzer_concurrency, select_analyzers
+from perfeq.helpers.analyzers_helper import complete_batch
+from perfeq.helpers.batch_helper import build_argv
+from perfeq.helpers.command_scheduler import CommandScheduler
+from perfeq.helpers.result_cache import CACHED_RESULT_KEYS, ResultCache, cache_settings
+from perfeq.models.code import Code
+from perfeq.utils.enums import LANGUAGES
+
+
+def code_to_result(code, cached=False, analyzer_failures=None):
+    """
+    Converts the analysis of a file to the JSON object returned by the server.
+
+    Args:
+        code (Code): The analyzed code.
+        cached (bool): Whether the result came from the cache.
+        analyzer_failures (list): The reasons why an analyzer failed on the file.
+
+    Returns:
+        dict: The 'path', 'metrics' and 'warnings' of `Code.to_dict`, the 'analyzer_failures'
+        and whether the result was 'cached'.
+    """
+    return dict(code.to_dict(), analyzer_failures=analyzer_failures or [], cached=cached)
+
+
+class AnalysisService:
+    def __init__(self, naming_rules=None, use_cache=True, timeout=ANALYZER_TIMEOUT, analyzer_config=None):
+        """
+        Initializes the service that analyzes one file at a time for the server, keeping warm what a
+        `perfeq` run pays for on every call: the imported analyzers, the event loop of the external
+        analyzers with the processes of the persistent ones (the PyLinter of pylint) and the result cache.
+
+        Args:
+            naming_rules (dict): Custom naming rules. Defaults to `NAMING_RULES`.
+            use_cache (bool): Whether the results are read from and written to the result cache.
+            timeout (float): Seconds an analyzer command (pylint included) may spend on a file before it is killed.
+            analyzer_config (dict): The analyzers enabled or disabled and their concurrency limits, as
+                returned by `load_analyzer_config`.
+        """
+        self.naming_rules = naming_rules
+        self.analyzers = select_analyzers(analyzer_config)
+        self.cache = ResultCache(settings=cache_settings(naming_rules, self.analyzers)) if use_cache else None
+        self.scheduler = CommandScheduler(1, analyzer_concurrency(analyzer_config), timeout=timeout)
+        self.started = time.time()
+        self.requests = 0
+        # Os processos persistentes (e.g. o do pylint, que importa o astroid e cria o PyLinter) são
+        # iniciados antes da primeira requisição
+        for analyzer in (analyzer for group in self.analyzers.values() for analyzer in group):
+            if analyzer.persistent:
+                self.scheduler.start(analyzer.name, build_argv(analyzer.command))
+
+    def analyze_file(self, path):
+        """
+        Analyzes a single file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            dict: The result, as returned by `code_to_result`.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the language of the file is not supported.
+            OSError: If the file cannot be read.
+        """
+        self.requests += 1
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"file not found: {path}")
+        extension = os.path.splitext(path)[1]
+        language = LANGUAGES.get(extension)
+        if language is None:
+            raise ValueError(f"unsupported file type: {extension or path}")
+
+        code = {'path': path, 'language': extension}
+        key = self.cache.make_key(code) if self.cache else None
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            self.cache.commit()
+            return code_to_result(self.build_code(path, cached), cached=True)
+
+        analyzers = self.analyzers[language]
+        futures = schedule_commands(self.scheduler, analyzers, [path])
+        in_process = [analyzer.name for analyzer in analyzers if analyzer.in_process]
+        check_naming = not any(analyzer.checks_naming for analyzer in analyzers)
+        results, _ = analyze_batch(
+            language, [code], naming_rules=self.naming_rules, analyzers=in_process, check_naming=check_naming
+        )
+        warnings, failures = collect_warnings(futures)
+        if not results:
+            raise OSError(f"could not read {path}")
+        result = results[0]
+        result['warnings'].extend(warnings.get(path, []))
+        result['analyzer_failures'] = failures.get(path, [])
+        complete_batch(results)
+        if self.cache and not result['analyzer_failures']:
+            self.cache.put_many([(key, {name: result[name] for name in CACHED_RESULT_KEYS})])
+        return code_to_result(self.build_code(path, result), analyzer_failures=result['analyzer_failures'])
+
+    @staticmethod
+    def build_code(path, result):
+        quantity_info = result['quantity_info']
+        return Code(
+            path,
+            result['warnings'],
+            result['lines_of_code'],
+            result['variables_qty'],
+            result['functions_qty'],
+            quantity_info.warnings_variables_qty,
+            quantity_info.warnings_functions_qty,
+            quantity_info.warnings_formatting_qty,
+        )
+
+    def status(self):
+        """
+        Returns the state of the service.
+
+        Returns:
+            dict: The process id, the uptime in seconds and the number of analysis requests.
+        """
+        return {'pid': os.getpid(), 'uptime': time.time() - self.started, 'requests': self.requests}
+
+    def close(self):
+        """
+        Stops the event loop of the external analyzers and closes the result cache.
+        """
+        self.scheduler.close()
+        if self.cache:
+            self.cache.close()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of the server:
+
+        POST /analyze   {"path": "..."} -> the result of the file (see `code_to_result`)
+        GET  /status    -> the state of the service
+        POST /shutdown  -> stops the server
+    """
+
+    server_version = "PerfeQ"
+
+    def do_GET(self):
+        if self.path == "/status":
+            self.send_json(200, self.server.service.status())
+        else:
+            self.send_json(404, {'error': f"unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path == "/shutdown":
+            self.send_json(200, {'status': "stopping"})
+            # O shutdown espera o fim do serve_forever, por isso não pode rodar na thread do servidor
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if self.path != "/analyze":
+            self.send_json(404, {'error': f"unknown endpoint: {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            path = body['path']
+        except (ValueError, KeyError, TypeError):
+            self.send_json(400, {'error': "expected a JSON object with a 'path'"})
+            return
+        try:
+            self.send_json(200, self.server.service.analyze_file(path))
+        except FileNotFoundError as error:
+            self.send_json(404, {'error': str(error)})
+        except ValueError as error:
+            self.send_json(400, {'error': str(error)})
+        except OSError as error:
+            self.send_json(500, {'error': str(error)})
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Uma linha por requisição polui a saída do servidor
+        pass
+
+
+def is_loopback(host):
+    """
+    Checks whether an address only accepts connections from the local machine.
+
+    Args:
+        host (str): An IP address or a host name (e.g. 127.0.0.1 or localhost).
+
+    Returns:
+        bool: True if the address, or every address the name resolves to, is a loopback address.
+    """
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        pass
+    # Um nome vazio escuta em todas as interfaces
+    if not host:
+        return False
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+
+def serve(host, port, naming_rules=None, use_cache=True, timeout=ANALYZER_TIMEOUT, analyzer_config=None,
+          allow_remote=False):
+    """
+    Runs the analysis server on a local address until it is interrupted or receives a shutdown request.
+    Requests are handled one at a time, by the thread that owns the result cache.
+
+    The requests are not authenticated: anyone who can reach the server can have it read any file the
+    user can read and can stop it. The server therefore only listens on loopback addresses, unless
+    `allow_remote` is given.
+
+    Args:
+        host (str): The address the server listens on (e.g. 127.0.0.1).
+        port (int): The TCP port.
+        naming_rules (dict): Custom naming rules. Defaults to `NAMING_RULES`.
+        use_cache (bool): Whether the result cache is used.
+        timeout (float): Seconds an analyzer command (pylint included) may spend on a file before it is killed.
+        analyzer_config (dict): The analyzers enabled or disabled, as returned by `load_analyzer_config`.
+        allow_remote (bool): Whether the server may listen on an address reachable from other machines.
+
+    Raises:
+        ValueError: If `host` is not a loopback address and `allow_remote` is False.
+    """
+    if not is_loopback(host):
+        if not allow_remote:
+            raise ValueError(
+                f"{host} is not a loopback address; the server has no authentication, "
+                "use --allow-remote to listen on it anyway"
+            )
+        print(
+            f"Aviso: o servidor escuta em {host}, fora da máquina local, e não tem autenticação: "
+            "quem o alcançar pode analisar qualquer arquivo legível pelo usuário e encerrá-lo",
+            file=sys.stderr,
+        )
+    service = AnalysisService(naming_rules, use_cache, timeout, analyzer_config)
+    server = HTTPServer((host, port), RequestHandler)
+    server.service = service
+    print(f"Servidor PerfeQ em http://{host}:{server.server_port} (Ctrl+C para encerrar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -1,5 +1,51 @@
-C_COMANDS = ["naming_check ", "cpplint "]
-PYTHON_COMANDS = ["naming_check ", "pylint "]
-DIVIDER_1_PYLINT = '------------------------------------------------------------------'
-DIVIDER_2_PYLINT = '*************'
-DIVIDER_3_PYLINT = 'Your code has been rated'
\ No newline at end of file
+MAX_COMMAND_LENGTH = 8000
+ENGINE_BATCH_SIZE = 50
+# Lotes em andamento por worker: os próximos só são enviados ao pool quando o primeiro é entregue
+ENGINE_BATCHES_PER_WORKER = 2
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+CACHE_READ_SIZE = 1024 * 1024
+CACHE_FORMAT_VERSION = 10
+# Segundos que uma execução espera pelo banco do cache bloqueado por outra (e.g. partes na mesma máquina)
+CACHE_LOCK_TIMEOUT = 30
+# Máximo de bytes dos arquivos em processamento ao mesmo tempo em cada processo; arquivos a partir de
+# READER_MMAP_THRESHOLD bytes são lidos de um mapeamento em memória
+READER_BYTE_BUDGET = 256 * 1024 * 1024
+READER_MMAP_THRESHOLD = 8 * 1024 * 1024
+# Bytes do início do arquivo usados para detectar a codificação (BOM ou declaração do Python)
+ENCODING_PROBE_SIZE = 1024
+ANALYZER_PACKAGES = ["perfeq", "pylint", "astroid", "cpplint"]
+IGNORE_FILES = [".gitignore", ".perfeqignore"]
+DEFAULT_EXCLUDES = [".git", "__pycache__"]
+CSV_HEADER = "code_id,LOC,warnings_qty,WPL,variable_warnings_qty,variables_qty,VWPV,function_warnings_qty,functions_qty,FWPF,formatting_warnings_qty,FWPL"
+CSV_FLUSH_INTERVAL = 100
+PARQUET_ROW_GROUP_SIZE = 10000
+PROFILE_TOP_FILES = 10
+# Regras de nomenclatura por linguagem e tipo de identificador: estilos aceitos e tamanho mínimo do nome
+NAMING_RULES = {
+    "Python": {
+        "Variable": {"styles": ["snake_case", "UPPER_CASE"], "min_length": 1},
+        "Function": {"styles": ["snake_case"], "min_length": 1},
+    },
+    "C": {
+        "Variable": {"styles": ["snake_case", "UPPER_CASE"], "min_length": 1},
+        "Function": {"styles": ["snake_case"], "min_length": 1},
+    },
+}
+# Percentis e limites inferiores (em %) das faixas do histograma de cada métrica no resumo do corpus
+SUMMARY_PERCENTILES = [50, 90, 99]
+SUMMARY_HISTOGRAM_BINS = [0, 1, 5, 10, 25, 50, 100]
+# Tempo máximo (em segundos) de um analisador por arquivo; um processo que o excede é encerrado
+ANALYZER_TIMEOUT = 60
+ANALYZER_RETRIES = 2
+ANALYZER_BACKOFF = 0.5
+# Grupo de entry points em que outros pacotes registram os seus analisadores
+ANALYZER_ENTRY_POINT_GROUP = "perfeq.analyzers"
+# Máximo de processos simultâneos de cada analisador externo; os analisadores sem limite (None) dividem
+# entre si o número de workers. O pylint, bem mais pesado que o cpplint, pode receber um limite próprio
+ANALYZER_CONCURRENCY = {"pylint": None, "cpplint": None, "ruff": None}
+# Tamanho máximo (em bytes) da resposta de um processo persistente (e.g. pylint) a um lote de arquivos
+ANALYZER_OUTPUT_LIMIT = 256 * 1024 * 1024
+ANALYZER_FAILURES_SHOWN = 20
+# Endereço local do `perfeq serve` e tempo máximo de espera do cliente (em segundos)
+SERVER_ADDRESS = "127.0.0.1:8631"
+SERVER_REQUEST_TIMEOUT = 300
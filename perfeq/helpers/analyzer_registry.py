@@ -0,0 +1,170 @@
+import json
+import sys
+
+from perfeq.constants import ANALYZER_ENTRY_POINT_GROUP
+from perfeq.helpers.builtin_analyzers import CpplintAnalyzer, PylintAnalyzer, RuffAnalyzer
+from perfeq.models.analyzer import Analyzer
+from perfeq.utils.enums import Languages, PythonBackends
+
+BUILTIN_ANALYZERS = {
+    analyzer.name: analyzer for analyzer in (PylintAnalyzer(), RuffAnalyzer(), CpplintAnalyzer())
+}
+
+# Analisadores embutidos e de plugins, carregados uma única vez por processo
+_analyzers = None
+
+
+def load_plugins():
+    """
+    Loads the analyzers that other packages register under the `perfeq.analyzers` entry point
+    group, e.g. in the setup.py of the plugin:
+
+        entry_points={'perfeq.analyzers': ['clang-tidy = perfeq_clang_tidy:ClangTidyAnalyzer']}
+
+    An entry point may point to an Analyzer subclass or instance. A plugin that cannot be loaded,
+    is not an Analyzer or reuses the name of another analyzer is reported and skipped.
+
+    Returns:
+        dict: The analyzers of the plugins, by name.
+    """
+    from importlib.metadata import entry_points
+
+    discovered = entry_points()
+    if hasattr(discovered, "select"):
+        group = discovered.select(group=ANALYZER_ENTRY_POINT_GROUP)
+    else:
+        group = discovered.get(ANALYZER_ENTRY_POINT_GROUP, [])
+
+    plugins = {}
+    for entry_point in group:
+        try:
+            loaded = entry_point.load()
+            analyzer = loaded() if isinstance(loaded, type) else loaded
+        except Exception as error:
+            print(f"Analisador '{entry_point.name}' ignorado: {error}", file=sys.stderr)
+            continue
+        if not isinstance(analyzer, Analyzer) or not analyzer.name or not isinstance(analyzer.language, Languages):
+            print(f"Analisador '{entry_point.name}' ignorado: não é um Analyzer com nome e linguagem", file=sys.stderr)
+            continue
+        if analyzer.name in BUILTIN_ANALYZERS or analyzer.name in plugins:
+            print(f"Analisador '{entry_point.name}' ignorado: o nome '{analyzer.name}' já está em uso", file=sys.stderr)
+            continue
+        plugins[analyzer.name] = analyzer
+    return plugins
+
+
+def get_analyzers():
+    """
+    Returns every available analyzer: the built-in ones and those of the installed plugins.
+
+    Returns:
+        dict: The analyzers by name.
+    """
+    global _analyzers
+    if _analyzers is None:
+        _analyzers = dict(BUILTIN_ANALYZERS, **load_plugins())
+    return _analyzers
+
+
+def get_analyzer(name):
+    """
+    Returns an analyzer by name. The plugins are only loaded when the name is not a built-in analyzer.
+
+    Args:
+        name (str): The name of the analyzer.
+
+    Returns:
+        Analyzer: The analyzer.
+
+    Raises:
+        KeyError: If there is no analyzer with this name.
+    """
+    return BUILTIN_ANALYZERS.get(name) or get_analyzers()[name]
+
+
+def load_analyzer_config(path):
+    """
+    Loads the analyzer configuration from a JSON file, with an entry per analyzer that changes,
+    e.g. `{"cpplint": {"enabled": false}, "ruff": {"enabled": true, "concurrency": 2}}`.
+
+    Args:
+        path (str): Path of the JSON file.
+
+    Returns:
+        dict: The settings by analyzer name: 'enabled' (bool) and 'concurrency' (maximum number of
+        processes of an external analyzer at the same time).
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON, or has an unknown analyzer or setting.
+    """
+    with open(path, encoding="utf8") as file:
+        config = json.load(file)
+    if not isinstance(config, dict):
+        raise ValueError(f"Expected an object with an entry per analyzer in {path}")
+
+    analyzers = get_analyzers()
+    for name, settings in config.items():
+        if name not in analyzers:
+            raise ValueError(f"Unknown analyzer in {path}: {name} (available: {', '.join(analyzers)})")
+        if not isinstance(settings, dict):
+            raise ValueError(f"Expected an object with the settings of {name} in {path}")
+        for key, value in settings.items():
+            if key == "enabled" and isinstance(value, bool):
+                continue
+            if key == "concurrency" and isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                continue
+            raise ValueError(f"Invalid setting of {name} in {path}: {key}={json.dumps(value)}")
+    return config
+
+
+def select_python_backend(backend, config=None):
+    """
+    Makes an analyzer configuration run a single Python backend: the analyzer of the backend is
+    enabled and the analyzers of the other backends are disabled.
+
+    Args:
+        backend (PythonBackends): The backend that checks the Python style.
+        config (dict): The analyzer configuration, as returned by `load_analyzer_config`.
+
+    Returns:
+        dict: A new configuration, with the other settings of `config`.
+    """
+    config = {name: dict(settings) for name, settings in (config or {}).items()}
+    for candidate in PythonBackends:
+        config.setdefault(candidate.value, {})["enabled"] = candidate == backend
+    return config
+
+
+def select_analyzers(config=None):
+    """
+    Returns the analyzers enabled by the configuration, grouped by language.
+
+    Args:
+        config (dict): The analyzer configuration, as returned by `load_analyzer_config`. An analyzer
+            it does not mention keeps its default (`Analyzer.enabled`).
+
+    Returns:
+        dict: The list of enabled analyzers of each Languages member.
+    """
+    config = config or {}
+    selected = {language: [] for language in Languages}
+    for name, analyzer in get_analyzers().items():
+        if config.get(name, {}).get("enabled", analyzer.enabled):
+            selected[analyzer.language].append(analyzer)
+    return selected
+
+
+def analyzer_concurrency(config=None):
+    """
+    Returns the concurrency limits of the external analyzers set in the configuration.
+
+    Args:
+        config (dict): The analyzer configuration, as returned by `load_analyzer_config`.
+
+    Returns:
+        dict: The maximum number of processes by analyzer name, for the CommandScheduler.
+    """
+    return {
+        name: settings["concurrency"] for name, settings in (config or {}).items() if "concurrency" in settings
+    }
@@ -0,0 +1,108 @@
+import os
+import re
+import shlex
+import subprocess
+
+from perfeq.constants import MAX_COMMAND_LENGTH
+
+
+def argument_length(path):
+    """
+    Returns the length a path takes in the command line of a process.
+
+    Args:
+        path (str): The path passed as an argument.
+
+    Returns:
+        int: The length of the path, quoted as in the Windows command line when needed.
+    """
+    if os.name == "nt":
+        return len(subprocess.list2cmdline([path]))
+    return len(path)
+
+
+def split_in_chunks(command, paths, max_length=MAX_COMMAND_LENGTH):
+    """
+    Splits the paths in chunks so that the command followed by each chunk fits in the command-line length limit.
+
+    Args:
+        command (str): The analyzer command (e.g. "cpplint ").
+        paths (list): Paths of the files to be analyzed.
+        max_length (int): Maximum length of a command line.
+
+    Returns:
+        list: A list of chunks, each one being a list of paths. A path that alone exceeds the limit gets a chunk of its own.
+    """
+    chunks = []
+    chunk = []
+    length = len(command)
+    for path in paths:
+        path_length = argument_length(path) + 1
+        if chunk and length + path_length > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = len(command)
+        chunk.append(path)
+        length += path_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def quote_program(program):
+    """
+    Quotes the path of a program for an analyzer command, so `build_argv` keeps it as a single argument.
+
+    Args:
+        program (str): The path of the program (e.g. `sys.executable`).
+
+    Returns:
+        str: The quoted path.
+    """
+    if os.name == "nt":
+        return subprocess.list2cmdline([program])
+    return shlex.quote(program)
+
+
+def build_argv(command):
+    """
+    Splits an analyzer command in the arguments of the process, so it runs without a shell.
+
+    Args:
+        command (str): The analyzer command (e.g. "cpplint ").
+
+    Returns:
+        list: The program and its options; the paths of the files are appended to them.
+    """
+    argv = shlex.split(command, posix=os.name != "nt")
+    if os.name == "nt":
+        # Fora do modo POSIX as aspas de um argumento com espaços são mantidas
+        argv = [argument[1:-1] if len(argument) > 1 and argument[0] == argument[-1] == '"' else argument for argument in argv]
+    return argv
+
+
+def route_output(output, paths):
+    """
+    Routes the output lines of an analyzer run over many files back to the file they refer to.
+
+    A line that contains one of the paths is attributed to that path. A line that does not contain
+    any path is attributed to the file most recently named in the output, so tools that print a
+    file header followed by its messages are routed correctly as well.
+
+    Args:
+        output (str): The output of the analyzer.
+        paths (list): Paths of the files in the chunk.
+
+    Returns:
+        dict: A dictionary mapping each path to its part of the output.
+    """
+    routed = {path: [] for path in paths}
+    current = paths[0] if len(paths) == 1 else None
+    pattern = re.compile("|".join(re.escape(path) for path in sorted(paths, key=len, reverse=True)))
+    for line in output.splitlines():
+        match = pattern.search(line)
+        if match:
+            current = match.group(0)
+        if current is not None:
+            routed[current].append(line)
+    return {path: "\n".join(lines) for path, lines in routed.items()}
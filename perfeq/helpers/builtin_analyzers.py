@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import sys
+
+from perfeq.helpers.batch_helper import quote_program
+from perfeq.models.analyzer import Analyzer
+from perfeq.utils.enums import Languages, TypesOfWarning
+
+# path/to/file.c:12:  Missing space before {  [whitespace/braces] [5]
+CPPLINT_PATTERN = re.compile(r":(?P<line>\d+):[ \t]+(?P<message>.*)")
+
+PYLINT_WARNING_KEYWORDS = {
+    "Function": TypesOfWarning.FUNCTION,
+    "Constant": TypesOfWarning.VARIABLE,
+    "Variable": TypesOfWarning.VARIABLE,
+}
+
+# Regras do ruff usadas no lugar do pylint, com a mensagem equivalente do pylint e o tipo de aviso.
+# O tipo é o mesmo que `classify_pylint` dá à mensagem equivalente, para que as métricas (WPL, VWPV,
+# FWPF e FWPL) continuem comparáveis entre os dois backends
+RUFF_RULES = {
+    "N801": ("invalid-name (Class name)", TypesOfWarning.FORMATTING),
+    "N802": ("invalid-name (Function name)", TypesOfWarning.FUNCTION),
+    "N803": ("invalid-name (Argument name)", TypesOfWarning.FORMATTING),
+    "N806": ("invalid-name (Variable name)", TypesOfWarning.VARIABLE),
+    "N815": ("invalid-name (Class attribute name)", TypesOfWarning.FORMATTING),
+    "N816": ("invalid-name (Constant name)", TypesOfWarning.VARIABLE),
+    "E501": ("line-too-long", TypesOfWarning.FORMATTING),
+    "W291": ("trailing-whitespace", TypesOfWarning.FORMATTING),
+    "W293": ("trailing-whitespace", TypesOfWarning.FORMATTING),
+    "W292": ("missing-final-newline", TypesOfWarning.FORMATTING),
+    "E401": ("multiple-imports", TypesOfWarning.FORMATTING),
+    "E701": ("multiple-statements", TypesOfWarning.FORMATTING),
+    "E702": ("multiple-statements", TypesOfWarning.FORMATTING),
+    "E711": ("singleton-comparison", TypesOfWarning.FORMATTING),
+    "E712": ("singleton-comparison", TypesOfWarning.FORMATTING),
+    "E722": ("bare-except", TypesOfWarning.FORMATTING),
+    "D100": ("missing-module-docstring", TypesOfWarning.FORMATTING),
+    "D101": ("missing-class-docstring", TypesOfWarning.FORMATTING),
+    "D102": ("missing-function-docstring", TypesOfWarning.FORMATTING),
+    "D103": ("missing-function-docstring", TypesOfWarning.FORMATTING),
+    "F401": ("unused-import", TypesOfWarning.FORMATTING),
+    "F403": ("wildcard-import", TypesOfWarning.FORMATTING),
+    "F811": ("function-redefined", TypesOfWarning.FORMATTING),
+    "F821": ("undefined-variable", TypesOfWarning.FORMATTING),
+    "F841": ("unused-variable", TypesOfWarning.FORMATTING),
+    "ARG001": ("unused-argument", TypesOfWarning.FORMATTING),
+    "ARG002": ("unused-argument", TypesOfWarning.FORMATTING),
+    "A001": ("redefined-builtin", TypesOfWarning.FORMATTING),
+    "A002": ("redefined-builtin", TypesOfWarning.FORMATTING),
+    "B018": ("pointless-statement", TypesOfWarning.FORMATTING),
+    "BLE001": ("broad-exception-caught", TypesOfWarning.FORMATTING),
+    "TRY002": ("broad-exception-raised", TypesOfWarning.FORMATTING),
+    "PIE790": ("unnecessary-pass", TypesOfWarning.FORMATTING),
+    "RET505": ("no-else-return", TypesOfWarning.FORMATTING),
+    "PLC0415": ("import-outside-toplevel", TypesOfWarning.FORMATTING),
+    "PLR0911": ("too-many-return-statements", TypesOfWarning.FORMATTING),
+    "PLR0912": ("too-many-branches", TypesOfWarning.FORMATTING),
+    "PLR0913": ("too-many-arguments", TypesOfWarning.FORMATTING),
+    "PLR0915": ("too-many-statements", TypesOfWarning.FORMATTING),
+    "PLR1714": ("consider-using-in", TypesOfWarning.FORMATTING),
+    "PLW0120": ("useless-else-on-loop", TypesOfWarning.FORMATTING),
+    "PLW0603": ("global-statement", TypesOfWarning.FORMATTING),
+}
+# Limite de caracteres por linha padrão do pylint (max-line-length)
+RUFF_LINE_LENGTH = 100
+
+def classify_pylint(message):
+    """
+    Returns the type of a pylint warning based on predefined keywords.
+
+    Args:
+        message (str): The warning message.
+
+    Returns:
+        TypesOfWarning: FUNCTION or VARIABLE for naming messages, FORMATTING otherwise.
+    """
+    return next((warning_type for keyword, warning_type in PYLINT_WARNING_KEYWORDS.items() if keyword in message), TypesOfWarning.FORMATTING)
+
+
+class PylintAnalyzer(Analyzer):
+    """
+    Lints Python files with the pylint API in persistent processes (`perfeq.helpers.pylint_runner`),
+    each one with a PyLinter shared by every batch it receives. The processes keep pylint and astroid
+    loaded between batches, and the scheduler kills the one that exceeds its deadline, like any
+    other command.
+    """
+
+    name = "pylint"
+    language = Languages.PYTHON
+    command = f"{quote_program(sys.executable)} -m perfeq.helpers.pylint_runner"
+    persistent = True
+    package = "pylint"
+    # O invalid-name do pylint já verifica os nomes
+    checks_naming = True
+
+    def route(self, output, paths):
+        # A resposta é um objeto JSON com os avisos [linha, mensagem] de cada arquivo do lote
+        answer = json.loads(output)
+        return {path: [(line, message) for line, message in answer.get(path, [])] for path in paths}
+
+    def parse(self, output):
+        return output
+
+    def classify(self, message):
+        return classify_pylint(message)
+
+
+class CpplintAnalyzer(Analyzer):
+    """
+    Runs cpplint over chunks of C files; every warning is a formatting warning.
+    """
+
+    name = "cpplint"
+    language = Languages.C
+    command = "cpplint"
+    package = "cpplint"
+
+    def select_output(self, returncode, stdout, stderr):
+        # O cpplint escreve os avisos no stderr e termina com status 1 quando há avisos
+        return stdout if returncode == 0 else stderr
+
+    def parse(self, output):
+        return [(int(line), message) for line, message in CPPLINT_PATTERN.findall(output)]
+
+
+class RuffAnalyzer(Analyzer):
+    """
+    Runs ruff over chunks of Python files with the rules of `RUFF_RULES`, which stand for the
+    pylint checks, as a faster alternative to pylint (`--python-backend ruff`). The project
+    configuration of ruff is ignored, so every run checks the same rules.
+    """
+
+    name = "ruff"
+    language = Languages.PYTHON
+    command = (
+        "ruff check --isolated --no-fix --exit-zero --output-format json "
+        f"--line-length {RUFF_LINE_LENGTH} --select {','.join(RUFF_RULES)}"
+    )
+    package = "ruff"
+    enabled = False
+    # As regras N8xx do pep8-naming já verificam os nomes
+    checks_naming = True
+
+    def route(self, output, paths):
+        # A saída em JSON é uma única lista com os avisos de todos os arquivos do lote
+        keys = {os.path.abspath(path): path for path in paths}
+        routed = {path: [] for path in paths}
+        for diagnostic in json.loads(output or "[]"):
+            key = keys.get(os.path.abspath(diagnostic['filename']))
+            if key is None:
+                continue
+            # Erros de sintaxe não têm código
+            code = diagnostic['code'] or "syntax-error"
+            routed[key].append((diagnostic['location']['row'], f"{diagnostic['message']} ({code})"))
+        return routed
+
+    def parse(self, output):
+        return output
+
+    def classify(self, message):
+        code = message[message.rfind("(") + 1:-1]
+        return RUFF_RULES.get(code, (None, TypesOfWarning.FORMATTING))[1]
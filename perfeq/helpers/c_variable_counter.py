@@ -1,38 +1,245 @@
 import re
 
-def c_variable_counter(code):
+from perfeq.utils.enums import TypesOfWarning
+
+# Palavras-chave que iniciam comandos que não são declarações
+STATEMENT_KEYWORDS = r"(?:return|goto|break|continue|case|default|if|else|for|while|do|switch|sizeof|typedef)\b"
+# Marcador que substitui o corpo de um inicializador, enum ou struct
+BODY = " __body__ "
+
+# Um único scanner para todo o arquivo: o texto entre os caracteres estruturais ;{}() é lido de uma vez,
+# e comentários, diretivas do pré-processador e literais viram tokens próprios
+TOKEN_PATTERN = re.compile(
+    r"""
+    [^;{}()"'/\#]+
+    |[;{}()]
+    |//[^\n]*|/\*.*?\*/
+    |\#(?:\\\n|[^\n])*
+    |"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'
+    |[\s\S]
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+STRUCTURAL = frozenset(";{}()")
+COMMENT_STARTS = ("//", "/*")
+
+_WORD = r"(?!(?:struct|union|enum)\b)[A-Za-z_]\w*\b"
+_TYPE = rf"(?:(?:struct|union|enum)\s+\w+\b|{_WORD})"
+# Especificadores de tipo seguidos do nome: `static const char *name`, `struct node *next`
+_DECLARATOR = rf"\s*(?!{STATEMENT_KEYWORDS}){_TYPE}(?:[\s*]*{_TYPE})*?[\s*]+(?!__body__\b)(?P<name>{_WORD})"
+
+DECLARATION_PATTERN = re.compile(rf"{_DECLARATOR}\s*(?:[=,\[]|\Z)")
+FUNCTION_PATTERN = re.compile(rf"{_DECLARATOR}\s*\(.*\)\s*\Z", re.DOTALL)
+RECORD_PATTERN = re.compile(r"\b(?:struct|union)\b")
+FOR_PATTERN = re.compile(r"\s*for\s*\Z")
+# Usados apenas para coletar os identificadores
+NEXT_DECLARATOR_PATTERN = re.compile(r",[\s*]*([A-Za-z_]\w*)")
+RECORD_TAG_PATTERN = re.compile(r"\b(?:struct|union)\s+([A-Za-z_]\w*)\s*\Z")
+TYPEDEF_NAME_PATTERN = re.compile(r"\s*typedef\b.*__body__[\s*]*([A-Za-z_]\w*)\s*\Z", re.DOTALL)
+
+
+def _count_for_init(statement):
+    """
+    Counts the variables declared in the initialization of a `for` loop, as in `for (int i = 0, j = 1;`.
+
+    Args:
+        statement (list): The pieces of the statement, starting with 'for' and '('.
+
+    Returns:
+        int: The number of declared variables.
+    """
+    text = "".join(statement[2:])
+    if not DECLARATION_PATTERN.match(text):
+        return 0
+    declarators = 1
+    depth = 0
+    for piece in statement[2:]:
+        if piece == "(":
+            depth += 1
+        elif piece == ")":
+            depth -= 1
+        elif depth == 0:
+            declarators += piece.count(",")
+    return declarators
+
+
+def _top_level_text(statement):
+    """
+    Joins the pieces of a statement that are not inside parentheses.
+
+    Args:
+        statement (list): The pieces of the statement.
+
+    Returns:
+        str: The text of the statement without the parenthesized parts.
+    """
+    pieces = []
+    depth = 0
+    for piece in statement:
+        if piece == "(":
+            depth += 1
+        elif piece == ")":
+            depth -= 1
+        elif depth == 0:
+            pieces.append(piece)
+    return "".join(pieces)
+
+
+def _declarator_names(match, statement):
+    """
+    Returns the names declared by a declaration, as in `int a, *b = f(1, 2), c[3]`.
+
+    Args:
+        match (re.Match): The match of DECLARATION_PATTERN over the statement.
+        statement (list): The pieces of the statement.
+
+    Returns:
+        list: The declared names.
+    """
+    text = _top_level_text(statement)
+    start = DECLARATION_PATTERN.match(text).end("name")
+    return [match.group("name")] + NEXT_DECLARATOR_PATTERN.findall(text, start)
+
+
+def c_variable_counter(code, identifiers=None):
     """
     Counts the number of variable declarations and function definitions in a given C code.
+
+    The code is scanned once: comments, string literals and preprocessor directives are
+    skipped and declarations spanning several lines are handled. Variables are the
+    declarators of every declaration (globals, locals, struct members and the initialization
+    of `for` loops) plus one per struct/union definition. Functions are function definitions
+    and prototypes.
+
     Args:
-        code (str): A string containing the C code to be analyzed.
+        code (str): A string containing the C code to be analyzed. A list of lines is also accepted.
+        identifiers (list): If given, a (name, line, TypesOfWarning) tuple is appended to it for every
+            variable, struct/union and function found, to be checked by the NamingChecker.
     Returns:
         tuple: A tuple containing two integers:
             - variable_count (int): The number of variable declarations.
             - function_count (int): The number of function definitions.
     """
-    function_pattern = re.compile(
-    r'^[\w\s\*]+[\w\*]+\s*\([\w\s,]*\)\s*[{;]?$',
-    re.MULTILINE
-)
-    variable_pattern = re.compile(r"\b(?!struct\b)([a-zA-Z_]\w*)\b\s+([a-zA-Z_]\w*(?:\s*,\s*[a-zA-Z_]\w*)*)\s*(;|=)")
+    if isinstance(code, list):
+        code = "\n".join(code)
 
-    struct_pattern = re.compile(
-        r'^\s*(typedef\s+)?struct(\s+\w+)?(\s*(\{[^}]*\})?)?\s*?', re.MULTILINE | re.DOTALL
-    )
-    
-    function_count = 0
+    collect = identifiers is not None
     variable_count = 0
-    for line in code:
-        line = line.strip()
-        
-        if function_pattern.match(line):
-            function_count += 1
-        elif variable_pattern.match(line):
-            match = variable_pattern.match(line) 
-            declaracoes = match.group(2) 
-            variable_count += len([var.strip() for var in declaracoes.split(',') if var.strip()])
-        elif struct_pattern.match(line):
-            variable_count += 1
-    
-
-    return variable_count, function_count
\ No newline at end of file
+    function_count = 0
+    # Pedaços do comando atual e vírgulas fora de parênteses (separam os declaradores)
+    statement = []
+    commas = 0
+    # Comandos suspensos pelos blocos abertos (apenas o de struct/union é retomado ao fechar)
+    scopes = []
+    skip_depth = 0
+    paren_depth = 0
+    for_init_done = False
+    # Linha atual e linha onde o comando atual começa, mantidas apenas ao coletar os identificadores
+    line = 1
+    statement_line = 0
+
+    for token in TOKEN_PATTERN.findall(code):
+        if collect:
+            token_line = line
+            line += token.count("\n")
+
+        if skip_depth:
+            # Dentro de um inicializador ou enum: só interessa o fechamento
+            if token == "{":
+                skip_depth += 1
+            elif token == "}":
+                skip_depth -= 1
+                if not skip_depth:
+                    statement.append(BODY)
+            continue
+
+        if token not in STRUCTURAL:
+            first = token[0]
+            if first == '"' or first == "'":
+                statement.append("0")
+            elif first == "#" or (first == "/" and token.startswith(COMMENT_STARTS)):
+                # Comentário ou diretiva do pré-processador
+                if statement:
+                    statement.append(" ")
+            else:
+                statement.append(token)
+                if not paren_depth:
+                    commas += token.count(",")
+                if collect and not statement_line and not token.isspace():
+                    blank = len(token) - len(token.lstrip())
+                    statement_line = token_line + token.count("\n", 0, blank)
+        elif token == "(":
+            paren_depth += 1
+            statement.append(token)
+        elif token == ")":
+            paren_depth = max(paren_depth - 1, 0)
+            statement.append(token)
+        elif token == ";" and paren_depth:
+            # Inicialização de um `for`: `for (int i = 0; ...`
+            if not for_init_done and len(statement) > 1 and statement[1] == "(" and FOR_PATTERN.match(statement[0]):
+                declared = _count_for_init(statement)
+                variable_count += declared
+                if collect and declared:
+                    for name in _declarator_names(DECLARATION_PATTERN.match("".join(statement[2:])), statement[2:]):
+                        identifiers.append((name, statement_line, TypesOfWarning.VARIABLE))
+                for_init_done = True
+            statement.append(token)
+        elif token == ";":
+            text = "".join(statement)
+            match = ")" in statement and FUNCTION_PATTERN.match(text)
+            if match:
+                function_count += 1
+                if collect:
+                    identifiers.append((match.group("name"), statement_line, TypesOfWarning.FUNCTION))
+            else:
+                match = DECLARATION_PATTERN.match(text)
+                if match:
+                    variable_count += commas + 1
+                    if collect:
+                        for name in _declarator_names(match, statement):
+                            identifiers.append((name, statement_line, TypesOfWarning.VARIABLE))
+                elif collect and BODY in statement:
+                    # Nome dado por um typedef a uma struct/union: `typedef struct {...} record;`
+                    match = TYPEDEF_NAME_PATTERN.match(text)
+                    if match:
+                        identifiers.append((match.group(1), statement_line, TypesOfWarning.VARIABLE))
+            statement = []
+            commas = 0
+            statement_line = 0
+            for_init_done = False
+        elif token == "{":
+            text = "".join(statement)
+            if paren_depth or "=" in text or "enum" in text:
+                skip_depth = 1
+                continue
+            match = FUNCTION_PATTERN.match(text)
+            if match:
+                function_count += 1
+                if collect:
+                    identifiers.append((match.group("name"), statement_line, TypesOfWarning.FUNCTION))
+                scopes.append(None)
+            elif RECORD_PATTERN.search(text):
+                variable_count += 1
+                if collect and not text.lstrip().startswith("typedef"):
+                    match = RECORD_TAG_PATTERN.search(text)
+                    if match:
+                        identifiers.append((match.group(1), statement_line, TypesOfWarning.VARIABLE))
+                scopes.append((statement, commas, statement_line))
+            else:
+                scopes.append(None)
+            statement = []
+            commas = 0
+            statement_line = 0
+            for_init_done = False
+        else:
+            suspended = scopes.pop() if scopes else None
+            if suspended is not None:
+                statement, commas, statement_line = suspended
+                statement.append(BODY)
+            else:
+                statement = []
+                commas = 0
+                statement_line = 0
+            paren_depth = 0
+
+    return variable_count, function_count
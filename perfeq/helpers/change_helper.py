@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+
+
+def git_changed_files(path, ref):
+    """
+    Lists the files changed since a git revision, including uncommitted and untracked files.
+
+    Args:
+        path (str): A path inside the git repository.
+        ref (str): The base revision (branch, tag or commit).
+
+    Returns:
+        set: The real paths of the changed files.
+
+    Raises:
+        RuntimeError: If the path is not inside a git repository or the revision does not exist.
+    """
+    directory = path if os.path.isdir(path) else os.path.dirname(path) or "."
+
+    def git(*args):
+        result = subprocess.run(
+            ["git", "-C", directory, *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    root = git("rev-parse", "--show-toplevel").strip()
+    changed = git("diff", "--name-only", "-z", ref, "--").split("\0")
+    changed += git("ls-files", "--others", "--exclude-standard", "-z", "--full-name").split("\0")
+    return {os.path.realpath(os.path.join(root, name)) for name in changed if name}
+
+
+class MtimeManifest:
+    def __init__(self, path):
+        """
+        Loads the manifest with the modification time and size of the files analyzed in the previous run.
+
+        Args:
+            path (str): Path of the JSON manifest. It does not need to exist.
+        """
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf8") as file:
+                self.entries = json.load(file)
+
+    @staticmethod
+    def _stat(path):
+        """
+        Returns the modification time (in nanoseconds) and the size of a file, or None if it cannot be accessed.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def changed(self, codes):
+        """
+        Lists the files that are new or were modified since the manifest was saved.
+
+        Args:
+            codes (list): Dictionaries with 'path' and 'language' keys.
+
+        Returns:
+            set: The real paths of the changed files.
+        """
+        changed = set()
+        for code in codes:
+            path = os.path.realpath(code['path'])
+            if self.entries.get(path) != self._stat(path):
+                changed.add(path)
+        return changed
+
+    def save(self, codes):
+        """
+        Saves the modification time and size of the given files, replacing the previous manifest.
+
+        Args:
+            codes (list): Dictionaries with 'path' and 'language' keys.
+        """
+        self.entries = {}
+        for code in codes:
+            path = os.path.realpath(code['path'])
+            stat = self._stat(path)
+            if stat is not None:
+                self.entries[path] = stat
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf8") as file:
+            json.dump(self.entries, file)
+        os.replace(self.path + ".tmp", self.path)
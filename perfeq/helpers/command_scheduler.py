@@ -0,0 +1,247 @@
+import asyncio
+import json
+import locale
+import threading
+
+from perfeq.constants import (
+    ANALYZER_BACKOFF,
+    ANALYZER_CONCURRENCY,
+    ANALYZER_OUTPUT_LIMIT,
+    ANALYZER_RETRIES,
+    ANALYZER_TIMEOUT,
+)
+from perfeq.helpers.profiler import Profiler
+
+
+class CommandTimeout(Exception):
+    pass
+
+
+class CommandScheduler:
+    def __init__(
+        self,
+        jobs,
+        concurrency=None,
+        timeout=ANALYZER_TIMEOUT,
+        retries=ANALYZER_RETRIES,
+        backoff=ANALYZER_BACKOFF,
+        profiler=None,
+    ):
+        """
+        Initializes the scheduler that runs the analyzer commands as subprocesses in an asyncio
+        event loop, in a thread of its own. The analyzers share a budget of `jobs` processes running
+        at the same time, except those with a limit of their own, and each command has a deadline: a
+        command that exceeds it is killed. The processes of persistent commands (see
+        `Analyzer.persistent`) are kept between chunks and reused.
+
+        Args:
+            jobs (int): Number of processes shared by the analyzers without a limit of their own.
+            concurrency (dict): Limit of processes by analyzer name, overriding `ANALYZER_CONCURRENCY`. An
+                analyzer with a limit runs up to that many processes, apart from the shared budget.
+            timeout (float): Seconds allowed per file; a command over N files may run for N times as long.
+            retries (int): Number of times a single-file command that timed out, was killed or could not
+                be started is run again before the file is recorded as failed.
+            backoff (float): Seconds waited before the first retry, doubled at each new retry.
+            profiler (Profiler): Profiler that receives a span per command.
+        """
+        self.jobs = jobs
+        self.concurrency = dict(ANALYZER_CONCURRENCY, **(concurrency or {}))
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.profiler = profiler or Profiler()
+        self.encoding = locale.getpreferredencoding(False)
+        self.semaphores = {}
+        # Processos ociosos de cada comando persistente, por nome do analisador
+        self.idle = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="perfeq-scheduler", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, name, argv, paths, handler=None, persistent=False):
+        """
+        Schedules an analyzer command over a chunk of files.
+
+        Args:
+            name (str): The analyzer name, which selects its concurrency limit (e.g. "cpplint").
+            argv (list): The command and its options, without the paths.
+            paths (list): Paths of the files in the chunk, appended to `argv`.
+            handler (callable): Called with (paths, return code, stdout, stderr) in the scheduler thread
+                as soon as a run finishes. Its result is kept in place of the run, so the raw output is
+                released right away.
+            persistent (bool): Whether `argv` starts a persistent process, which receives the paths on
+                its standard input instead (see `Analyzer.persistent`).
+
+        Returns:
+            concurrent.futures.Future: Resolves to a tuple with the list of runs, each one a tuple
+            (paths, return code, stdout, stderr) or the result of `handler`, and a dictionary mapping
+            the path of each file that could not be analyzed to the reason.
+        """
+        return asyncio.run_coroutine_threadsafe(self.run_chunk(name, argv, paths, handler, persistent), self.loop)
+
+    def start(self, name, argv):
+        """
+        Starts a process of a persistent command before its first chunk, e.g. so a server loads pylint
+        before its first request.
+
+        Args:
+            name (str): The analyzer name.
+            argv (list): The command and its options.
+        """
+        asyncio.run_coroutine_threadsafe(self.start_idle(name, argv), self.loop).result()
+
+    async def start_idle(self, name, argv):
+        self.idle.setdefault(name, []).append(await self.spawn_persistent(argv))
+
+    async def run_chunk(self, name, argv, paths, handler=None, persistent=False):
+        runs = []
+        failures = {}
+        await self.run_with_retries(name, argv, paths, runs, failures, handler, persistent)
+        return runs, failures
+
+    async def run_with_retries(self, name, argv, paths, runs, failures, handler=None, persistent=False):
+        """
+        Runs a command over a chunk of files. When a chunk with several files times out, it is split
+        in halves that run again, so a file that hangs the analyzer ends up alone; a file that still
+        fails after the retries is recorded in `failures` without holding back the other files.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                returncode, stdout, stderr = await self.execute(name, argv, paths, persistent)
+            except CommandTimeout:
+                if len(paths) > 1:
+                    middle = len(paths) // 2
+                    await asyncio.gather(
+                        self.run_with_retries(name, argv, paths[:middle], runs, failures, handler, persistent),
+                        self.run_with_retries(name, argv, paths[middle:], runs, failures, handler, persistent),
+                    )
+                    return
+                reason = f"{name}: killed after {self.timeout:g}s"
+                continue
+            except FileNotFoundError:
+                # Um analisador que não está instalado não passa a existir com novas tentativas
+                reason = f"{name}: command not found"
+                break
+            except OSError as error:
+                reason = f"{name}: {error}"
+                continue
+            if returncode < 0:
+                # O processo foi encerrado por um sinal (e.g. falta de memória)
+                reason = f"{name}: terminated by signal {-returncode}"
+                continue
+            runs.append(handler(paths, returncode, stdout, stderr) if handler else (paths, returncode, stdout, stderr))
+            return
+        for path in paths:
+            failures[path] = reason
+
+    async def execute(self, name, argv, paths, persistent=False):
+        """
+        Runs a command over a chunk of files without a shell, once the analyzer has a free slot,
+        killing it when it exceeds the deadline of the chunk. A persistent command receives the chunk
+        in one of its processes (see `execute_persistent`).
+
+        Raises:
+            CommandTimeout: If the command did not finish in `timeout` seconds.
+            OSError: If the command could not be started.
+        """
+        # Os analisadores sem limite próprio compartilham o mesmo semáforo
+        key = name if self.concurrency.get(name) else None
+        semaphore = self.semaphores.get(key)
+        if semaphore is None:
+            semaphore = self.semaphores[key] = asyncio.Semaphore(self.concurrency.get(name) or self.jobs)
+        async with semaphore:
+            # Enquanto espera o processo, a thread do loop executa as outras corrotinas: apenas o tempo real é medido
+            with self.profiler.span(name, "analyzer", cpu=False, files=paths):
+                if persistent:
+                    return await self.execute_persistent(name, argv, paths)
+                process = await asyncio.create_subprocess_exec(
+                    *argv, *paths, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout * len(paths))
+                except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+                    await self.kill(process)
+                    if isinstance(error, asyncio.TimeoutError):
+                        raise CommandTimeout() from error
+                    raise
+        return (
+            process.returncode,
+            stdout.decode(self.encoding, errors="replace"),
+            stderr.decode(self.encoding, errors="replace"),
+        )
+
+    async def execute_persistent(self, name, argv, paths):
+        """
+        Sends a chunk of files to an idle process of a persistent command, starting a new one when
+        none is idle. The process is reused once it answers; when it exceeds the deadline of the chunk
+        or fails, it is killed and the next chunk starts another one.
+
+        Raises:
+            CommandTimeout: If the process did not answer in `timeout` seconds.
+            OSError: If the process could not be started or exited without answering.
+        """
+        idle = self.idle.setdefault(name, [])
+        process = idle.pop() if idle else await self.spawn_persistent(argv)
+        try:
+            process.stdin.write(json.dumps(paths).encode("utf8") + b"\n")
+            await process.stdin.drain()
+            answer = await asyncio.wait_for(process.stdout.readline(), self.timeout * len(paths))
+        except BaseException as error:
+            await self.kill(process)
+            if isinstance(error, asyncio.TimeoutError):
+                raise CommandTimeout() from error
+            if isinstance(error, ValueError):
+                raise OSError(f"answer longer than {ANALYZER_OUTPUT_LIMIT} bytes") from error
+            raise
+        if not answer:
+            # O processo terminou sem responder (e.g. foi encerrado por um sinal ou falhou ao iniciar)
+            returncode = await process.wait()
+            if returncode >= 0:
+                raise OSError(f"exited with status {returncode} without answering")
+            return returncode, "", ""
+        idle.append(process)
+        return 0, answer.decode(self.encoding, errors="replace"), ""
+
+    @staticmethod
+    async def spawn_persistent(argv):
+        # O stderr é herdado: as mensagens do analisador aparecem como apareceriam no próprio processo
+        return await asyncio.create_subprocess_exec(
+            *argv, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=ANALYZER_OUTPUT_LIMIT
+        )
+
+    @staticmethod
+    async def kill(process):
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+    async def cancel_pending(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Os processos ociosos dos comandos persistentes não têm mais lotes a receber
+        for processes in self.idle.values():
+            for process in processes:
+                await self.kill(process)
+        self.idle = {}
+
+    def close(self):
+        """
+        Cancels the commands still scheduled, killing the running ones and the idle processes of the
+        persistent commands, and stops the event loop.
+        """
+        asyncio.run_coroutine_threadsafe(self.cancel_pending(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
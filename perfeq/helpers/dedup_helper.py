@@ -0,0 +1,119 @@
+import csv
+import hashlib
+import os
+
+from perfeq.constants import CACHE_READ_SIZE, CSV_FLUSH_INTERVAL
+
+DUPLICATES_COLUMNS = ["code_id", "duplicate_of"]
+
+
+def content_key(code):
+    """
+    Builds the key that identifies the files with the same bytes. Only byte-identical files share a
+    key: files that differ only in whitespace may still have different lines of code and formatting
+    warnings, so they are analyzed on their own.
+
+    Args:
+        code (dict): Dictionary with 'path' and 'language' keys.
+
+    Returns:
+        str: The key, or None if the file cannot be read. The name of the file is part of the key,
+        as it also appears in the warnings (e.g. the module name in pylint).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(code['path'], "rb") as file:
+            for block in iter(lambda: file.read(CACHE_READ_SIZE), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    digest.update(b"\0" + os.path.basename(code['path']).encode("utf8"))
+    digest.update(b"\0" + code['language'].encode("utf8"))
+    return digest.hexdigest()
+
+
+def group_duplicates(codes):
+    """
+    Groups the files with the same content key. The first file of each group is its representative:
+    only it is analyzed, and its result is given to the other members.
+
+    Args:
+        codes (list): Dictionaries with 'path' and 'language' keys.
+
+    Returns:
+        tuple: The representatives, in the order of `codes` (with the files that cannot be read, which
+        are reported when they are analyzed), and a dictionary mapping the path of each representative
+        with duplicates to the paths of its duplicates.
+    """
+    representatives = []
+    duplicates = {}
+    first_paths = {}
+    for code in codes:
+        key = content_key(code)
+        first_path = first_paths.get(key) if key else None
+        if first_path is None:
+            if key:
+                first_paths[key] = code['path']
+            representatives.append(code)
+        else:
+            duplicates.setdefault(first_path, []).append(code['path'])
+    return representatives, duplicates
+
+
+def read_duplicates(path):
+    """
+    Reads the duplicates file of a previous run.
+
+    Args:
+        path (str): Path of the CSV file.
+
+    Returns:
+        dict: The representative of each duplicate, by code id.
+    """
+    with open(path, encoding="utf8", newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        return {row[0]: row[1] for row in reader if len(row) == 2}
+
+
+class DuplicatesWriter:
+    def __init__(self, path, kept=None, flush_interval=CSV_FLUSH_INTERVAL):
+        """
+        Opens the CSV file that marks the files whose result was copied from a duplicate, with the
+        columns `code_id` and `duplicate_of` (the analyzed representative).
+
+        Args:
+            path (str): Path of the CSV file; it is overwritten.
+            kept (dict): Entries of a previous run to keep (representative by code id), e.g. of the
+                files that were not analyzed again when resuming.
+            flush_interval (int): Number of rows written between two flushes to disk.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending_rows = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w", encoding="utf8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(DUPLICATES_COLUMNS)
+        for code_id, duplicate_of in (kept or {}).items():
+            self.writer.writerow([code_id, duplicate_of])
+
+    def write(self, code_id, duplicate_of):
+        """
+        Marks a file whose result was copied from its representative.
+
+        Args:
+            code_id (str): The path of the duplicate.
+            duplicate_of (str): The path of the representative.
+        """
+        self.writer.writerow([code_id, duplicate_of])
+        self.pending_rows += 1
+        if self.pending_rows >= self.flush_interval:
+            self.file.flush()
+            self.pending_rows = 0
+
+    def close(self):
+        """
+        Flushes the remaining rows and closes the file.
+        """
+        self.file.close()
@@ -0,0 +1,138 @@
+import os
+import re
+
+from perfeq.constants import IGNORE_FILES
+
+
+def compile_pattern(pattern):
+    """
+    Converte um padrão do .gitignore em uma expressão regular. Assim como no git, `*` e `?` não
+    casam com `/`, `**` entre barras (ou no início ou no fim do padrão) casa com qualquer número de
+    diretórios e `\\` escapa o caractere seguinte.
+
+    Args:
+        pattern (str): O padrão, sem a `/` inicial e final.
+
+    Returns:
+        re.Pattern: A expressão regular que casa com o caminho inteiro.
+    """
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        at_start = index == 0 or pattern[index - 1] == "/"
+        if at_start and pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if at_start and pattern[index:] == "**":
+            parts.append(".*")
+            break
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[index + 1:end]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                parts.append("[" + content.replace("\\", "\\\\") + "]")
+                index = end
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+class IgnoreRules:
+    def __init__(self, rules=None):
+        """
+        Inicializa as regras de exclusão no formato do .gitignore.
+
+        Args:
+            rules (list): Lista de tuplas (diretório base, padrão compilado, negado, apenas diretórios, ancorado).
+        """
+        self.rules = rules or []
+
+    def extend(self, directory):
+        """
+        Lê os arquivos de exclusão (.gitignore, .perfeqignore) de um diretório.
+
+        Args:
+            directory (str): Diretório cujos arquivos de exclusão serão lidos.
+
+        Returns:
+            IgnoreRules: As regras atuais acrescidas das regras do diretório. Se o diretório
+            não tiver arquivos de exclusão, retorna a própria instância.
+        """
+        rules = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(directory, name), encoding="utf8", errors="replace") as file:
+                    for line in file:
+                        rule = self._parse_line(directory, line)
+                        if rule:
+                            rules.append(rule)
+            except OSError:
+                continue
+        if not rules:
+            return self
+        return IgnoreRules(self.rules + rules)
+
+    def _parse_line(self, directory, line):
+        """
+        Converte uma linha de um arquivo de exclusão em uma regra.
+
+        Args:
+            directory (str): Diretório do arquivo de exclusão.
+            line (str): Linha do arquivo.
+
+        Returns:
+            tuple: A regra (diretório base, padrão compilado, negado, apenas diretórios, ancorado), ou None para linhas vazias e comentários.
+        """
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # Padrões com "/" são relativos ao diretório do arquivo de exclusão; os demais casam com o nome em qualquer nível
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            return None
+        return directory, compile_pattern(line), negated, dir_only, anchored
+
+    def is_ignored(self, path, is_dir):
+        """
+        Verifica se um caminho é excluído pelas regras. Assim como no git, a última regra que casar com o caminho prevalece.
+
+        Args:
+            path (str): Caminho do arquivo ou diretório.
+            is_dir (bool): Se o caminho é um diretório.
+
+        Returns:
+            bool: True se o caminho deve ser ignorado, False caso contrário.
+        """
+        ignored = False
+        name = os.path.basename(path)
+        for directory, pattern, negated, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                matched = pattern.match(relative)
+            else:
+                matched = pattern.match(name)
+            if matched:
+                ignored = not negated
+        return ignored
@@ -0,0 +1,242 @@
+import importlib.util
+import json
+import os
+from array import array
+
+from perfeq.constants import CSV_HEADER, SUMMARY_HISTOGRAM_BINS, SUMMARY_PERCENTILES
+from perfeq.utils.enums import LANGUAGES, Languages
+
+
+LANGUAGE_NAMES = [language.value for language in Languages]
+LANGUAGE_IDS = {extension: LANGUAGE_NAMES.index(language.value) for extension, language in LANGUAGES.items()}
+# Contagens lidas de uma linha do CSV: LOC, warnings_qty, variable_warnings_qty, variables_qty,
+# function_warnings_qty, functions_qty, formatting_warnings_qty
+CSV_COUNT_COLUMNS = [1, 2, 4, 5, 7, 8, 10]
+# Métrica: (numerador, denominador), nomes das colunas de contagem
+RATIOS = {
+    "WPL": ("warnings_qty", "LOC"),
+    "VWPV": ("variable_warnings_qty", "variables_qty"),
+    "FWPF": ("function_warnings_qty", "functions_qty"),
+    "FWPL": ("formatting_warnings_qty", "LOC"),
+}
+COUNT_COLUMNS = [
+    "LOC", "warnings_qty", "variable_warnings_qty", "variables_qty",
+    "function_warnings_qty", "functions_qty", "formatting_warnings_qty",
+]
+
+
+def numpy_available():
+    """
+    Checks whether NumPy, which is optional and needed only to summarize the corpus, is installed.
+
+    Returns:
+        bool: True if NumPy can be imported.
+    """
+    return importlib.util.find_spec("numpy") is not None
+
+
+def group_statistics(values, bin_ids, groups, group_count, percentiles, bin_count):
+    """
+    Computes the mean, percentiles and histogram of the values of every group at once.
+
+    Args:
+        values (numpy.ndarray): The value of each file, sorted.
+        bin_ids (numpy.ndarray): The histogram bin of each value.
+        groups (numpy.ndarray): The group of each value, from 0 to `group_count - 1`, in the smallest unsigned type.
+        group_count (int): Number of groups.
+        percentiles (list): The percentiles computed, from 0 to 100 (linear interpolation).
+        bin_count (int): Number of histogram bins.
+
+    Returns:
+        tuple: The arrays of means (groups), percentiles (groups x percentiles) and histogram counts (groups x bins).
+    """
+    import numpy
+
+    counts = numpy.bincount(groups, minlength=group_count)
+    sizes = numpy.maximum(counts, 1)
+    means = numpy.bincount(groups, weights=values, minlength=group_count) / sizes
+
+    # Uma ordenação estável por grupo mantém os valores de cada grupo ordenados: o percentil é lido pela posição
+    if group_count == 1:
+        ordered = values
+    else:
+        ordered = values[numpy.argsort(groups, kind="stable")]
+    starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+    positions = starts[:, None] + (numpy.asarray(percentiles) / 100) * (sizes - 1)[:, None]
+    # Um grupo vazio no final começa depois do último valor: a sua posição é limitada e o percentil zerado abaixo
+    lower = numpy.minimum(numpy.floor(positions).astype(numpy.int64), max(len(ordered) - 1, 0))
+    upper = numpy.minimum(lower + 1, numpy.minimum(starts[:, None] + sizes[:, None] - 1, max(len(ordered) - 1, 0)))
+    if len(ordered):
+        quantiles = ordered[lower] + (ordered[upper] - ordered[lower]) * (positions - lower)
+        quantiles[counts == 0] = 0
+    else:
+        quantiles = numpy.zeros(positions.shape)
+
+    histograms = numpy.bincount(groups.astype(numpy.int64) * bin_count + bin_ids, minlength=group_count * bin_count)
+    return means, quantiles, histograms.reshape(group_count, bin_count)
+
+
+class MetricsAggregator:
+    def __init__(self):
+        """
+        Initializes the aggregator that keeps the counts of every analyzed file in typed arrays,
+        to compute the metrics and the statistics of the whole corpus with NumPy.
+        """
+        self.paths = []
+        self.languages = array("B")
+        # Diretórios distintos, identificados pela ordem em que aparecem
+        self.directories = {}
+        self.directory_ids = array("I")
+        self.counts = {column: array("q") for column in COUNT_COLUMNS}
+
+    def add(self, code):
+        """
+        Adds the counts of an analyzed code.
+
+        Args:
+            code (Code): The analyzed code.
+        """
+        self.add_counts(code.id, (
+            code.lines_of_code,
+            len(code.warnings),
+            code.variables_warnings_qty,
+            code.variables_qty,
+            code.functions_warnings_qty,
+            code.functions_qty,
+            code.formatting_warnings_qty,
+        ))
+
+    def add_row(self, row):
+        """
+        Adds the counts of a row of a results CSV file (e.g. a row kept from a previous run).
+
+        Args:
+            row (str): The CSV row, without the line break.
+        """
+        # O id é o caminho do arquivo, que pode conter vírgulas
+        values = row.rsplit(",", CSV_HEADER.count(","))
+        self.add_counts(values[0], [int(values[column]) for column in CSV_COUNT_COLUMNS])
+
+    def add_counts(self, path, counts):
+        """
+        Adds the counts of a file.
+
+        Args:
+            path (str): The path of the file.
+            counts (list): The values of the COUNT_COLUMNS of the file.
+        """
+        directory = os.path.dirname(path)
+        self.paths.append(path)
+        self.languages.append(LANGUAGE_IDS.get(os.path.splitext(path)[1], 0))
+        self.directory_ids.append(self.directories.setdefault(directory, len(self.directories)))
+        for column, value in zip(COUNT_COLUMNS, counts):
+            self.counts[column].append(value)
+
+    def summary(self, percentiles=SUMMARY_PERCENTILES, bins=SUMMARY_HISTOGRAM_BINS):
+        """
+        Computes the WPL, VWPV, FWPF and FWPL ratios of every file (as percentages) and their
+        distribution in the whole corpus, by language and by directory.
+
+        Args:
+            percentiles (list): The percentiles of each metric.
+            bins (list): Lower edges, in percent, of the histogram bins of each metric.
+
+        Returns:
+            dict: The number of files, the total counts and the statistics of each metric, for the
+            corpus ('corpus'), each language ('languages') and each directory ('directories').
+
+        Raises:
+            RuntimeError: If NumPy is not installed.
+        """
+        if not numpy_available():
+            raise RuntimeError("NumPy is required to summarize the corpus")
+        # O numpy é importado apenas aqui: execuções sem resumo não pagam pela importação
+        import numpy
+
+        counts = {column: numpy.frombuffer(values, dtype=numpy.int64) for column, values in self.counts.items()}
+        # Ids dos grupos no menor tipo possível: com até 65536 grupos a ordenação estável do numpy é um radix sort
+        directory_type = numpy.min_scalar_type(max(len(self.directories) - 1, 0))
+        groupings = {
+            "corpus": (["corpus"], numpy.zeros(len(self.paths), dtype=numpy.uint8)),
+            "languages": (LANGUAGE_NAMES, numpy.frombuffer(self.languages, dtype=numpy.uint8)),
+            "directories": (list(self.directories), numpy.frombuffer(self.directory_ids, dtype=numpy.uint32).astype(directory_type)),
+        }
+        edges = numpy.asarray(bins, dtype=float)
+
+        # Razões de cada arquivo, ordenadas uma única vez por métrica para todos os agrupamentos
+        statistics = {grouping: {} for grouping in groupings}
+        for metric, (numerator, denominator) in RATIOS.items():
+            ratios = numpy.divide(
+                counts[numerator] * 100.0,
+                counts[denominator],
+                out=numpy.zeros(len(self.paths)),
+                where=counts[denominator] != 0,
+            )
+            order = numpy.argsort(ratios)
+            ratios = ratios[order]
+            bin_ids = numpy.clip(numpy.searchsorted(edges, ratios, side="right") - 1, 0, len(bins) - 1)
+            for grouping, (names, groups) in groupings.items():
+                statistics[grouping][metric] = group_statistics(
+                    ratios, bin_ids, groups[order], len(names), percentiles, len(bins)
+                )
+
+        summary = {"files": len(self.paths), "percentiles": list(percentiles), "histogram_bins": list(bins)}
+        for grouping, (names, groups) in groupings.items():
+            files = numpy.bincount(groups, minlength=len(names))
+            totals = {
+                column: numpy.bincount(groups, weights=values, minlength=len(names)) for column, values in counts.items()
+            }
+            metrics = {}
+            for metric, (means, quantiles, histograms) in statistics[grouping].items():
+                numerator, denominator = RATIOS[metric]
+                # Razão do grupo: soma dos numeradores sobre a soma dos denominadores
+                overall = numpy.divide(
+                    totals[numerator] * 100,
+                    totals[denominator],
+                    out=numpy.zeros(len(names)),
+                    where=totals[denominator] != 0,
+                )
+                metrics[metric] = list(zip(means.tolist(), overall.tolist(), quantiles.tolist(), histograms.tolist()))
+            totals = {column: values.astype(numpy.int64).tolist() for column, values in totals.items()}
+
+            entries = {}
+            for index in numpy.flatnonzero(files).tolist():
+                entry = {"files": int(files[index]), "totals": {column: values[index] for column, values in totals.items()}}
+                for metric, rows in metrics.items():
+                    mean, overall, quantiles, histogram = rows[index]
+                    entry[metric] = {"mean": mean, "overall": overall, "percentiles": quantiles, "histogram": histogram}
+                entries[names[index]] = entry
+            summary[grouping] = entries.get("corpus", {}) if grouping == "corpus" else entries
+        return summary
+
+    @staticmethod
+    def write_summary(summary, path):
+        """
+        Writes the summary to a JSON file.
+
+        Args:
+            summary (dict): The summary returned by `summary`.
+            path (str): Path of the JSON file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(summary, file, indent=2)
+
+    @staticmethod
+    def print_summary(summary):
+        """
+        Prints the mean and the percentiles of each metric in the corpus and in each language.
+
+        Args:
+            summary (dict): The summary returned by `summary`.
+        """
+        percentiles = "".join(f"{'p' + str(percentile):>9}" for percentile in summary["percentiles"])
+        print(f"\n{'':<18}{'metric':<8}{'mean':>9}{'overall':>9}{percentiles}")
+        groups = [("Corpus", summary["corpus"])] + list(summary["languages"].items())
+        for name, entry in groups:
+            if not entry:
+                continue
+            for metric in RATIOS:
+                values = entry[metric]
+                quantiles = "".join(f"{value:>8.2f}%" for value in values["percentiles"])
+                print(f"{name:<18}{metric:<8}{values['mean']:>8.2f}%{values['overall']:>8.2f}%{quantiles}")
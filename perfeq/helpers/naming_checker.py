@@ -0,0 +1,110 @@
+import copy
+import json
+import re
+
+from perfeq.constants import NAMING_RULES
+from perfeq.models.warning_message import WarningMessage
+from perfeq.utils.enums import TypesOfWarning
+
+NAMING_STYLES = {
+    "snake_case": re.compile(r"_*[a-z][a-z0-9]*(?:_+[a-z0-9]+)*_*\Z"),
+    "camelCase": re.compile(r"_*[a-z][a-zA-Z0-9]*\Z"),
+    "PascalCase": re.compile(r"_*[A-Z][a-zA-Z0-9]*\Z"),
+    "UPPER_CASE": re.compile(r"_*[A-Z][A-Z0-9]*(?:_+[A-Z0-9]+)*_*\Z"),
+}
+
+# Prefixo das mensagens, o mesmo usado pelo naming_check
+LABELS = {
+    TypesOfWarning.VARIABLE: "Variables",
+    TypesOfWarning.FUNCTION: "Functions",
+}
+
+
+def load_naming_rules(path):
+    """
+    Loads custom naming rules from a JSON file. The file has the same structure as `NAMING_RULES`
+    and only needs the entries that change, e.g. `{"C": {"Variable": {"styles": ["camelCase"]}}}`.
+
+    Args:
+        path (str): Path of the JSON file.
+
+    Returns:
+        dict: The default rules updated with the ones of the file.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON, is not structured as `NAMING_RULES` or has an unknown
+            language, kind of identifier, setting or style.
+    """
+    with open(path, encoding="utf8") as file:
+        custom = json.load(file)
+
+    if not isinstance(custom, dict):
+        raise ValueError(f"Expected an object with an entry per language in {path}")
+
+    rules = copy.deepcopy(NAMING_RULES)
+    for language, kinds in custom.items():
+        if language not in rules:
+            raise ValueError(f"Unknown language in {path}: {language}")
+        if not isinstance(kinds, dict):
+            raise ValueError(f"Expected an object with the rules of {language} in {path}")
+        for kind, rule in kinds.items():
+            if kind not in rules[language]:
+                raise ValueError(f"Unknown kind of identifier in {path}: {kind}")
+            if not isinstance(rule, dict):
+                raise ValueError(f"Expected an object with the rule of {language} {kind} in {path}")
+            for key, value in rule.items():
+                if key == "styles" and isinstance(value, list) and value and all(isinstance(style, str) for style in value):
+                    continue
+                if key == "min_length" and isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                    continue
+                raise ValueError(f"Invalid setting of {language} {kind} in {path}: {key}={json.dumps(value)}")
+            unknown = [style for style in rule.get("styles", []) if style not in NAMING_STYLES]
+            if unknown:
+                raise ValueError(f"Unknown naming styles in {path}: {', '.join(unknown)} (available: {', '.join(NAMING_STYLES)})")
+            rules[language][kind].update(rule)
+    return rules
+
+
+class NamingChecker:
+    def __init__(self, language, rules=None):
+        """
+        Initializes the naming convention checker of a language.
+
+        Args:
+            language (Languages): The programming language of the checked files.
+            rules (dict): The naming rules, by language and kind of identifier. Defaults to `NAMING_RULES`.
+        """
+        self.rules = {}
+        for kind, rule in (rules or NAMING_RULES)[language.value].items():
+            styles = rule["styles"]
+            self.rules[TypesOfWarning(kind)] = (
+                [NAMING_STYLES[style] for style in styles],
+                " or ".join(styles),
+                rule.get("min_length", 1),
+            )
+
+    def check(self, identifiers):
+        """
+        Checks the identifiers found by the variable counters against the naming rules.
+
+        Args:
+            identifiers (list): (name, line, TypesOfWarning) tuples.
+
+        Returns:
+            list: One WarningMessage for each identifier that breaks a rule.
+        """
+        warnings = []
+        for name, line, kind in identifiers:
+            rule = self.rules.get(kind)
+            # Nomes formados apenas por sublinhados (`_`) são descartáveis por convenção
+            if rule is None or not name.strip("_"):
+                continue
+            patterns, styles, min_length = rule
+            if not any(pattern.match(name) for pattern in patterns):
+                warnings.append(WarningMessage(f"{LABELS[kind]} should be named in {styles} ({name})", line, kind))
+            elif len(name.strip("_")) < min_length:
+                warnings.append(WarningMessage(
+                    f"{LABELS[kind]} should have at least {min_length} characters ({name})", line, kind
+                ))
+        return warnings
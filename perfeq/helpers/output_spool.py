@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+
+class OutputSpool:
+    def __init__(self, directory):
+        """
+        Initializes the spool that keeps the raw output of each analyzer for each file on disk,
+        compressed, for debugging. The outputs themselves are released as soon as they are decoded.
+
+        Args:
+            directory (str): The directory of the spool files; created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, path, analyzer):
+        """
+        Returns the spool file of the output of an analyzer for a file.
+
+        Args:
+            path (str): The path of the analyzed file.
+            analyzer (str): The name of the analyzer.
+
+        Returns:
+            str: The path of the spool file, named after the file, a hash of its absolute path (files
+            with the same name in different directories do not collide) and the analyzer, such as
+            `main.c.1f3a9c0e5b7d2a64.cpplint.log.gz`.
+        """
+        digest = hashlib.blake2b(os.path.abspath(path).encode("utf8"), digest_size=8).hexdigest()
+        return os.path.join(self.directory, f"{os.path.basename(path)}.{digest}.{analyzer}.log.gz")
+
+    def write(self, path, analyzer, output):
+        """
+        Writes the raw output of an analyzer for a file, replacing the output of a previous run.
+
+        Args:
+            path (str): The path of the analyzed file.
+            analyzer (str): The name of the analyzer.
+            output: The output of the file: the text routed to it by an external command, or the
+                (line, message) tuples returned for it by an in-process analyzer.
+        """
+        import gzip
+
+        if not isinstance(output, str):
+            output = "".join(f"{line}: {message}\n" for line, message in output)
+        with gzip.open(self.get_path(path, analyzer), "wt", encoding="utf8") as file:
+            file.write(output)
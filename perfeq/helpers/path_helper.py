@@ -1,16 +1,30 @@
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+
+from perfeq.constants import DEFAULT_EXCLUDES
+from perfeq.helpers.ignore_helper import IgnoreRules
+from perfeq.helpers.shard_helper import shard_of
+from perfeq.helpers.source_reader import read_source
 
 class PathHelper:
-    def __init__(self, path):
+    def __init__(self, path, include=None, exclude=None, shard=None):
         """
         Inicializa a classe PathHelper com o caminho fornecido.
 
         Args:
             path (str): Caminho para um arquivo ou diretório.
+            include (list): Padrões glob dos arquivos a serem analisados. Se vazio, todos os arquivos são analisados.
+            exclude (list): Padrões glob dos arquivos e diretórios a serem ignorados.
+            shard (tuple): Índice (a partir de 1) e número de partes de uma execução distribuída. Se
+                informado, apenas os arquivos dessa parte são percorridos (ver `shard_of`).
         """
         self.path = path
         self.dir_path = ""
+        self.include = include or []
+        self.exclude = DEFAULT_EXCLUDES + (exclude or [])
+        self.shard = shard
 
     def is_dir(self):
         """
@@ -21,26 +35,28 @@ class PathHelper:
         """
         return os.path.isdir(self.path)
 
-    def _read_file(self, file_path, language):
+    @staticmethod
+    def _read_file(file_path, language):
         """
-        Lê o conteúdo de um arquivo.
+        Lê o conteúdo de um arquivo, decodificado com a codificação detectada no início do arquivo
+        (ver `read_source`).
 
         Args:
             file_path (str): Caminho do arquivo.
             language (str): Linguagem do arquivo (.py ou .c).
 
         Returns:
-            dict: Dicionário contendo o conteúdo do arquivo, linguagem e caminho.
+            dict: Dicionário contendo o conteúdo do arquivo, linguagem, caminho e codificação.
         """
         try:
-            with open(file_path, encoding="utf8", errors="replace") as file:
-                return {'language': language, 'file': file.read(), 'path': file_path}
+            text, encoding = read_source(file_path, language)
+            return {'language': language, 'file': text, 'path': file_path, 'encoding': encoding}
         except FileNotFoundError:
-            print(f"File '{file_path}' was not found. Skipping.")
+            print(f"File '{file_path}' was not found. Skipping.", file=sys.stderr)
         except PermissionError:
-            print(f"Permission denied to read the file '{file_path}'. Skipping.")
+            print(f"Permission denied to read the file '{file_path}'. Skipping.", file=sys.stderr)
         except Exception as e:
-            print(f"An unexpected error occurred while reading '{file_path}': {e}")
+            print(f"An unexpected error occurred while reading '{file_path}': {e}", file=sys.stderr)
         return None
 
     def _get_language(self, file_name):
@@ -59,71 +75,91 @@ class PathHelper:
             return '.c'
         return None
 
-    def _process_directory(self, parallel=False):
+    @staticmethod
+    def read_code(code):
         """
-        Processa todos os arquivos no diretório especificado.
+        Lê o conteúdo do arquivo descrito por um descritor retornado por `iter_files`.
 
         Args:
-            parallel (bool): Se True, lê arquivos em paralelo.
+            code (dict): Dicionário com as chaves 'language' e 'path'.
 
         Returns:
-            list: Lista de dicionários com informações dos arquivos lidos.
+            dict: Dicionário contendo o conteúdo do arquivo, linguagem e caminho, ou None se o arquivo não puder ser lido.
         """
-        files = []
-        try:
-            with os.scandir(self.path) as entries:
-                # Filtra arquivos com extensões suportadas
-                valid_entries = [
-                    entry for entry in entries if entry.is_file() and self._get_language(entry.name)
-                ]
-                total_files = len(valid_entries)
-                print(f"Total de arquivos a serem lidos: {total_files}")
-
-                if parallel:
-                    with ThreadPoolExecutor() as executor:
-                        # Mapeia tarefas para leitura paralela
-                        future_to_entry = {
-                            executor.submit(self._read_file, entry.path, self._get_language(entry.name)): entry
-                            for entry in valid_entries
-                        }
-                        for i, future in enumerate(as_completed(future_to_entry), start=1):
-                            result = future.result()
-                            if result:
-                                files.append(result)
-                            print(f"Arquivos restantes: {total_files - i}")
-                else:
-                    # Processa sequencialmente
-                    for i, entry in enumerate(valid_entries, start=1):
-                        language = self._get_language(entry.name)
-                        result = self._read_file(entry.path, language)
-                        if result:
-                            files.append(result)
-                        print(f"Arquivos restantes: {total_files - i}")
-        except FileNotFoundError:
-            raise FileNotFoundError(f"The directory '{self.path}' does not exist.")
-        except PermissionError:
-            raise PermissionError(f"Permission denied to access the directory '{self.path}'.")
-        except Exception as e:
-            print(f"An unexpected error occurred while processing '{self.path}': {e}")
-        return files
+        return PathHelper._read_file(code['path'], code['language'])
 
-    def _process_file(self):
+    def _matches(self, relative_path, patterns):
         """
-        Processa um único arquivo.
+        Verifica se um caminho casa com algum dos padrões glob.
+
+        Args:
+            relative_path (str): Caminho relativo ao diretório analisado.
+            patterns (list): Padrões glob.
 
         Returns:
-            list: Lista contendo o dicionário com informações do arquivo lido.
+            bool: True se o caminho ou o nome do arquivo casar com algum padrão.
+        """
+        relative_path = relative_path.replace(os.sep, "/")
+        name = os.path.basename(relative_path)
+        return any(fnmatch(relative_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+    def _walk(self, directory, rules):
+        """
+        Percorre recursivamente um diretório, em ordem alfabética.
+
+        Args:
+            directory (str): Diretório a ser percorrido.
+            rules (IgnoreRules): Regras de exclusão herdadas dos diretórios superiores.
+
+        Yields:
+            dict: Dicionário com a linguagem e o caminho de cada arquivo suportado.
         """
-        files = []
+        rules = rules.extend(directory)
         try:
-            language = self._get_language(self.path)
-            if language:
-                result = self._read_file(self.path, language)
-                if result:
-                    files.append(result)
-        except Exception as e:
-            print(f"An error occurred while accessing file '{self.path}': {e}")
-        return files
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except PermissionError:
+            print(f"Permission denied to access the directory '{directory}'. Skipping.", file=sys.stderr)
+            return
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            relative_path = os.path.relpath(entry.path, self.path)
+            if rules.is_ignored(entry.path, is_dir) or self._matches(relative_path, self.exclude):
+                continue
+            if is_dir:
+                yield from self._walk(entry.path, rules)
+                continue
+            language = self._get_language(entry.name)
+            if not language or not entry.is_file():
+                continue
+            if self.include and not self._matches(relative_path, self.include):
+                continue
+            if self.shard and shard_of(relative_path, self.shard[1]) != self.shard[0]:
+                continue
+            yield {'language': language, 'path': entry.path}
+
+    def iter_files(self):
+        """
+        Percorre o caminho especificado sem ler o conteúdo dos arquivos.
+
+        Diretórios são percorridos recursivamente, respeitando os padrões de inclusão e exclusão
+        e os arquivos .gitignore/.perfeqignore encontrados no caminho.
+
+        Yields:
+            dict: Dicionário com a linguagem e o caminho de cada arquivo suportado. O conteúdo pode ser lido com `read_code`.
+        """
+        if self.is_dir():
+            self.dir_path = self.path
+            yield from self._walk(self.path, IgnoreRules())
+            return
+
+        self.dir_path = os.path.dirname(self.path)
+        if not os.path.exists(self.path):
+            print(f"File '{self.path}' was not found. Skipping.", file=sys.stderr)
+            return
+        language = self._get_language(self.path)
+        if language:
+            yield {'language': language, 'path': self.path}
 
     def get_content(self, parallel=False):
         """
@@ -135,9 +171,10 @@ class PathHelper:
         Returns:
             list: Lista de dicionários com informações dos arquivos lidos.
         """
-        if self.is_dir():
-            self.dir_path = self.path
-            return self._process_directory(parallel=parallel)
+        codes = list(self.iter_files())
+        if parallel:
+            with ThreadPoolExecutor() as executor:
+                files = list(executor.map(self.read_code, codes))
         else:
-            self.dir_path = os.path.dirname(self.path)
-            return self._process_file()
+            files = [self.read_code(code) for code in codes]
+        return [file for file in files if file]
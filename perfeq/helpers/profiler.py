@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    # O módulo resource não existe no Windows: o pico de memória não é registrado
+    resource = None
+
+NULL_SPAN = nullcontext()
+
+
+def peak_rss_kb(children=False):
+    """
+    Returns the high-water mark of the resident set size of the current process since it started (or
+    the largest high-water mark among its finished child processes). The value never decreases, so
+    it is not the peak of a particular block of code or child process.
+
+    Args:
+        children (bool): If True, returns the largest high-water mark of the child processes instead.
+
+    Returns:
+        int: The RSS high-water mark in kilobytes, or None if it is not available on this platform.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def children_cpu_seconds():
+    """
+    Returns the CPU time used by the finished child processes of the current process.
+
+    Returns:
+        float: The user plus system CPU time in seconds, or 0 if it is not available on this platform.
+    """
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        """
+        Initializes the profiler that records the spans of each stage as Chrome trace events.
+
+        When disabled, `span` returns a shared no-op context manager, so instrumented code
+        pays only for one method call.
+
+        Args:
+            enabled (bool): Whether the spans are recorded.
+        """
+        self.enabled = enabled
+        self.events = []
+
+    def span(self, name, category, cpu=True, children=False, **args):
+        """
+        Returns a context manager that records the wall time and CPU time of a block, and the RSS
+        high-water marks of the process and of its children when it ends (see `peak_rss_kb`).
+
+        The CPU time is that of the current thread (`time.thread_time`), so the work of the other
+        threads of the process is not counted. The CPU time of the child processes is only counted
+        by process-wide counters, which also see the children of the other threads.
+
+        Args:
+            name (str): Name of the span (e.g. "cpplint", "decode").
+            category (str): Category of the span (e.g. "stage", "analyzer").
+            cpu (bool): Whether the CPU time of the thread is recorded. Spans that wait in a coroutine
+                (the thread runs other coroutines meanwhile) record only the wall time.
+            children (bool): Whether the CPU time of the child processes that finish during the block is
+                recorded, for spans that do not run alongside other spans (the stages of a run).
+            **args: Extra information stored in the event, such as 'file' or 'files'.
+
+        Returns:
+            A context manager.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return self._span(name, category, cpu, children, args)
+
+    @contextmanager
+    def _span(self, name, category, cpu, children, args):
+        start = time.perf_counter_ns()
+        thread_cpu = time.thread_time() if cpu else None
+        children_cpu = children_cpu_seconds() if children else None
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            if cpu:
+                args["cpu_ms"] = (time.thread_time() - thread_cpu) * 1000
+            if children:
+                args["children_cpu_ms"] = (children_cpu_seconds() - children_cpu) * 1000
+            # Marcas máximas do processo e do maior processo filho até aqui, não apenas do bloco
+            args["process_max_rss_kb"] = peak_rss_kb()
+            args["children_max_rss_kb"] = peak_rss_kb(children=True)
+            self.events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    def add_events(self, events):
+        """
+        Adds the events recorded by another profiler (e.g. in a worker process).
+
+        Args:
+            events (list): The Chrome trace events.
+        """
+        self.events.extend(events)
+
+    def stage_summary(self):
+        """
+        Aggregates the events by category and name.
+
+        Returns:
+            list: Tuples (category, name, count, wall seconds, CPU seconds, RSS high-water mark in kB),
+            slowest first. The CPU seconds are None for the spans that record only the wall time. The
+            high-water mark is the largest one, of the process or of a child, seen when a span ended, so
+            it is the same for every span that ends after the heaviest one.
+        """
+        summary = defaultdict(lambda: [0, 0.0, None, 0])
+        for event in self.events:
+            entry = summary[(event["cat"], event["name"])]
+            entry[0] += 1
+            entry[1] += event["dur"] / 1e6
+            if "cpu_ms" in event["args"] or "children_cpu_ms" in event["args"]:
+                cpu_ms = event["args"].get("cpu_ms", 0) + event["args"].get("children_cpu_ms", 0)
+                entry[2] = (entry[2] or 0.0) + cpu_ms / 1000
+            entry[3] = max(entry[3], event["args"]["process_max_rss_kb"] or 0, event["args"]["children_max_rss_kb"] or 0)
+        rows = [(category, name, *values) for (category, name), values in summary.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def slowest_files(self, top=10):
+        """
+        Returns the files that took the longest to analyze. The time of a span that covers many
+        files (an analyzer run over a chunk) is split evenly between them.
+
+        Args:
+            top (int): Number of files returned.
+
+        Returns:
+            list: Tuples (path, seconds, seconds by span name), slowest first.
+        """
+        files = defaultdict(lambda: defaultdict(float))
+        for event in self.events:
+            paths = event["args"].get("files") or ([event["args"]["file"]] if "file" in event["args"] else [])
+            for path in paths:
+                files[path][event["name"]] += event["dur"] / 1e6 / len(paths)
+        rows = [(path, sum(spans.values()), dict(spans)) for path, spans in files.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+    def print_report(self, top=10):
+        """
+        Prints the time spent in each stage and the slowest files.
+
+        Args:
+            top (int): Number of files in the slowest files table.
+        """
+        print("\nProfile:\n")
+        print(f"{'stage':<28}{'count':>8}{'wall (s)':>12}{'cpu (s)':>12}{'RSS high-water (MB)':>21}")
+        for category, name, count, wall, cpu, rss in self.stage_summary():
+            cpu = "-" if cpu is None else f"{cpu:.3f}"
+            print(f"{category + '/' + name:<28}{count:>8}{wall:>12.3f}{cpu:>12}{rss / 1024:>21.1f}")
+        print(f"\nTop {top} slowest files:\n")
+        for path, seconds, spans in self.slowest_files(top):
+            details = ", ".join(f"{name} {value:.3f}s" for name, value in sorted(spans.items(), key=lambda item: -item[1]))
+            print(f"{seconds:>10.3f}s  {path}  ({details})")
+
+    def write_trace(self, path):
+        """
+        Writes the events in the Chrome trace format, which can be opened in chrome://tracing,
+        Perfetto or speedscope.
+
+        Args:
+            path (str): Path of the JSON trace file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf8") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,91 @@
+import importlib.metadata
+import json
+import os
+import sys
+
+from astroid import MANAGER
+# Função privada do pylint, a mesma que o `pylint.lint.Run` usa: a versão do pylint é limitada no setup.py
+# às versões testadas
+try:
+    from pylint.config.config_initialization import _config_initialization
+except ImportError as error:
+    raise ImportError(
+        f"PerfeQ supports pylint>=3.0,<4 (installed: {importlib.metadata.version('pylint')}); "
+        "install a supported version with: pip install 'pylint>=3.0,<4'"
+    ) from error
+from pylint.lint import PyLinter
+from pylint.reporters import CollectingReporter
+
+
+class PylintRunner:
+    def __init__(self):
+        """
+        Creates a PyLinter that is shared by every batch linted in this process.
+
+        The linter is configured the same way the `pylint` command line does it
+        (default checkers, pylintrc lookup, informational messages disabled), but
+        it reports to a CollectingReporter so the messages come back as structured
+        objects instead of text.
+        """
+        self.reporter = CollectingReporter()
+        self.linter = PyLinter()
+        self.linter.load_default_plugins()
+        self.linter.disable("I")
+        _config_initialization(self.linter, [], self.reporter)
+        # O duplicate-code compara os arquivos de um mesmo lote entre si: o resultado de um arquivo
+        # dependeria de quais arquivos foram analisados junto com ele (lote, parte ou cache)
+        self.linter.disable("duplicate-code")
+        self.linter.set_reporter(self.reporter)
+
+    def run(self, paths):
+        """
+        Lints a batch of Python files with the shared linter.
+
+        Args:
+            paths (list): Paths of the files to be linted.
+
+        Returns:
+            dict: A dictionary mapping each path to the list of pylint `Message` objects emitted for it.
+        """
+        messages = {path: [] for path in paths}
+        keys = {os.path.abspath(path): path for path in paths}
+
+        self.reporter.reset()
+        self.linter.check(list(paths))
+        for message in self.reporter.messages:
+            key = keys.get(os.path.abspath(message.abspath))
+            if key is not None:
+                messages[key].append(message)
+        self.reporter.reset()
+
+        # Os módulos de um lote não são reutilizados pelo próximo
+        MANAGER.clear_cache()
+        return messages
+
+
+def serve_batches(input_stream, output_stream):
+    """
+    Lints the batches of files sent by the CommandScheduler to a persistent pylint process, with a
+    single PylintRunner, until the input is closed. Each batch is a line with the JSON list of its
+    paths; the answer is a line with a JSON object mapping each path to its [line, message] warnings.
+
+    Args:
+        input_stream: The text stream the batches are read from.
+        output_stream: The text stream the answers are written to.
+    """
+    runner = PylintRunner()
+    for line in input_stream:
+        messages = runner.run(json.loads(line))
+        output = {
+            path: [[message.line, f"{message.msg} ({message.symbol})"] for message in path_messages]
+            for path, path_messages in messages.items()
+        }
+        output_stream.write(json.dumps(output) + "\n")
+        output_stream.flush()
+
+
+if __name__ == "__main__":
+    # A saída padrão leva apenas as respostas: o que o pylint ou os plugins imprimirem vai para o stderr
+    answers = sys.stdout
+    sys.stdout = sys.stderr
+    serve_batches(sys.stdin, answers)
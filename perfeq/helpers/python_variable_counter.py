@@ -1,46 +1,97 @@
 import ast
 import re
 
-def python_variable_counter(code):
+from perfeq.models.source_file import SourceFile
+from perfeq.utils.enums import Languages, TypesOfWarning
+
+ASSIGNMENTS = (ast.AnnAssign, ast.AugAssign)
+FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+# Usado apenas quando o código tem erro de sintaxe: funções e atribuições em uma única passada
+FALLBACK_PATTERN = re.compile(
+    r"(?P<function>\bdef\s+(?P<function_name>[a-zA-Z_]\w*)\s*\([^)]*\)\s*:)|(?P<variable>\b(?P<variable_name>\w+)\s*=(?!=))"
+)
+
+
+def collect_names(target, identifiers):
+    """
+    Appends the variable names bound by an assignment target, including the ones unpacked
+    from tuples and lists. Attributes and subscripts do not declare variables and are skipped.
+
+    Args:
+        target (ast.AST): The target of the assignment.
+        identifiers (list): The list that receives the (name, line, TypesOfWarning) tuples.
+    """
+    if isinstance(target, ast.Name):
+        identifiers.append((target.id, target.lineno, TypesOfWarning.VARIABLE))
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            collect_names(element, identifiers)
+    elif isinstance(target, ast.Starred):
+        collect_names(target.value, identifiers)
+
+
+def python_variable_counter(code, identifiers=None):
     """
     Counts the number of variable assignments and function definitions in a given Python code string.
+
+    Assignments are `Assign` (one per target), `AnnAssign` and `AugAssign` nodes; functions are
+    `FunctionDef` and `AsyncFunctionDef` nodes, all counted in the same walk of the tree.
     Args:
-        code (str): A string containing Python code.
+        code (SourceFile): The parsed file. A string containing Python code is also accepted.
+        identifiers (list): If given, a (name, line, TypesOfWarning) tuple is appended to it for every
+            assigned variable and defined function, to be checked by the NamingChecker.
     Returns:
         tuple: A tuple containing two integers:
             - The first integer is the count of variable assignments.
             - The second integer is the count of function definitions.
     """
-    try:
-        tree = ast.parse(code)
-        variable_count = 0
-        function_count = 0
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                variable_count += len(node.targets)
-            elif isinstance(node, ast.FunctionDef):
-                function_count += 1
-
-        return variable_count, function_count
-    except:
-        try:
-            variable_count = count_variables_regex(code)
-            function_count = count_function_regex(code)
-            return variable_count, function_count
-        except:
-            return -1, -1
-
-def count_function_regex(code):
-    function_pattern = r'def\s+([a-zA-Z_]\w*)\s*\([^)]*\)\s*:'
-    matches = re.findall(function_pattern, code)
-
-    return len(matches)
+    source = code if isinstance(code, SourceFile) else SourceFile(None, Languages.PYTHON, code)
+    if source.tree is None:
+        return count_regex(source.text, identifiers)
 
+    variable_count = 0
+    function_count = 0
+    for node in ast.walk(source.tree):
+        if isinstance(node, ast.Assign):
+            variable_count += len(node.targets)
+            if identifiers is not None:
+                for target in node.targets:
+                    collect_names(target, identifiers)
+        elif isinstance(node, ASSIGNMENTS):
+            variable_count += 1
+            # Uma atribuição aumentada (`x += 1`) não declara um novo nome
+            if identifiers is not None and isinstance(node, ast.AnnAssign):
+                collect_names(node.target, identifiers)
+        elif isinstance(node, FUNCTIONS):
+            function_count += 1
+            if identifiers is not None:
+                identifiers.append((node.name, node.lineno, TypesOfWarning.FUNCTION))
+    return variable_count, function_count
 
-def count_variables_regex(code):
-    variable_pattern = r'\b(\w+)\s*=\s*(?!=)'
 
-    matches = re.findall(variable_pattern, code)
+def count_regex(code, identifiers=None):
+    """
+    Counts the variable assignments and function definitions of a code that cannot be parsed.
 
-    return len(matches)
\ No newline at end of file
+    Args:
+        code (str): A string containing Python code.
+        identifiers (list): If given, receives a (name, line, TypesOfWarning) tuple for every match.
+    Returns:
+        tuple: The count of variable assignments and the count of function definitions.
+    """
+    variable_count = 0
+    function_count = 0
+    line = 1
+    position = 0
+    for match in FALLBACK_PATTERN.finditer(code):
+        if match.group("function"):
+            function_count += 1
+            kind, name = TypesOfWarning.FUNCTION, match.group("function_name")
+        else:
+            variable_count += 1
+            kind, name = TypesOfWarning.VARIABLE, match.group("variable_name")
+        if identifiers is not None:
+            line += code.count("\n", position, match.start())
+            position = match.start()
+            identifiers.append((name, line, kind))
+    return variable_count, function_count
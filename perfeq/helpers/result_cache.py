@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+from perfeq.constants import ANALYZER_PACKAGES, CACHE_FORMAT_VERSION, CACHE_LOCK_TIMEOUT, CACHE_MAX_SIZE, CACHE_READ_SIZE
+
+# Campos do resultado de um arquivo guardados no cache
+CACHED_RESULT_KEYS = ("warnings", "quantity_info", "lines_of_code", "variables_qty", "functions_qty")
+
+
+def default_cache_dir():
+    """
+    Returns the directory where the result cache is stored by default.
+
+    Returns:
+        str: `$XDG_CACHE_HOME/perfeq`, or `~/.cache/perfeq` when the variable is not set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "perfeq")
+
+
+def analyzer_versions():
+    """
+    Returns the version of the cache format and the installed version of PerfeQ and of every analyzer it runs.
+
+    Returns:
+        str: The versions joined in a single string, used as part of the cache keys.
+    """
+    # O importlib.metadata só é carregado quando o cache é usado
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = [f"cache={CACHE_FORMAT_VERSION}"]
+    for package in ANALYZER_PACKAGES:
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=unknown")
+    return ";".join(versions)
+
+
+def cache_settings(naming_rules=None, analyzers=None):
+    """
+    Returns the analysis settings that are part of the cache keys.
+
+    Args:
+        naming_rules (dict): Custom naming rules, which change the warnings.
+        analyzers (dict): The enabled analyzers of each language, as returned by `select_analyzers`;
+            their names and the versions of their packages change the warnings.
+
+    Returns:
+        str: The settings serialized in a stable order, or an empty string for the default settings.
+    """
+    settings = {}
+    if naming_rules:
+        settings['naming_rules'] = naming_rules
+    if analyzers is not None:
+        settings['analyzers'] = sorted(
+            f"{analyzer.name}={analyzer.get_version()}" for group in analyzers.values() for analyzer in group
+        )
+    return json.dumps(settings, sort_keys=True) if settings else ""
+
+
+class ResultCache:
+    def __init__(self, directory=None, max_size=CACHE_MAX_SIZE, settings="", timeout=CACHE_LOCK_TIMEOUT):
+        """
+        Opens (or creates) the persistent result cache.
+
+        The cache maps the hash of a file content, its name, its language and the analyzer versions
+        to the decoded result of that file. Entries are evicted in least-recently-used order when the
+        stored results exceed `max_size` bytes. The database is shared by concurrent runs (e.g. the
+        shards of a run on the same machine): it uses write-ahead logging, so readers do not block the
+        writer, and a lookup or a write that still finds it locked after `timeout` seconds
+        is treated as a cache miss instead of failing the run.
+
+        Args:
+            directory (str): Directory of the cache database. Defaults to `default_cache_dir()`.
+            max_size (int): Maximum size, in bytes, of the stored results.
+            settings (str): The analysis settings that change the results (e.g. custom naming rules),
+                also used as part of the cache keys.
+            timeout (float): Seconds to wait for the database when another run holds its lock.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        self.versions = analyzer_versions() + settings
+        os.makedirs(self.directory, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(self.directory, "results.sqlite3"), timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self.connection.commit()
+
+    def make_key(self, code):
+        """
+        Builds the cache key of a file.
+
+        Args:
+            code (dict): Dictionary with 'path' and 'language' keys.
+
+        Returns:
+            str: The cache key, or None if the file cannot be read.
+        """
+        digest = hashlib.sha256()
+        try:
+            with open(code['path'], "rb") as file:
+                for block in iter(lambda: file.read(CACHE_READ_SIZE), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        # O nome do arquivo também aparece nos avisos (ex.: nome do módulo no pylint)
+        digest.update(os.path.basename(code['path']).encode("utf8"))
+        digest.update(code['language'].encode("utf8"))
+        digest.update(self.versions.encode("utf8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Looks up a result in the cache, marking it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            object: The cached result, or None if the key is not in the cache or the cache cannot be read.
+        """
+        if key is None:
+            return None
+        try:
+            row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        try:
+            self.connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError:
+            # O resultado continua válido; apenas o horário de acesso usado na remoção não é atualizado
+            self.connection.rollback()
+        return pickle.loads(row[0])
+
+    def put_many(self, items):
+        """
+        Stores many results in the cache and evicts the least recently used ones if needed. If the
+        cache stays locked, the results are not stored and will be analyzed again by the next run.
+
+        Args:
+            items (list): A list of (key, result) tuples.
+        """
+        now = time.time()
+        rows = []
+        for key, value in items:
+            if key is None:
+                continue
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, data, len(data), now))
+        try:
+            self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+            self.evict()
+            self.connection.commit()
+        except sqlite3.OperationalError:
+            self.connection.rollback()
+
+    def evict(self):
+        """
+        Removes the least recently used results until the cache fits in `max_size` bytes.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_size:
+            return
+        removed = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if total <= self.max_size:
+                break
+            removed.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM results WHERE key = ?", removed)
+
+    def commit(self):
+        """
+        Saves the pending changes (such as the access times updated by `get`), releasing the
+        database lock for other processes that share the cache. The changes are dropped if the cache
+        stays locked.
+        """
+        try:
+            self.connection.commit()
+        except sqlite3.OperationalError:
+            self.connection.rollback()
+
+    def close(self):
+        """
+        Saves the pending changes and closes the cache.
+        """
+        self.commit()
+        self.connection.close()
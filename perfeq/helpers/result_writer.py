@@ -0,0 +1,274 @@
+import json
+import os
+
+from perfeq.constants import CSV_FLUSH_INTERVAL, CSV_HEADER, PARQUET_ROW_GROUP_SIZE
+from perfeq.models.code import METRICS_COLUMNS
+
+WARNING_COLUMNS = ["code_id", "line", "type", "message_id"]
+MESSAGE_COLUMNS = ["message_id", "message"]
+
+
+def read_result_ids(path):
+    """
+    Reads the ids of the codes already written to a results CSV file.
+
+    A last line left incomplete by an interrupted run is removed from the file, so the
+    code it refers to is analyzed again.
+
+    Args:
+        path (str): Path of the CSV file.
+
+    Returns:
+        set: The code ids found in the file.
+    """
+    ids = set()
+    with open(path, "rb+") as file:
+        content = file.read()
+        end = content.rfind(b"\n") + 1
+        if end < len(content):
+            file.truncate(end)
+    for line in content[:end].decode("utf8", errors="replace").splitlines()[1:]:
+        # O id é o caminho do arquivo, que pode conter vírgulas
+        ids.add(line.rsplit(",", CSV_HEADER.count(","))[0])
+    return ids
+
+
+def read_result_rows(path):
+    """
+    Reads the rows of a results CSV file.
+
+    Args:
+        path (str): Path of the CSV file.
+
+    Returns:
+        dict: The rows (without the line break) by code id, in the order of the file.
+    """
+    rows = {}
+    with open(path, encoding="utf8", errors="replace") as file:
+        next(file, None)
+        for line in file:
+            if line.endswith("\n"):
+                line = line[:-1]
+                rows[line.rsplit(",", CSV_HEADER.count(","))[0]] = line
+    return rows
+
+
+class CsvResultWriter:
+    def __init__(self, path, resume=False, flush_interval=CSV_FLUSH_INTERVAL, kept_rows=None):
+        """
+        Opens the CSV file where the result of each code is written as soon as it is available.
+
+        Args:
+            path (str): Path of the CSV file.
+            resume (bool): If True and the file exists, keeps its rows and appends the new ones.
+                Otherwise the file is overwritten.
+            flush_interval (int): Number of rows written between two flushes to disk.
+            kept_rows (list): Rows of a previous run to be merged with the new ones. When given, the
+                rows are written to a temporary file that replaces the CSV file only when it is closed.
+        """
+        self.path = path
+        self.paths = [path]
+        self.flush_interval = flush_interval
+        self.pending_rows = 0
+        self.done_ids = set()
+        self.temporary_path = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if kept_rows is not None:
+            self.temporary_path = path + ".tmp"
+            self.file = open(self.temporary_path, "w", encoding="utf8")
+        elif resume and os.path.exists(path):
+            self.done_ids = read_result_ids(path)
+            self.file = open(path, "a", encoding="utf8")
+        else:
+            self.file = open(path, "w", encoding="utf8")
+        if self.file.tell() == 0:
+            self.file.write(CSV_HEADER + "\n")
+        for row in kept_rows or []:
+            self.file.write(row + "\n")
+
+    def write(self, code):
+        """
+        Appends the row of a code to the file.
+
+        Args:
+            code (Code): The analyzed code.
+        """
+        self.file.write(code.print_multiple_result())
+        self.file.write("\n")
+        self.pending_rows += 1
+        if self.pending_rows >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the rows written so far to disk.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending_rows = 0
+
+    def close(self):
+        """
+        Flushes the remaining rows and closes the file.
+        """
+        self.flush()
+        self.file.close()
+        if self.temporary_path:
+            os.replace(self.temporary_path, self.path)
+
+
+class JsonLinesResultWriter:
+    def __init__(self, path, warnings_path, messages_path, warning_store, flush_interval=CSV_FLUSH_INTERVAL):
+        """
+        Opens the JSON Lines files where the metrics of each code and its warnings are written as soon
+        as they are available. The warnings refer to their messages by id; the table of messages is
+        written when the writer is closed.
+
+        Args:
+            path (str): Path of the file with one object of metrics per code, with the CSV columns.
+            warnings_path (str): Path of the file with one object per warning (code_id, line, type, message_id).
+            messages_path (str): Path of the file with one object per distinct message (message_id, message).
+            warning_store (WarningStore): The store of the run, which holds the messages.
+            flush_interval (int): Number of codes written between two flushes to disk.
+        """
+        self.path = path
+        self.paths = [path, warnings_path, messages_path]
+        self.messages_path = messages_path
+        self.warning_store = warning_store
+        self.flush_interval = flush_interval
+        self.pending_rows = 0
+        self.done_ids = set()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w", encoding="utf8")
+        self.warnings_file = open(warnings_path, "w", encoding="utf8")
+
+    def write(self, code):
+        """
+        Appends the metrics and the warnings of a code to the files.
+
+        Args:
+            code (Code): The analyzed code, with its warnings in the warning store.
+        """
+        self.file.write(json.dumps(dict(zip(METRICS_COLUMNS, code.get_metrics()))) + "\n")
+        for line, type_of_warning, message_id in code.warnings.rows():
+            self.warnings_file.write(json.dumps(dict(zip(WARNING_COLUMNS, (code.id, line, type_of_warning.value, message_id)))) + "\n")
+        self.pending_rows += 1
+        if self.pending_rows >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the rows written so far to disk.
+        """
+        for file in (self.file, self.warnings_file):
+            file.flush()
+            os.fsync(file.fileno())
+        self.pending_rows = 0
+
+    def close(self):
+        """
+        Writes the table of messages, flushes the remaining rows and closes the files.
+        """
+        with open(self.messages_path, "w", encoding="utf8") as file:
+            for message_id, message in enumerate(self.warning_store.messages.messages):
+                file.write(json.dumps(dict(zip(MESSAGE_COLUMNS, (message_id, message)))) + "\n")
+        self.flush()
+        self.file.close()
+        self.warnings_file.close()
+
+
+class ParquetResultWriter:
+    def __init__(self, path, warnings_path, messages_path, warning_store, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        """
+        Opens the Parquet files where the metrics of each code and its warnings are written, one row
+        group at a time. The warnings refer to their messages by id; the table of messages is written
+        when the writer is closed. Requires pyarrow.
+
+        Args:
+            path (str): Path of the table with one row of metrics per code, with the CSV columns.
+            warnings_path (str): Path of the table with one row per warning (code_id, line, type, message_id).
+            messages_path (str): Path of the table with one row per distinct message (message_id, message).
+            warning_store (WarningStore): The store of the run, which holds the messages.
+            row_group_size (int): Number of rows buffered before a row group is written.
+        """
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = path
+        self.paths = [path, warnings_path, messages_path]
+        self.messages_path = messages_path
+        self.warning_store = warning_store
+        self.row_group_size = row_group_size
+        self.done_ids = set()
+
+        metrics_types = [
+            pyarrow.string() if column == "code_id"
+            else pyarrow.int64() if column == "LOC" or column.endswith("_qty")
+            else pyarrow.float64()
+            for column in METRICS_COLUMNS
+        ]
+        self.metrics_schema = pyarrow.schema(list(zip(METRICS_COLUMNS, metrics_types)))
+        self.warnings_schema = pyarrow.schema(list(zip(
+            WARNING_COLUMNS, [pyarrow.string(), pyarrow.uint32(), pyarrow.string(), pyarrow.uint32()]
+        )))
+        self.messages_schema = pyarrow.schema(list(zip(MESSAGE_COLUMNS, [pyarrow.uint32(), pyarrow.string()])))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.writer = self.parquet.ParquetWriter(path, self.metrics_schema)
+        self.warnings_writer = self.parquet.ParquetWriter(warnings_path, self.warnings_schema)
+        # Colunas dos grupos de linhas ainda não gravados
+        self.metrics = [[] for _ in METRICS_COLUMNS]
+        self.warnings = [[] for _ in WARNING_COLUMNS]
+
+    def write(self, code):
+        """
+        Buffers the metrics and the warnings of a code, writing a row group when the buffer is full.
+
+        Args:
+            code (Code): The analyzed code, with its warnings in the warning store.
+        """
+        for column, value in zip(self.metrics, code.get_metrics()):
+            column.append(value)
+        code_ids, lines, types, message_ids = self.warnings
+        for line, type_of_warning, message_id in code.warnings.rows():
+            code_ids.append(code.id)
+            lines.append(line)
+            types.append(type_of_warning.value)
+            message_ids.append(message_id)
+        if len(self.metrics[0]) >= self.row_group_size:
+            self.write_row_group(self.writer, self.metrics, self.metrics_schema)
+        if len(code_ids) >= self.row_group_size:
+            self.write_row_group(self.warnings_writer, self.warnings, self.warnings_schema)
+
+    def write_row_group(self, writer, columns, schema):
+        """
+        Writes the buffered columns as a row group and empties the buffer.
+        """
+        if columns[0]:
+            writer.write_table(self.pyarrow.Table.from_pydict(dict(zip(schema.names, columns)), schema=schema))
+        for column in columns:
+            column.clear()
+
+    def flush(self):
+        """
+        Writes the buffered rows.
+        """
+        self.write_row_group(self.writer, self.metrics, self.metrics_schema)
+        self.write_row_group(self.warnings_writer, self.warnings, self.warnings_schema)
+
+    def close(self):
+        """
+        Writes the buffered rows and the table of messages and closes the files.
+        """
+        self.flush()
+        self.writer.close()
+        self.warnings_writer.close()
+        messages = self.warning_store.messages.messages
+        self.parquet.write_table(
+            self.pyarrow.Table.from_pydict(
+                dict(zip(MESSAGE_COLUMNS, (list(range(len(messages))), messages))), schema=self.messages_schema
+            ),
+            self.messages_path,
+        )
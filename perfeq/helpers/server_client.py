@@ -0,0 +1,68 @@
+import json
+import os
+from urllib import error, request
+
+from perfeq.constants import SERVER_REQUEST_TIMEOUT
+from perfeq.models.code import Code
+from perfeq.models.warning_message import WarningMessage
+from perfeq.utils.enums import TypesOfWarning
+
+
+def request_analysis(address, path, timeout=SERVER_REQUEST_TIMEOUT):
+    """
+    Asks a running `perfeq serve` to analyze a file.
+
+    Args:
+        address (str): The address of the server, as host:port.
+        path (str): The path of the file.
+        timeout (float): Seconds to wait for the result.
+
+    Returns:
+        dict: The result returned by the server.
+
+    Raises:
+        ConnectionError: If the server cannot be reached.
+        ValueError: If the server refused the request (e.g. the file does not exist).
+    """
+    data = json.dumps({'path': os.path.abspath(path)}).encode("utf8")
+    analysis_request = request.Request(
+        f"http://{address}/analyze", data=data, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with request.urlopen(analysis_request, timeout=timeout) as response:
+            return json.load(response)
+    except error.HTTPError as http_error:
+        try:
+            message = json.load(http_error).get('error', http_error.reason)
+        except ValueError:
+            message = http_error.reason
+        raise ValueError(message) from http_error
+    except (error.URLError, OSError) as connection_error:
+        raise ConnectionError(str(getattr(connection_error, "reason", connection_error))) from connection_error
+
+
+def code_from_result(result):
+    """
+    Rebuilds the analyzed code from a result returned by the server.
+
+    Args:
+        result (dict): The result returned by `request_analysis`.
+
+    Returns:
+        Code: The analyzed code, with its warnings and metrics.
+    """
+    metrics = result['metrics']
+    warnings = [
+        WarningMessage(warning['message'], warning['line'], TypesOfWarning(warning['type']))
+        for warning in result['warnings']
+    ]
+    return Code(
+        result['path'],
+        warnings,
+        metrics['LOC'],
+        metrics['variables_qty'],
+        metrics['functions_qty'],
+        metrics['variable_warnings_qty'],
+        metrics['function_warnings_qty'],
+        metrics['formatting_warnings_qty'],
+    )
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+
+PARTIAL_NAME = re.compile(r"^perfeq_output\.shard-(\d+)-of-(\d+)\.csv$")
+
+
+def parse_shard(value):
+    """
+    Parses the shard of a sharded run.
+
+    Args:
+        value (str): The shard as i/N, where i goes from 1 to N (e.g. "2/8").
+
+    Returns:
+        tuple: The index (from 1) and the number of shards.
+
+    Raises:
+        ValueError: If the value is not in the i/N form or i is not between 1 and N.
+    """
+    index, separator, count = value.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit():
+        raise ValueError(f"invalid shard '{value}', expected i/N (e.g. 1/4)")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"invalid shard '{value}', i must be between 1 and N")
+    return index, count
+
+
+def shard_of(relative_path, count):
+    """
+    Returns the shard a file belongs to. The shard depends only on the path relative to the
+    analyzed directory, so every machine splits the same tree in the same way, whatever the
+    directory it is mounted on.
+
+    Args:
+        relative_path (str): The path of the file relative to the analyzed directory.
+        count (int): The number of shards.
+
+    Returns:
+        int: The index of the shard, from 1 to `count`.
+    """
+    digest = hashlib.blake2b(relative_path.replace(os.sep, "/").encode("utf8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def partial_name(shard):
+    """
+    Returns the name of the partial results file of a shard, without the extension.
+
+    Args:
+        shard (tuple): The index (from 1) and the number of shards.
+
+    Returns:
+        str: The name, such as `perfeq_output.shard-2-of-8`.
+    """
+    return f"perfeq_output.shard-{shard[0]}-of-{shard[1]}"
+
+
+def find_partials(directory):
+    """
+    Finds the partial results files of the shards in a directory.
+
+    Args:
+        directory (str): The directory (usually `results`).
+
+    Returns:
+        list: The paths of the partial CSV files, by name.
+    """
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, name) for name in sorted(os.listdir(directory)) if PARTIAL_NAME.match(name)
+    ]
+
+
+def order_partials(paths):
+    """
+    Checks that the partial results files are the complete set of shards of a single run.
+
+    Args:
+        paths (list): The paths of the partial CSV files.
+
+    Returns:
+        list: The paths ordered by shard.
+
+    Raises:
+        ValueError: If a file is not a partial results file, the files come from runs with different
+            numbers of shards, a shard appears twice or a shard is missing.
+    """
+    if not paths:
+        raise ValueError("no partial results files (perfeq_output.shard-i-of-N.csv) found")
+    shards = {}
+    counts = set()
+    for path in paths:
+        match = PARTIAL_NAME.match(os.path.basename(path))
+        if match is None:
+            raise ValueError(f"'{path}' is not a partial results file (perfeq_output.shard-i-of-N.csv)")
+        index, count = int(match.group(1)), int(match.group(2))
+        if index in shards:
+            raise ValueError(f"shard {index} given twice: '{shards[index]}' and '{path}'")
+        shards[index] = path
+        counts.add(count)
+    if len(counts) > 1:
+        raise ValueError(f"the partial results files come from runs with different numbers of shards ({', '.join(map(str, sorted(counts)))})")
+    count = counts.pop()
+    missing = [str(index) for index in range(1, count + 1) if index not in shards]
+    if missing:
+        raise ValueError(f"missing shards {', '.join(missing)} of {count}")
+    return [shards[index] for index in sorted(shards)]
@@ -0,0 +1,148 @@
+import codecs
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from perfeq.constants import ENCODING_PROBE_SIZE, READER_BYTE_BUDGET, READER_MMAP_THRESHOLD
+
+# A ordem importa: o BOM do UTF-32 LE começa com o BOM do UTF-16 LE
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Declaração de codificação de um arquivo Python (PEP 263), válida apenas nas duas primeiras linhas
+CODING_PATTERN = re.compile(rb"^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)")
+
+# Cada processo mantém o seu próprio leitor, compartilhado pelas threads do pool
+_source_reader = None
+_source_reader_lock = Lock()
+
+
+def detect_encoding(head, language):
+    """
+    Detects the encoding of a file from its first bytes: a byte order mark or, in Python files, the
+    coding declaration of the first two lines. The rest of the file is not scanned.
+
+    Args:
+        head (bytes): The first bytes of the file (`ENCODING_PROBE_SIZE` are enough).
+        language (str): The language of the file ('.py' or '.c').
+
+    Returns:
+        str: The name of the encoding. Defaults to UTF-8.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    if language == '.py':
+        for line in head.split(b"\n", 2)[:2]:
+            match = CODING_PATTERN.match(line)
+            if match:
+                try:
+                    return codecs.lookup(match.group(1).decode("ascii")).name
+                except LookupError:
+                    break
+    return "utf-8"
+
+
+def read_source(path, language, mmap_threshold=READER_MMAP_THRESHOLD):
+    """
+    Reads and decodes a source file. The encoding is detected once, from the first bytes. Files of
+    at least `mmap_threshold` bytes are decoded straight from a memory map, without copying their
+    bytes into the process first.
+
+    Args:
+        path (str): The path of the file.
+        language (str): The language of the file ('.py' or '.c').
+        mmap_threshold (int): Size in bytes from which the file is memory-mapped.
+
+    Returns:
+        tuple: The text of the file (undecodable bytes are replaced) and its encoding.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                encoding = detect_encoding(buffer[:ENCODING_PROBE_SIZE], language)
+                return str(buffer, encoding, "replace"), encoding
+        data = file.read()
+    encoding = detect_encoding(data[:ENCODING_PROBE_SIZE], language)
+    return str(data, encoding, "replace"), encoding
+
+
+def count_lines(text):
+    """
+    Counts the lines of a text by counting its line breaks (`\\n`, `\\r\\n` or `\\r`), without
+    splitting it in lines. A last line without a line break is also counted.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The number of lines.
+    """
+    breaks = text.count("\n") + text.count("\r") - text.count("\r\n")
+    return breaks + (1 if text and text[-1] not in "\r\n" else 0)
+
+
+class SourceReader:
+    def __init__(self, budget=READER_BYTE_BUDGET):
+        """
+        Initializes the reader that bounds the content of the files held in memory at the same time
+        by the threads of a process. Files are counted by their size on disk, not by the size of
+        their decoded text.
+
+        Args:
+            budget (int): Maximum number of bytes of the files being processed at the same time. A file
+                larger than the budget is processed alone.
+        """
+        self.budget = budget
+        self.in_flight = 0
+        self.condition = Condition()
+
+    @contextmanager
+    def reserve(self, path):
+        """
+        Reserves the size of a file in the budget while its content is processed, waiting until
+        the files being processed by the other threads leave enough room.
+
+        Args:
+            path (str): The path of the file.
+
+        Yields:
+            int: The reserved size (0 if the file cannot be accessed; reading it will report the error).
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        with self.condition:
+            self.condition.wait_for(lambda: not self.in_flight or self.in_flight + size <= self.budget)
+            self.in_flight += size
+        try:
+            yield size
+        finally:
+            with self.condition:
+                self.in_flight -= size
+                self.condition.notify_all()
+
+
+def get_source_reader():
+    """
+    Returns the SourceReader of the current process, creating it on the first call.
+
+    Returns:
+        SourceReader: The reader shared by every batch analyzed in this process.
+    """
+    global _source_reader
+    with _source_reader_lock:
+        if _source_reader is None:
+            _source_reader = SourceReader()
+    return _source_reader
@@ -1,34 +1,410 @@
+import argparse
+import importlib.util
+import json
+import os
+import shutil
 import sys
 
-import pyfiglet
+from perfeq.constants import ANALYZER_TIMEOUT, SERVER_ADDRESS
+from perfeq.helpers.analyzer_registry import load_analyzer_config, select_python_backend
+from perfeq.helpers.naming_checker import load_naming_rules
+from perfeq.helpers.shard_helper import parse_shard
+from perfeq.utils.enums import Executors, OutputFormats, PythonBackends
 
-from perfeq.analyzer.perfeq import Perfeq
 
+def shard_argument(value):
+    """
+    Converts the value of `--shard` for argparse.
 
-def analyze():
+    Args:
+        value (str): The shard as i/N.
+
+    Returns:
+        tuple: The index (from 1) and the number of shards.
+    """
+    try:
+        return parse_shard(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+
+
+def build_parser():
+    """
+    Builds the parser of the command-line arguments.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the `perfeq` command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="perfeq",
+        description="An integrated source code quality assessment tool focusing on adherence to programming language style conventions",
+    )
+    parser.add_argument("path", help="path of the file or directory to be analyzed")
+    parser.add_argument(
+        "--include", action="append", metavar="GLOB",
+        help="only analyze the files that match the pattern (can be repeated)",
+    )
+    parser.add_argument(
+        "--exclude", action="append", metavar="GLOB",
+        help="skip the files and directories that match the pattern (can be repeated)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count(),
+        help="number of files analyzed at the same time (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--executor", choices=[executor.value for executor in Executors], default=Executors.PROCESS.value,
+        help="run the analysis in a pool of processes or threads (default: process)",
+    )
+    parser.add_argument(
+        "--output-format", choices=[output_format.value for output_format in OutputFormats],
+        default=OutputFormats.CSV.value,
+        help="format of the results of multiple files: csv (metrics only), or jsonl and parquet, which also "
+        "write a table of warnings and a table of messages (parquet requires pyarrow) (default: csv)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=ANALYZER_TIMEOUT, metavar="SECONDS",
+        help="time pylint or an external analyzer may spend per file before it is killed and the file is reported "
+        f"(default: {ANALYZER_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="keep the rows of a previous, interrupted run in the results file and skip the files they refer to",
+    )
+    incremental = parser.add_mutually_exclusive_group()
+    incremental.add_argument(
+        "--changed-since", metavar="REF",
+        help="only analyze the files changed since the git revision, keeping the other rows of the results file",
+    )
+    incremental.add_argument(
+        "--mtime-manifest", action="store_true",
+        help="only analyze the files modified since the last run, keeping the other rows of the results file",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="", metavar="TRACE",
+        help="record the time and memory of each stage, print the slowest files and write a Chrome trace "
+        "(default: results/perfeq_trace.json)",
+    )
+    parser.add_argument(
+        "--naming-rules", metavar="JSON",
+        help="JSON file with the naming styles and minimum length of variables and functions of each language, "
+        "checked by the built-in naming checker on the languages whose analyzers do not check names (C by default)",
+    )
+    parser.add_argument(
+        "--analyzers", metavar="JSON",
+        help="JSON file that enables or disables analyzers (built-in or installed plugins) and sets their "
+        "concurrency, the number of processes of their own instead of a share of --jobs, "
+        'e.g. {"cpplint": {"enabled": false}}',
+    )
+    parser.add_argument(
+        "--python-backend", choices=[backend.value for backend in PythonBackends],
+        help="analyzer that checks the style of Python files: pylint, or ruff, which is much faster and "
+        "runs the ruff rules equivalent to the pylint checks (requires ruff) (default: pylint)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="analyze every file again instead of reusing the results of unchanged files",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="analyze only one of the files with the same name and the same bytes and copy its result to the "
+        "others, marked in results/perfeq_duplicates.csv",
+    )
+    parser.add_argument(
+        "--spool-dir", metavar="DIR",
+        help="also write the raw output of each analyzer for each analyzed file, gzip-compressed, to DIR "
+        "(for debugging; files found in the cache are not analyzed)",
+    )
+    parser.add_argument(
+        "--shard", type=shard_argument, metavar="i/N",
+        help="only analyze the i-th of N parts of the directory, split by a hash of the relative paths, and "
+        "write results/perfeq_output.shard-i-of-N.csv; combine the parts with `perfeq merge`",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="do not print the banner, the progress, the status messages and the summary table",
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="print the outcome of the run as a single JSON object (results of a single file, paths of the "
+        "results files and analyzer failures) instead of the human-readable output; implies --quiet",
+    )
+    parser.add_argument(
+        "--server", nargs="?", const=SERVER_ADDRESS, metavar="HOST:PORT",
+        help="send the file to a running `perfeq serve` instead of analyzing it in this process, falling back "
+        f"to a local analysis when the server cannot be reached (default: {SERVER_ADDRESS})",
+    )
+    return parser
+
+
+def build_serve_parser():
+    """
+    Builds the parser of the command-line arguments of `perfeq serve`.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the `perfeq serve` command.
     """
-    Analyzes the input file/path provided as a command-line argument.
-    This function expects a file path to be passed as the first command-line argument.
-    If no argument is provided, it raises a ValueError. It then creates an instance
-    of the Perfeq class with the provided path and calls its analyze method.
+    host, port = SERVER_ADDRESS.rsplit(":", 1)
+    parser = argparse.ArgumentParser(
+        prog="perfeq serve",
+        description="Runs a local server that keeps the analyzers and the result cache warm and analyzes one "
+        "file per request, for editors and pre-commit hooks (see `perfeq FILE --server`)",
+    )
+    parser.add_argument(
+        "--host", default=host,
+        help=f"address the server listens on, a loopback address unless --allow-remote is given (default: {host})",
+    )
+    parser.add_argument(
+        "--allow-remote", action="store_true",
+        help="allow --host to be an address reachable from other machines; the server has no authentication, "
+        "so anyone who reaches it can analyze any file readable by the user and stop it",
+    )
+    parser.add_argument("--port", type=int, default=int(port), help=f"TCP port of the server (default: {port})")
+    parser.add_argument(
+        "--naming-rules", metavar="JSON",
+        help="JSON file with the naming styles and minimum length of variables and functions of each language, "
+        "checked by the built-in naming checker on the languages whose analyzers do not check names (C by default)",
+    )
+    parser.add_argument(
+        "--analyzers", metavar="JSON",
+        help="JSON file that enables or disables analyzers (built-in or installed plugins) and sets their "
+        "concurrency, the number of processes of their own instead of a share of --jobs, "
+        'e.g. {"cpplint": {"enabled": false}}',
+    )
+    parser.add_argument(
+        "--python-backend", choices=[backend.value for backend in PythonBackends],
+        help="analyzer that checks the style of Python files: pylint, or ruff, which is much faster and "
+        "runs the ruff rules equivalent to the pylint checks (requires ruff) (default: pylint)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=ANALYZER_TIMEOUT, metavar="SECONDS",
+        help=f"time pylint or an external analyzer may spend per file before it is killed (default: {ANALYZER_TIMEOUT})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    return parser
+
+
+def build_merge_parser():
+    """
+    Builds the parser of the command-line arguments of `perfeq merge`.
+
+    Returns:
+        argparse.ArgumentParser: The parser of the `perfeq merge` command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="perfeq merge",
+        description="Combines the partial results of a run split with `--shard i/N` into results/perfeq_output.csv "
+        "and the summary of the whole corpus",
+    )
+    parser.add_argument("path", help="the analyzed directory, whose results directory receives the merged files")
+    parser.add_argument(
+        "partials", nargs="*", metavar="PARTIAL",
+        help="partial CSV files, one per shard (default: the results/perfeq_output.shard-i-of-N.csv files)",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary table")
+    parser.add_argument("--json", action="store_true", help="print the outcome as a JSON object; implies --quiet")
+    return parser
+
+
+def merge(argv):
+    """
+    Combines the partial results of a sharded run with the `perfeq merge` arguments.
+
+    Args:
+        argv (list): The arguments after `merge`.
+    """
+    parser = build_merge_parser()
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.path):
+        parser.error(f"'{args.path}' is not a directory")
+
+    from perfeq.analyzer.merge import merge_shards
+
+    try:
+        report = merge_shards(args.path, args.partials, quiet=args.quiet or args.json)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.json:
+        print(json.dumps(report))
+
+
+def serve(argv):
+    """
+    Starts the analysis server with the `perfeq serve` arguments.
+
+    Args:
+        argv (list): The arguments after `serve`.
+    """
+    parser = build_serve_parser()
+    args = parser.parse_args(argv)
+    naming_rules = None
+    analyzer_config = None
+    try:
+        if args.naming_rules:
+            naming_rules = load_naming_rules(args.naming_rules)
+        if args.analyzers:
+            analyzer_config = load_analyzer_config(args.analyzers)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.python_backend:
+        backend = PythonBackends(args.python_backend)
+        if backend == PythonBackends.RUFF and shutil.which("ruff") is None:
+            parser.error("--python-backend ruff requires ruff (pip install ruff)")
+        analyzer_config = select_python_backend(backend, analyzer_config)
+
+    from perfeq.analyzer.server import serve as run_server
+
+    try:
+        run_server(
+            args.host, args.port, naming_rules, not args.no_cache, args.timeout, analyzer_config, args.allow_remote
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    except OSError as error:
+        parser.error(f"cannot listen on {args.host}:{args.port}: {error}")
+
+
+def analyze_remotely(address, path, as_json=False):
+    """
+    Analyzes a file in a running `perfeq serve` and prints the result like a local analysis would.
+
+    Args:
+        address (str): The address of the server, as host:port.
+        path (str): The path of the file.
+        as_json (bool): Whether the result is printed as the JSON report of `--json`.
+
+    Returns:
+        bool: False if the server could not be reached, so the file must be analyzed locally.
+
     Raises:
-        ValueError: If no input file/path is provided as a command-line argument.
+        ValueError: If the server refused the request.
+    """
+    from perfeq.helpers.server_client import code_from_result, request_analysis
+
+    try:
+        result = request_analysis(address, path)
+    except ConnectionError as error:
+        print(f"Servidor PerfeQ indisponível em {address} ({error}); analisando localmente", file=sys.stderr)
+        return False
+    if as_json:
+        failures = result.pop('analyzer_failures')
+        result.pop('cached')
+        print(json.dumps({
+            'files': 1,
+            'results': [result],
+            'outputs': [],
+            'summary': None,
+            'trace': None,
+            'analyzer_failures': {result['path']: failures} if failures else {},
+            'duplicates': {},
+        }))
+        return True
+    code_from_result(result).print_result()
+    for reason in result['analyzer_failures']:
+        print(f"Analisador falhou: {reason}")
+    return True
+
+
+def analyze():
     """
-    
-    print(pyfiglet.figlet_format("PerfeQ", font="slant"))
+    Runs the command-line interface with the arguments in `sys.argv`.
+
+    The first argument is the file or directory to analyze; the options are described by
+    `perfeq --help`. A file is sent to a running server when `--server` is given, and analyzed
+    locally by an instance of the Perfeq class otherwise or when the server cannot be reached.
+
+    Subcommands:
+        serve: Starts the analysis server (see `serve`).
+        merge: Combines the partial results of a run split with `--shard` (see `merge`).
+
+    If no path is provided, the parser prints the usage and exits with an error.
+    """
+    if sys.argv[1:2] == ["serve"]:
+        serve(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["merge"]:
+        merge(sys.argv[2:])
+        return
+
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.server is not None:
+        if not os.path.isfile(args.path):
+            parser.error("--server analyzes a single file")
+        if args.spool_dir:
+            parser.error("--spool-dir cannot be combined with --server")
+        try:
+            if analyze_remotely(args.server, args.path, args.json):
+                return
+        except ValueError as error:
+            parser.error(str(error))
+
+    output_format = OutputFormats(args.output_format)
+    if output_format != OutputFormats.CSV and (args.resume or args.changed_since or args.mtime_manifest):
+        parser.error("--resume, --changed-since and --mtime-manifest are only available with --output-format csv")
+    if output_format == OutputFormats.PARQUET and importlib.util.find_spec("pyarrow") is None:
+        parser.error("--output-format parquet requires pyarrow (pip install pyarrow)")
+    if args.shard:
+        if not os.path.isdir(args.path):
+            parser.error("--shard splits a directory")
+        if output_format != OutputFormats.CSV:
+            parser.error("--shard is only available with --output-format csv")
+        if args.changed_since or args.mtime_manifest:
+            parser.error("--shard cannot be combined with --changed-since or --mtime-manifest")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than zero")
+    naming_rules = None
+    analyzer_config = None
+    try:
+        if args.naming_rules:
+            naming_rules = load_naming_rules(args.naming_rules)
+        if args.analyzers:
+            analyzer_config = load_analyzer_config(args.analyzers)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.python_backend:
+        backend = PythonBackends(args.python_backend)
+        if backend == PythonBackends.RUFF and shutil.which("ruff") is None:
+            parser.error("--python-backend ruff requires ruff (pip install ruff)")
+        analyzer_config = select_python_backend(backend, analyzer_config)
 
-    args = sys.argv
+    # Os módulos da análise e do banner só são carregados quando o arquivo é analisado neste processo
+    from perfeq.analyzer.perfeq import Perfeq
 
-    if len(args) == 1:
-        raise ValueError("No input file/path was provided")
+    quiet = args.quiet or args.json
+    if not quiet:
+        import pyfiglet
 
-    path = args[1]
-    
-    perfeq = Perfeq(path)
-    perfeq.analyze()
-    
+        print(pyfiglet.figlet_format("PerfeQ", font="slant"))
 
+    perfeq = Perfeq(
+        args.path,
+        jobs=args.jobs,
+        executor=Executors(args.executor),
+        use_cache=not args.no_cache,
+        include=args.include,
+        exclude=args.exclude,
+        resume=args.resume,
+        changed_since=args.changed_since,
+        mtime_manifest=args.mtime_manifest,
+        profile=args.profile,
+        naming_rules=naming_rules,
+        output_format=output_format,
+        timeout=args.timeout,
+        quiet=quiet,
+        shard=args.shard,
+        analyzer_config=analyzer_config,
+        spool_dir=args.spool_dir,
+        dedup=args.dedup,
+    )
+    if args.json:
+        perfeq.run()
+        print(json.dumps(perfeq.get_report()))
+    else:
+        perfeq.analyze()
 
 
 if __name__ == "__main__":
-    analyze()
\ No newline at end of file
+    analyze()
@@ -0,0 +1,126 @@
+from perfeq.helpers.batch_helper import route_output
+from perfeq.utils.enums import TypesOfWarning
+
+
+class Analyzer:
+    """
+    Base class of the analyzers run by PerfeQ. An analyzer is either an external command (`command`),
+    run by the CommandScheduler of the engine over chunks of files, or an in-process callable (`run`),
+    run by the workers. Only external commands have a deadline per file. The built-in analyzers are in
+    `perfeq.helpers.builtin_analyzers`; other packages register theirs under the `perfeq.analyzers`
+    entry point group.
+
+    Attributes:
+        name (str): The unique name of the analyzer, used in the configuration and in the outputs.
+        language (Languages): The programming language of the files it analyzes.
+        command (str): The command line of an external analyzer (the paths are appended to it), or
+            None for an in-process analyzer.
+        batch (bool): Whether the command accepts many files at once. Otherwise it is run once per file.
+        persistent (bool): Whether the command keeps running between chunks instead of starting once per
+            chunk: it reads the paths of each chunk from its standard input, as a JSON list on one line,
+            and writes the output of the chunk on one line of its standard output. The scheduler reuses
+            the idle processes and kills the one that exceeds its deadline.
+        package (str): The distribution of the tool, whose version is part of the cache keys.
+        enabled (bool): Whether the analyzer runs when the configuration does not mention it.
+        checks_naming (bool): Whether the analyzer reports the names of variables and functions that
+            break the naming conventions. The built-in naming checker does not run on a language
+            that has such an analyzer enabled, so each name is reported once.
+    """
+
+    name = None
+    language = None
+    command = None
+    batch = True
+    persistent = False
+    package = None
+    enabled = True
+    checks_naming = False
+
+    @property
+    def in_process(self):
+        return self.command is None
+
+    def run(self, paths):
+        """
+        Analyzes a batch of files in the worker process. Only called on in-process analyzers.
+
+        Args:
+            paths (list): Paths of the files.
+
+        Returns:
+            dict: The output of the analyzer for each path, in the form `parse` reads.
+        """
+        raise NotImplementedError(f"{self.name} is not an in-process analyzer")
+
+    def select_output(self, returncode, stdout, stderr):
+        """
+        Chooses the stream of an external command that holds the warnings.
+
+        Args:
+            returncode (int): The exit status of the command.
+            stdout (str): The standard output.
+            stderr (str): The standard error.
+
+        Returns:
+            str: The output split by `route`. Defaults to the standard output.
+        """
+        return stdout
+
+    def route(self, output, paths):
+        """
+        Splits the output of an external command run over a chunk of files by file.
+
+        Args:
+            output (str): The output chosen by `select_output`.
+            paths (list): Paths of the files in the chunk.
+
+        Returns:
+            dict: The output of each path. Defaults to `route_output`, which attributes each line
+            to the path it contains (or to the last path named before it).
+
+        Raises:
+            ValueError: If the output cannot be read; the files of the chunk are reported as failed.
+        """
+        return route_output(output, paths)
+
+    def parse(self, output):
+        """
+        Extracts the warnings of the output of a single file.
+
+        Args:
+            output: The output of the file (the text routed to it by an external command, or the
+                value returned for it by `run`).
+
+        Returns:
+            list: (line, message) tuples.
+        """
+        raise NotImplementedError
+
+    def classify(self, message):
+        """
+        Returns the type of a warning.
+
+        Args:
+            message (str): The warning message.
+
+        Returns:
+            TypesOfWarning: Defaults to FORMATTING.
+        """
+        return TypesOfWarning.FORMATTING
+
+    def get_version(self):
+        """
+        Returns the installed version of the package of the analyzer.
+
+        Returns:
+            str: The version, "unknown" if the package is not installed, or an empty string if the
+            analyzer has no package.
+        """
+        if not self.package:
+            return ""
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version(self.package)
+        except PackageNotFoundError:
+            return "unknown"
@@ -1,8 +1,30 @@
+from perfeq.constants import CSV_HEADER
+
+METRICS_COLUMNS = CSV_HEADER.split(",")
+
+
 class Code:
+    __slots__ = (
+        "id",
+        "warnings",
+        "lines_of_code",
+        "variables_qty",
+        "functions_qty",
+        "variables_warnings_qty",
+        "functions_warnings_qty",
+        "formatting_warnings_qty",
+        "warnings_per_lines_of_code",
+        "variable_warnings_per_number_of_variables",
+        "function_warnings_per_number_of_functions",
+        "formatting_warnings_per_lines_of_code",
+    )
+
     def __init__(self, id, warnings, lines_of_code, variables_qty, functions_qty, variables_warnings_qty, functions_warnings_qty, formatting_warnings_qty):
         self.id = id
         self.warnings = warnings
-        self.warnings.sort(key=lambda warning: warning.line)
+        # Os avisos vindos de um WarningStore já estão ordenados por linha
+        if isinstance(warnings, list):
+            self.warnings.sort(key=lambda warning: warning.line)
         self.lines_of_code = lines_of_code
         self.variables_qty = variables_qty
         self.functions_qty = functions_qty
@@ -10,10 +32,10 @@ class Code:
         self.functions_warnings_qty = functions_warnings_qty
         self.formatting_warnings_qty = formatting_warnings_qty
         
-        self.warnings_per_lines_of_code = 0
-        self.variable_warnings_per_number_of_variables = 0
-        self.function_warnings_per_number_of_functions = 0
-        self.formatting_warnings_per_lines_of_code = 0
+        self.warnings_per_lines_of_code = 0.0
+        self.variable_warnings_per_number_of_variables = 0.0
+        self.function_warnings_per_number_of_functions = 0.0
+        self.formatting_warnings_per_lines_of_code = 0.0
         
         self.calculate_metrics()
 
@@ -31,16 +53,16 @@ class Code:
         These metrics are set as attributes of the instance.
         """
         self.warnings_per_lines_of_code = (
-            len(self.warnings) / self.lines_of_code if self.lines_of_code != 0 else 0
+            len(self.warnings) / self.lines_of_code if self.lines_of_code != 0 else 0.0
         )
         self.variable_warnings_per_number_of_variables = (
-            self.variables_warnings_qty / self.variables_qty if self.variables_qty != 0 else 0
+            self.variables_warnings_qty / self.variables_qty if self.variables_qty != 0 else 0.0
         )
         self.function_warnings_per_number_of_functions = (
-            self.functions_warnings_qty / self.functions_qty if self.functions_qty != 0 else 0
+            self.functions_warnings_qty / self.functions_qty if self.functions_qty != 0 else 0.0
         )
         self.formatting_warnings_per_lines_of_code = (
-            self.formatting_warnings_qty / self.lines_of_code if self.lines_of_code != 0 else 0
+            self.formatting_warnings_qty / self.lines_of_code if self.lines_of_code != 0 else 0.0
         )
 
     def print_result(self):
@@ -66,6 +88,46 @@ class Code:
         print(f"Formatting warnings per lines of code (FWPL) - {self.formatting_warnings_per_lines_of_code*100:.2f}%\n")
         
     
+    def get_metrics(self):
+        """
+        Returns the values of the analysis in the order of the CSV columns, with the ratios as
+        unrounded percentages, for the columnar output formats.
+
+        Returns:
+            tuple: The id, the quantities and the WPL, VWPV, FWPF and FWPL metrics of the code.
+        """
+        return (
+            self.id,
+            self.lines_of_code,
+            len(self.warnings),
+            self.warnings_per_lines_of_code * 100,
+            self.variables_warnings_qty,
+            self.variables_qty,
+            self.variable_warnings_per_number_of_variables * 100,
+            self.functions_warnings_qty,
+            self.functions_qty,
+            self.function_warnings_per_number_of_functions * 100,
+            self.formatting_warnings_qty,
+            self.formatting_warnings_per_lines_of_code * 100,
+        )
+
+    def to_dict(self):
+        """
+        Returns the analysis of the code as a JSON-serializable object.
+
+        Returns:
+            dict: The 'path', the 'metrics' by CSV column (see `get_metrics`) and the 'warnings',
+            each one with its 'line', 'type' and 'message'.
+        """
+        return {
+            'path': self.id,
+            'metrics': dict(zip(METRICS_COLUMNS, self.get_metrics())),
+            'warnings': [
+                {'line': warning.line, 'type': warning.type.value, 'message': warning.message}
+                for warning in self.warnings
+            ],
+        }
+
     def print_multiple_result(self):
         """
         Returns a formatted string with the results of the analysis.
@@ -1,6 +1,7 @@
 class QuantityInfo:
+    __slots__ = ("warnings_variables_qty", "warnings_functions_qty", "warnings_formatting_qty")
+
     def __init__(self):
         self.warnings_variables_qty = 0 
         self.warnings_functions_qty = 0
         self.warnings_formatting_qty = 0
-    
\ No newline at end of file
@@ -0,0 +1,30 @@
+import ast
+
+from perfeq.helpers.source_reader import count_lines
+from perfeq.utils.enums import Languages
+
+
+class SourceFile:
+    def __init__(self, path, language, text):
+        """
+        Initializes the parsed artifact of a source file. The file is parsed once and the
+        artifact is shared by every consumer: the variable and function counters, the lines
+        of code and the in-process checks. The lines are counted on the text, without splitting
+        it in a list of lines.
+
+        Args:
+            path (str): The path of the file.
+            language (Languages): The programming language of the file.
+            text (str): The content of the file.
+        """
+        self.path = path
+        self.language = language
+        self.text = text
+        self.lines_of_code = count_lines(text)
+        self.tree = None
+        self.syntax_error = None
+        if language == Languages.PYTHON:
+            try:
+                self.tree = ast.parse(text, filename=path or "<unknown>")
+            except (SyntaxError, ValueError, RecursionError, MemoryError) as error:
+                self.syntax_error = error
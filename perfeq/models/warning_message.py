@@ -1,7 +1,14 @@
+import sys
+
+
 class WarningMessage:
+    __slots__ = ("message", "line", "type")
+
     def __init__(self, message, line, type):
-        self.message = message
+        # O mesmo texto se repete em muitos avisos (ex.: regras do cpplint): apenas uma cópia é mantida
+        self.message = sys.intern(message)
         self.line = line
         self.type = type
-        
-    
\ No newline at end of file
+
+    def __reduce__(self):
+        return WarningMessage, (self.message, self.line, self.type)
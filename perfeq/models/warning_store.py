@@ -0,0 +1,152 @@
+from array import array
+from collections.abc import Sequence
+
+from perfeq.models.warning_message import WarningMessage
+from perfeq.utils.enums import TypesOfWarning
+
+TYPES = list(TypesOfWarning)
+TYPE_IDS = {type_of_warning: index for index, type_of_warning in enumerate(TYPES)}
+
+
+class MessageTable:
+    __slots__ = ("ids", "messages")
+
+    def __init__(self):
+        """
+        Initializes the table that stores each distinct warning message once and refers to it by id.
+        """
+        self.ids = {}
+        self.messages = []
+
+    def get_id(self, message):
+        """
+        Returns the id of a message, adding it to the table if needed.
+
+        Args:
+            message (str): The warning message.
+
+        Returns:
+            int: The id of the message.
+        """
+        message_id = self.ids.get(message)
+        if message_id is None:
+            message_id = self.ids[message] = len(self.messages)
+            self.messages.append(message)
+        return message_id
+
+    def __getitem__(self, message_id):
+        return self.messages[message_id]
+
+    def __len__(self):
+        return len(self.messages)
+
+
+class WarningStore:
+    def __init__(self):
+        """
+        Initializes the columnar store of the warnings of a run. Each warning takes one entry in
+        each typed array (line, type and message id) instead of one object, and the warnings of
+        a file are kept together, sorted by line, between `starts[file_id]` and `starts[file_id + 1]`.
+        """
+        self.messages = MessageTable()
+        self.paths = []
+        self.starts = array("Q", [0])
+        self.lines = array("I")
+        self.types = array("B")
+        self.message_ids = array("I")
+
+    def add(self, path, warnings):
+        """
+        Stores the warnings of a file.
+
+        Args:
+            path (str): The path of the file.
+            warnings (list): The WarningMessage objects of the file.
+
+        Returns:
+            FileWarnings: A read-only view of the stored warnings of the file.
+        """
+        for warning in sorted(warnings, key=lambda warning: warning.line):
+            self.lines.append(warning.line)
+            self.types.append(TYPE_IDS[warning.type])
+            self.message_ids.append(self.messages.get_id(warning.message))
+        self.paths.append(path)
+        self.starts.append(len(self.lines))
+        return FileWarnings(self, len(self.paths) - 1)
+
+    def release(self):
+        """
+        Releases the warnings of the files stored so far, once they were written, keeping only the
+        table of messages (which is written when the run ends). The views returned by `add` for
+        those files must not be read afterwards.
+        """
+        self.paths = []
+        self.starts = array("Q", [0])
+        self.lines = array("I")
+        self.types = array("B")
+        self.message_ids = array("I")
+
+    def get(self, index):
+        """
+        Builds the WarningMessage stored at a given position.
+
+        Args:
+            index (int): The position of the warning in the store.
+
+        Returns:
+            WarningMessage: The warning.
+        """
+        return WarningMessage(self.messages[self.message_ids[index]], self.lines[index], TYPES[self.types[index]])
+
+    def rows(self):
+        """
+        Iterates over every stored warning.
+
+        Yields:
+            tuple: (path, line, TypesOfWarning, message) for each warning, grouped by file.
+        """
+        for file_id, path in enumerate(self.paths):
+            for index in range(self.starts[file_id], self.starts[file_id + 1]):
+                yield path, self.lines[index], TYPES[self.types[index]], self.messages[self.message_ids[index]]
+
+    def __len__(self):
+        return len(self.lines)
+
+
+class FileWarnings(Sequence):
+    __slots__ = ("store", "file_id")
+
+    def __init__(self, store, file_id):
+        """
+        Read-only view of the warnings of a file in a WarningStore. The WarningMessage objects
+        are built only when the view is read.
+
+        Args:
+            store (WarningStore): The store of the run.
+            file_id (int): The position of the file in the store.
+        """
+        self.store = store
+        self.file_id = file_id
+
+    def __len__(self):
+        return self.store.starts[self.file_id + 1] - self.store.starts[self.file_id]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("warning index out of range")
+        return self.store.get(self.store.starts[self.file_id] + index)
+
+    def rows(self):
+        """
+        Iterates over the warnings of the file without building WarningMessage objects.
+
+        Yields:
+            tuple: (line, TypesOfWarning, message id) for each warning, sorted by line.
+        """
+        store = self.store
+        for index in range(store.starts[self.file_id], store.starts[self.file_id + 1]):
+            yield store.lines[index], TYPES[store.types[index]], store.message_ids[index]
@@ -3,8 +3,24 @@ from enum import Enum
 class Languages(Enum):
     PYTHON = "Python"
     C = "C"
+
+# Linguagem de cada extensão devolvida pelo PathHelper
+LANGUAGES = {'.py': Languages.PYTHON, '.c': Languages.C}
     
 class TypesOfWarning(Enum):
     FUNCTION = "Function"
     VARIABLE = "Variable"
-    FORMATTING = "Formatting"
\ No newline at end of file
+    FORMATTING = "Formatting"
+
+class Executors(Enum):
+    PROCESS = "process"
+    THREAD = "thread"
+
+class PythonBackends(Enum):
+    PYLINT = "pylint"
+    RUFF = "ruff"
+
+class OutputFormats(Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
@@ -14,7 +14,8 @@ setup(name='perfeq',
     keywords='integrated source code quality assessment tool',
     description=u'An integrated source code quality assessment tool focusing on adherence to programming language style conventions',
     packages=['perfeq','perfeq.analyzer','perfeq.helpers','perfeq.models','perfeq.utils'],
-    install_requires=['pyfiglet', 'tqdm', 'cpplint', 'pylint', 'naming-check'],
+    install_requires=['pyfiglet', 'tqdm', 'cpplint', 'pylint>=3.0,<4'],
+    extras_require={'parquet': ['pyarrow'], 'summary': ['numpy'], 'ruff': ['ruff']},
     entry_points={
         'console_scripts': [
             'perfeq = perfeq.main:analyze'
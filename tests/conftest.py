@@ -0,0 +1,21 @@
+import os
+import shutil
+
+import pytest
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "perfeq", "examples")
+
+
+@pytest.fixture
+def copy_example(tmp_path):
+    """
+    Copies a file of perfeq/examples to the temporary directory of the test, so the runs never
+    write next to the tracked examples.
+    """
+    def copy(name, destination=None):
+        target = tmp_path / (destination or name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(os.path.join(EXAMPLES_DIR, name), target)
+        return str(target)
+
+    return copy
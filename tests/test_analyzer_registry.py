@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from perfeq.helpers import analyzer_registry
+from perfeq.helpers.analyzer_registry import (
+    analyzer_concurrency, get_analyzers, load_analyzer_config, load_plugins, select_analyzers, select_python_backend,
+)
+from perfeq.models.analyzer import Analyzer
+from perfeq.utils.enums import Languages, PythonBackends
+
+
+class ClangTidyAnalyzer(Analyzer):
+    name = "clang-tidy"
+    language = Languages.C
+    command = "clang-tidy"
+    enabled = False
+
+
+class FakeEntryPoint:
+    def __init__(self, name, loaded):
+        self.name = name
+        self.loaded = loaded
+
+    def load(self):
+        if isinstance(self.loaded, Exception):
+            raise self.loaded
+        return self.loaded
+
+
+class FakeEntryPoints(list):
+    def select(self, group):
+        assert group == "perfeq.analyzers"
+        return self
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    """
+    Replaces the installed entry points by the given ones and forgets the analyzers already loaded.
+    """
+    def install(*entry_points):
+        monkeypatch.setattr("importlib.metadata.entry_points", lambda: FakeEntryPoints(entry_points))
+        monkeypatch.setattr(analyzer_registry, "_analyzers", None)
+
+    return install
+
+
+def write_config(tmp_path, config):
+    path = tmp_path / "analyzers.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_plugins_are_loaded_from_classes_and_instances(plugins):
+    instance = ClangTidyAnalyzer()
+    instance.name = "clang-tidy-instance"
+    plugins(FakeEntryPoint("clang-tidy", ClangTidyAnalyzer), FakeEntryPoint("instance", instance))
+
+    loaded = load_plugins()
+
+    assert list(loaded) == ["clang-tidy", "clang-tidy-instance"]
+    assert isinstance(loaded["clang-tidy"], ClangTidyAnalyzer)
+    assert loaded["clang-tidy-instance"] is instance
+
+
+def test_broken_plugins_are_reported_and_skipped(plugins, capsys):
+    duplicate = ClangTidyAnalyzer()
+    duplicate.name = "pylint"
+    plugins(
+        FakeEntryPoint("broken", ImportError("no module named perfeq_broken")),
+        FakeEntryPoint("not-an-analyzer", object),
+        FakeEntryPoint("duplicate", duplicate),
+        FakeEntryPoint("clang-tidy", ClangTidyAnalyzer),
+    )
+
+    assert list(load_plugins()) == ["clang-tidy"]
+    errors = capsys.readouterr().err
+    assert "'broken' ignorado: no module named perfeq_broken" in errors
+    assert "'not-an-analyzer' ignorado" in errors
+    assert "o nome 'pylint' já está em uso" in errors
+
+
+def test_plugins_are_selected_only_when_enabled(plugins):
+    plugins(FakeEntryPoint("clang-tidy", ClangTidyAnalyzer))
+
+    assert "clang-tidy" in get_analyzers()
+    names = {language: [analyzer.name for analyzer in group] for language, group in select_analyzers().items()}
+    assert names == {Languages.PYTHON: ["pylint"], Languages.C: ["cpplint"]}
+
+    enabled = select_analyzers({"clang-tidy": {"enabled": True}, "cpplint": {"enabled": False}})
+    assert [analyzer.name for analyzer in enabled[Languages.C]] == ["clang-tidy"]
+
+
+def test_the_python_backend_replaces_the_other_one(plugins):
+    plugins()
+    config = select_python_backend(PythonBackends.RUFF, {"ruff": {"concurrency": 2}})
+
+    assert config == {"pylint": {"enabled": False}, "ruff": {"concurrency": 2, "enabled": True}}
+    assert [analyzer.name for analyzer in select_analyzers(config)[Languages.PYTHON]] == ["ruff"]
+    assert analyzer_concurrency(config) == {"ruff": 2}
+
+
+def test_a_valid_config_is_loaded(plugins, tmp_path):
+    plugins(FakeEntryPoint("clang-tidy", ClangTidyAnalyzer))
+    config = {"cpplint": {"enabled": False}, "clang-tidy": {"enabled": True, "concurrency": 2}}
+
+    assert load_analyzer_config(write_config(tmp_path, config)) == config
+
+
+@pytest.mark.parametrize("config, message", [
+    ([], "Expected an object with an entry per analyzer"),
+    ({"clang-tidy": {}}, "Unknown analyzer"),
+    ({"pylint": True}, "Expected an object with the settings of pylint"),
+    ({"pylint": {"enabled": "no"}}, "Invalid setting of pylint"),
+    ({"pylint": {"concurrency": 0}}, "Invalid setting of pylint"),
+    ({"pylint": {"concurrency": True}}, "Invalid setting of pylint"),
+    ({"pylint": {"jobs": 2}}, "Invalid setting of pylint"),
+])
+def test_invalid_configs_are_rejected(plugins, tmp_path, config, message):
+    plugins()
+
+    with pytest.raises(ValueError, match=message):
+        load_analyzer_config(write_config(tmp_path, config))
@@ -0,0 +1,34 @@
+import pytest
+
+from perfeq.helpers.c_variable_counter import c_variable_counter
+from perfeq.utils.enums import TypesOfWarning
+
+
+def test_example_file(copy_example):
+    with open(copy_example("test.c"), encoding="utf8") as file:
+        code = file.read()
+    identifiers = []
+
+    assert c_variable_counter(code, identifiers) == (25, 7)
+    assert ("employee_count", 3, TypesOfWarning.VARIABLE) in identifiers
+    assert ("calculateTotalRevenue", 40, TypesOfWarning.FUNCTION) in identifiers
+
+
+@pytest.mark.parametrize("code, counts, names", [
+    ("int a, b = 2, c[3];", (3, 0), ["a", "b", "c"]),
+    # Comentários, literais e diretivas do pré-processador não são declarações
+    ('// int x;\n/* int y; */\nconst char *s = "int z;";\n#define DECL int w;\n', (1, 0), ["s"]),
+    ("int main(void) {\n  for (int i = 0, j = 1; i < j; i++) {}\n  return 0;\n}\n", (2, 1), ["main", "i", "j"]),
+    ("static unsigned long\n  total =\n  0;", (1, 0), ["total"]),
+    ("struct node {\n  int value;\n  struct node *next;\n};", (3, 0), ["node", "value", "next"]),
+    ("void f(int a);\nint g(void) { return 0; }", (0, 2), ["f", "g"]),
+])
+def test_declarations(code, counts, names):
+    identifiers = []
+
+    assert c_variable_counter(code, identifiers) == counts
+    assert [name for name, _, _ in identifiers] == names
+
+
+def test_list_of_lines_is_accepted():
+    assert c_variable_counter(["int a;", "int b;"]) == (2, 0)
@@ -0,0 +1,53 @@
+import os
+import subprocess
+
+import pytest
+
+from perfeq.helpers.change_helper import MtimeManifest, git_changed_files
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf8") as file:
+        file.write(text)
+
+
+def git(directory, *args):
+    subprocess.run(
+        ["git", "-C", str(directory), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+
+
+def test_git_lists_modified_and_untracked_files(tmp_path):
+    for name in ("kept.py", "modified.py", "sub/kept.c"):
+        write(str(tmp_path / name), "x = 1\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    write(str(tmp_path / "modified.py"), "x = 2\n")
+    write(str(tmp_path / "sub" / "new.c"), "int x;\n")
+
+    changed = git_changed_files(str(tmp_path / "sub"), "HEAD")
+
+    assert changed == {os.path.realpath(tmp_path / "modified.py"), os.path.realpath(tmp_path / "sub" / "new.c")}
+
+
+def test_git_reports_an_unknown_revision(tmp_path):
+    git(tmp_path, "init", "-q")
+    with pytest.raises(RuntimeError):
+        git_changed_files(str(tmp_path), "no-such-ref")
+
+
+def test_manifest_lists_new_and_modified_files(tmp_path):
+    codes = [{'path': str(tmp_path / name), 'language': '.py'} for name in ("a.py", "b.py")]
+    for code in codes:
+        write(code['path'], "x = 1\n")
+    manifest_path = str(tmp_path / "results" / "perfeq_manifest.json")
+    MtimeManifest(manifest_path).save(codes[:1])
+
+    manifest = MtimeManifest(manifest_path)
+    assert manifest.changed(codes) == {os.path.realpath(codes[1]['path'])}
+
+    write(codes[0]['path'], "x = 10\n")
+    assert MtimeManifest(manifest_path).changed(codes[:1]) == {os.path.realpath(codes[0]['path'])}
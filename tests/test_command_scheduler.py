@@ -0,0 +1,135 @@
+import json
+import sys
+
+import pytest
+
+from perfeq.helpers.command_scheduler import CommandScheduler
+
+# Comando de teste: trava nos arquivos com "hang" no nome e imprime os demais
+ECHO = "import sys, time\nif any('hang' in path for path in sys.argv[1:]): time.sleep(30)\nprint('\\n'.join(sys.argv[1:]))"
+# Comando de teste: registra cada tentativa e é encerrado por um sinal até a tentativa `sys.argv[1]`
+CRASH = (
+    "import os, sys\n"
+    "with open(sys.argv[2], 'a') as file: file.write('x')\n"
+    "if len(open(sys.argv[2]).read()) < int(sys.argv[1]): os.kill(os.getpid(), 9)\n"
+    "print(sys.argv[2])"
+)
+
+
+# Comando persistente de teste: responde a cada lote com o seu pid por arquivo, trava nos arquivos com
+# "hang" no nome e termina sem responder nos arquivos com "exit" no nome
+PERSISTENT = (
+    "import json, os, sys, time\n"
+    "for line in sys.stdin:\n"
+    "    paths = json.loads(line)\n"
+    "    if any('hang' in path for path in paths): time.sleep(30)\n"
+    "    if any('exit' in path for path in paths): sys.exit(3)\n"
+    "    print(json.dumps({path: os.getpid() for path in paths}), flush=True)\n"
+)
+
+
+def run_chunk(scheduler, name, argv, paths, persistent=False):
+    return scheduler.submit(name, argv, paths, persistent=persistent).result(timeout=60)
+
+
+def answers(runs):
+    return {path: pid for _, _, stdout, _ in runs for path, pid in json.loads(stdout).items()}
+
+
+def test_timed_out_chunk_is_bisected_until_the_hanging_file_is_alone():
+    paths = ["a.c", "b.c", "hang.c", "d.c"]
+    with CommandScheduler(4, timeout=0.3, retries=0, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "echo", [sys.executable, "-c", ECHO], paths)
+
+    assert failures == {"hang.c": "echo: killed after 0.3s"}
+    analyzed = sorted(path for run_paths, returncode, stdout, stderr in runs for path in run_paths)
+    assert analyzed == ["a.c", "b.c", "d.c"]
+    assert all(returncode == 0 for _, returncode, _, _ in runs)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX signals")
+def test_command_killed_by_a_signal_is_retried(tmp_path):
+    attempts = tmp_path / "attempts"
+    with CommandScheduler(1, retries=2, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "crash", [sys.executable, "-c", CRASH, "2"], [str(attempts)])
+
+    assert failures == {}
+    assert len(runs) == 1
+    assert attempts.read_text() == "xx"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX signals")
+def test_file_is_recorded_as_failed_after_the_retries(tmp_path):
+    attempts = tmp_path / "attempts"
+    with CommandScheduler(1, retries=2, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "crash", [sys.executable, "-c", CRASH, "99"], [str(attempts)])
+
+    assert runs == []
+    assert failures == {str(attempts): "crash: terminated by signal 9"}
+    assert attempts.read_text() == "xxx"
+
+
+def test_missing_command_is_not_retried():
+    with CommandScheduler(1, retries=2, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "missing", ["perfeq-missing-analyzer"], ["a.c", "b.c"])
+
+    assert runs == []
+    assert failures == {"a.c": "missing: command not found", "b.c": "missing: command not found"}
+
+
+def test_handler_result_replaces_the_run():
+    with CommandScheduler(1) as scheduler:
+        future = scheduler.submit(
+            "echo", [sys.executable, "-c", ECHO], ["a.c", "b.c"],
+            handler=lambda paths, returncode, stdout, stderr: stdout.split(),
+        )
+        runs, failures = future.result(timeout=60)
+
+    assert runs == [["a.c", "b.c"]]
+    assert failures == {}
+
+
+def test_persistent_process_is_reused_between_chunks():
+    with CommandScheduler(1) as scheduler:
+        first = answers(run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], ["a.py", "b.py"], True)[0])
+        second = answers(run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], ["c.py"], True)[0])
+
+    assert list(first) == ["a.py", "b.py"]
+    assert len(set(first.values()) | set(second.values())) == 1
+
+
+def test_hanging_persistent_process_is_killed_and_replaced():
+    paths = ["a.py", "hang.py", "c.py", "d.py"]
+    with CommandScheduler(1, timeout=0.5, retries=1, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], paths, True)
+        following = answers(run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], ["e.py"], True)[0])
+
+    assert failures == {"hang.py": "persistent: killed after 0.5s"}
+    analyzed = answers(runs)
+    assert sorted(analyzed) == ["a.py", "c.py", "d.py"]
+    # Os processos que travaram foram encerrados e os lotes seguintes continuam sendo analisados
+    assert list(following) == ["e.py"]
+
+
+def test_persistent_process_that_exits_without_answering_is_recorded():
+    with CommandScheduler(1, retries=1, backoff=0) as scheduler:
+        runs, failures = run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], ["exit.py"], True)
+        after = answers(run_chunk(scheduler, "persistent", [sys.executable, "-c", PERSISTENT], ["a.py"], True)[0])
+
+    assert runs == []
+    assert failures == {"exit.py": "persistent: exited with status 3 without answering"}
+    assert list(after) == ["a.py"]
+
+
+def test_pylint_runs_in_a_persistent_process(copy_example):
+    pytest.importorskip("pylint")
+    from perfeq.analyzer.engine import collect_warnings, schedule_commands
+    from perfeq.helpers.builtin_analyzers import PylintAnalyzer
+
+    path = copy_example("test.py")
+    with CommandScheduler(1) as scheduler:
+        warnings, failures = collect_warnings(schedule_commands(scheduler, [PylintAnalyzer()], [path]))
+
+    assert failures == {}
+    messages = [(warning.line, warning.message) for warning in warnings[path]]
+    assert (1, "Missing module docstring (missing-module-docstring)") in messages
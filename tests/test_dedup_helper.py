@@ -0,0 +1,61 @@
+import os
+
+from perfeq.analyzer.perfeq import Perfeq
+from perfeq.helpers.dedup_helper import DuplicatesWriter, group_duplicates, read_duplicates
+from perfeq.helpers.result_writer import read_result_rows
+from perfeq.utils.enums import Executors
+
+# Sem os analisadores externos, apenas os contadores e o verificador de nomes rodam
+NO_ANALYZERS = {"pylint": {"enabled": False}, "cpplint": {"enabled": False}}
+
+
+def test_only_identical_files_with_the_same_name_are_grouped(copy_example, tmp_path):
+    first = copy_example("test.c", "a/test.c")
+    copy = copy_example("test.c", "b/test.c")
+    renamed = copy_example("test.c", "c/other.c")
+    reformatted = copy_example("test.c", "d/test.c")
+    with open(reformatted, "a", encoding="utf8") as file:
+        file.write("\n")
+    missing = str(tmp_path / "e" / "test.c")
+    codes = [{'path': path, 'language': '.c'} for path in (first, copy, renamed, reformatted, missing)]
+
+    representatives, duplicates = group_duplicates(codes)
+
+    assert [code['path'] for code in representatives] == [first, renamed, reformatted, missing]
+    assert duplicates == {first: [copy]}
+
+
+def test_duplicates_file_round_trip(tmp_path):
+    path = str(tmp_path / "results" / "perfeq_duplicates.csv")
+    writer = DuplicatesWriter(path, {"old/b.py": "old/a.py"})
+    writer.write("new/b.py", "new/a.py")
+    writer.close()
+
+    assert read_duplicates(path) == {"old/b.py": "old/a.py", "new/b.py": "new/a.py"}
+
+
+def analyze(path):
+    perfeq = Perfeq(
+        path, jobs=1, executor=Executors.THREAD, use_cache=False, mtime_manifest=True, quiet=True,
+        dedup=True, analyzer_config=NO_ANALYZERS,
+    )
+    perfeq.run()
+    results = os.path.join(path, "results")
+    return read_result_rows(os.path.join(results, "perfeq_output.csv")), read_duplicates(os.path.join(results, "perfeq_duplicates.csv"))
+
+
+def test_duplicate_is_analyzed_again_when_its_representative_changes(copy_example, tmp_path):
+    first = copy_example("test.c", "a/test.c")
+    copy = copy_example("test.c", "b/test.c")
+
+    rows, duplicates = analyze(str(tmp_path))
+    assert duplicates == {copy: first}
+    assert rows[copy].split(",")[1:] == rows[first].split(",")[1:]
+
+    with open(first, "a", encoding="utf8") as file:
+        file.write("int extraValue = 1;\n")
+    rows, duplicates = analyze(str(tmp_path))
+
+    assert duplicates == {}
+    assert rows[first].split(",")[1] == "69"
+    assert rows[copy].split(",")[1] == "68"
@@ -0,0 +1,62 @@
+from perfeq.analyzer.engine import AnalysisEngine
+from perfeq.utils.enums import Executors, Languages
+
+# Sem os analisadores externos, apenas os contadores e o verificador de nomes rodam
+NO_ANALYZERS = {"pylint": {"enabled": False}, "cpplint": {"enabled": False}}
+
+
+def make_corpus(copy_example, count):
+    """
+    Copies the examples `count` times, alternating the languages, with a different number of
+    extra lines in each copy so every file has its own result.
+    """
+    codes = []
+    for index in range(count):
+        for name, extension in (("test.c", ".c"), ("test.py", ".py")):
+            path = copy_example(name, f"{index}/{name}")
+            with open(path, "a", encoding="utf8") as file:
+                file.write("\n" * index)
+            codes.append({'path': path, 'language': extension})
+    return codes
+
+
+def run_engine(codes, jobs, executor):
+    engine = AnalysisEngine(
+        jobs=jobs, executor=executor, batch_size=2, progress=False, analyzer_config=NO_ANALYZERS,
+    )
+    return [
+        (result['path'], result['lines_of_code'], result['variables_qty'], result['functions_qty'], len(result['naming_warnings']))
+        for batch in engine.run(codes)
+        for result in batch
+    ]
+
+
+def test_batches_are_grouped_by_language_in_the_order_of_the_files(copy_example):
+    codes = make_corpus(copy_example, 5)
+    engine = AnalysisEngine(jobs=2, batch_size=2, progress=False, analyzer_config=NO_ANALYZERS)
+
+    batches = list(engine.make_batches(codes))
+
+    assert [language for language, _ in batches] == [Languages.PYTHON] * 3 + [Languages.C] * 3
+    assert all(len(batch) <= 2 for _, batch in batches)
+    assert [code for _, batch in batches for code in batch] == (
+        [code for code in codes if code['language'] == '.py'] + [code for code in codes if code['language'] == '.c']
+    )
+
+
+def test_results_do_not_depend_on_the_jobs_or_the_executor(copy_example):
+    codes = make_corpus(copy_example, 6)
+
+    expected = run_engine(codes, 1, Executors.THREAD)
+
+    assert [path for path, *_ in expected] == (
+        [code['path'] for code in codes if code['language'] == '.py']
+        + [code['path'] for code in codes if code['language'] == '.c']
+    )
+    assert len({lines for _, lines, *_ in expected}) > 2
+    assert run_engine(codes, 4, Executors.THREAD) == expected
+    assert run_engine(codes, 3, Executors.PROCESS) == expected
+
+
+def test_empty_run_yields_nothing():
+    assert list(AnalysisEngine(jobs=2, progress=False, analyzer_config=NO_ANALYZERS).run([])) == []
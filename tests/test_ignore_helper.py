@@ -0,0 +1,60 @@
+import os
+
+from perfeq.helpers.ignore_helper import IgnoreRules, compile_pattern
+from perfeq.helpers.path_helper import PathHelper
+
+
+def test_star_does_not_cross_directories():
+    pattern = compile_pattern("src/*.py")
+    assert pattern.match("src/main.py")
+    assert not pattern.match("src/pkg/main.py")
+
+
+def test_double_star_spans_directories():
+    assert compile_pattern("**/build").match("build")
+    assert compile_pattern("**/build").match("a/b/build")
+    assert compile_pattern("src/**/test.py").match("src/test.py")
+    assert compile_pattern("src/**/test.py").match("src/a/b/test.py")
+    assert compile_pattern("vendor/**").match("vendor/lib/x.c")
+    assert not compile_pattern("vendor/**").match("vendor")
+
+
+def test_brackets_and_escapes():
+    assert compile_pattern("file[0-9].c").match("file7.c")
+    assert not compile_pattern("file[!0-9].c").match("file7.c")
+    assert compile_pattern(r"\#notes").match("#notes")
+
+
+def write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf8") as file:
+        file.write(text)
+
+
+def test_leading_slash_anchors_to_the_ignore_file(tmp_path):
+    write(tmp_path / ".gitignore", "/gen.py\n")
+    write(tmp_path / "gen.py")
+    write(tmp_path / "sub" / "gen.py")
+    rules = IgnoreRules().extend(str(tmp_path))
+    assert rules.is_ignored(str(tmp_path / "gen.py"), False)
+    assert not rules.is_ignored(str(tmp_path / "sub" / "gen.py"), False)
+
+
+def test_walk_follows_gitignore_semantics(tmp_path):
+    write(tmp_path / ".gitignore", "docs/*.py\n**/generated\n*.c\n!keep.c\nbuild/\n")
+    for name in ["main.py", "docs/conf.py", "docs/api/ref.py", "a/generated/x.py", "lib.c", "keep.c", "build/out.py", "sub/build.py"]:
+        write(tmp_path / name)
+
+    paths = {os.path.relpath(code['path'], tmp_path).replace(os.sep, "/") for code in PathHelper(str(tmp_path)).iter_files()}
+
+    assert paths == {"main.py", "docs/api/ref.py", "keep.c", "sub/build.py"}
+
+
+def test_rules_of_subdirectories_are_relative_to_them(tmp_path):
+    write(tmp_path / "sub" / ".perfeqignore", "/local.py\n")
+    write(tmp_path / "local.py")
+    write(tmp_path / "sub" / "local.py")
+
+    paths = {os.path.relpath(code['path'], tmp_path).replace(os.sep, "/") for code in PathHelper(str(tmp_path)).iter_files()}
+
+    assert paths == {"local.py"}
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from perfeq.analyzer.merge import merge_shards
+from perfeq.helpers.dedup_helper import DuplicatesWriter, read_duplicates
+from perfeq.helpers.result_writer import CsvResultWriter, read_result_rows
+from perfeq.helpers.shard_helper import partial_name
+
+ROW = ",10,0,0.00,0,4,0.00,0,0,0.00,0,0.00"
+
+
+def write_partial(results, shard, code_ids, duplicates=None):
+    path = os.path.join(results, f"{partial_name(shard)}.csv")
+    CsvResultWriter(path, kept_rows=[code_id + ROW for code_id in code_ids]).close()
+    if duplicates is not None:
+        DuplicatesWriter(os.path.join(results, f"perfeq_duplicates.shard-{shard[0]}-of-{shard[1]}.csv"), duplicates).close()
+    return path
+
+
+def test_partials_are_combined_in_shard_order(tmp_path):
+    results = str(tmp_path / "results")
+    write_partial(results, (2, 2), ["c.py"], {"d.py": "c.py"})
+    write_partial(results, (1, 2), ["a.py", "b.py"], {})
+
+    report = merge_shards(str(tmp_path), quiet=True)
+
+    output = os.path.join(results, "perfeq_output.csv")
+    assert report['files'] == 3
+    assert report['outputs'] == [output]
+    assert list(read_result_rows(output)) == ["a.py", "b.py", "c.py"]
+    assert read_duplicates(os.path.join(results, "perfeq_duplicates.csv")) == {"d.py": "c.py"}
+
+
+def test_incomplete_set_of_partials_is_rejected(tmp_path):
+    results = str(tmp_path / "results")
+    write_partial(results, (1, 3), ["a.py"])
+    write_partial(results, (3, 3), ["c.py"])
+
+    with pytest.raises(ValueError, match="missing shards 2 of 3"):
+        merge_shards(str(tmp_path), quiet=True)
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from perfeq.helpers.metrics_aggregator import RATIOS, MetricsAggregator
+
+numpy = pytest.importorskip("numpy")
+
+COUNTS = ["LOC", "warnings_qty", "variable_warnings_qty", "variables_qty", "function_warnings_qty", "functions_qty", "formatting_warnings_qty"]
+PERCENTILES = [0, 25, 50, 90, 99, 100]
+BINS = [0, 1, 5, 10, 25, 50, 100]
+
+
+def make_files(count, seed=0):
+    generator = random.Random(seed)
+    files = []
+    for index in range(count):
+        directory = f"/corpus/dir{generator.randrange(5)}"
+        extension = generator.choice([".py", ".c"])
+        # Alguns arquivos vazios, sem variáveis ou sem funções: as razões são 0
+        lines = generator.choice([0, generator.randrange(1, 400)])
+        variables = generator.randrange(0, 30)
+        functions = generator.randrange(0, 8)
+        variable_warnings = generator.randrange(0, variables + 1)
+        function_warnings = generator.randrange(0, functions + 1)
+        formatting_warnings = generator.randrange(0, lines + 1)
+        counts = [
+            lines, variable_warnings + function_warnings + formatting_warnings, variable_warnings, variables,
+            function_warnings, functions, formatting_warnings,
+        ]
+        files.append((f"{directory}/file{index}{extension}", counts))
+    return files
+
+
+def expected_statistics(files, metric):
+    numerator, denominator = (COUNTS.index(column) for column in RATIOS[metric])
+    ratios = numpy.array([counts[numerator] * 100 / counts[denominator] if counts[denominator] else 0.0 for _, counts in files])
+    overall_denominator = sum(counts[denominator] for _, counts in files)
+    return {
+        "mean": ratios.mean(),
+        "overall": sum(counts[numerator] for _, counts in files) * 100 / overall_denominator if overall_denominator else 0.0,
+        "percentiles": numpy.percentile(ratios, PERCENTILES).tolist(),
+        "histogram": numpy.histogram(numpy.clip(ratios, 0, None), bins=BINS + [numpy.inf])[0].tolist(),
+    }
+
+
+def check_group(entry, files):
+    assert entry["files"] == len(files)
+    assert entry["totals"] == {column: sum(counts[index] for _, counts in files) for index, column in enumerate(COUNTS)}
+    for metric in RATIOS:
+        expected = expected_statistics(files, metric)
+        assert entry[metric]["mean"] == pytest.approx(expected["mean"])
+        assert entry[metric]["overall"] == pytest.approx(expected["overall"])
+        assert entry[metric]["percentiles"] == pytest.approx(expected["percentiles"])
+        assert entry[metric]["histogram"] == expected["histogram"]
+
+
+def test_statistics_match_numpy():
+    files = make_files(500)
+    aggregator = MetricsAggregator()
+    for path, counts in files:
+        aggregator.add_counts(path, counts)
+
+    summary = aggregator.summary(PERCENTILES, BINS)
+
+    assert summary["files"] == 500
+    check_group(summary["corpus"], files)
+    for name, extension in (("Python", ".py"), ("C", ".c")):
+        check_group(summary["languages"][name], [file for file in files if file[0].endswith(extension)])
+    assert len(summary["directories"]) == 5
+    for directory, entry in summary["directories"].items():
+        check_group(entry, [file for file in files if file[0].startswith(directory + "/")])
+
+
+def test_rows_of_the_results_file_are_read_back():
+    aggregator = MetricsAggregator()
+    aggregator.add_row("/corpus/dir,with,commas/a.py,10,2,20.00,1,4,25.00,0,0,0.00,1,10.00")
+
+    summary = aggregator.summary()
+
+    assert list(summary["directories"]) == ["/corpus/dir,with,commas"]
+    assert summary["corpus"]["totals"]["LOC"] == 10
+    assert summary["corpus"]["VWPV"]["overall"] == 25.0
+
+
+def test_languages_without_files_are_left_out():
+    # O grupo vazio (C) é o último: os seus percentis não podem ler além dos valores ordenados
+    aggregator = MetricsAggregator()
+    for path, counts in make_files(20):
+        aggregator.add_counts(path.replace(".c", ".py"), counts)
+
+    summary = aggregator.summary()
+
+    assert list(summary["languages"]) == ["Python"]
+    assert summary["languages"]["Python"]["WPL"] == summary["corpus"]["WPL"]
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from perfeq.analyzer.engine import analyze_batch
+from perfeq.helpers.c_variable_counter import c_variable_counter
+from perfeq.helpers.naming_checker import NamingChecker, load_naming_rules
+from perfeq.utils.enums import Languages, TypesOfWarning
+
+
+def check_example(copy_example, rules=None):
+    with open(copy_example("test.c"), encoding="utf8") as file:
+        identifiers = []
+        c_variable_counter(file.read(), identifiers)
+    warnings = NamingChecker(Languages.C, rules).check(identifiers)
+    return {kind: [warning for warning in warnings if warning.type == kind] for kind in TypesOfWarning}
+
+
+def test_default_rules_on_the_example(copy_example):
+    warnings = check_example(copy_example)
+
+    assert len(warnings[TypesOfWarning.VARIABLE]) == 13
+    assert len(warnings[TypesOfWarning.FUNCTION]) == 3
+    assert warnings[TypesOfWarning.VARIABLE][0].message == "Variables should be named in snake_case or UPPER_CASE (employeeCount)"
+    assert warnings[TypesOfWarning.VARIABLE][0].line == 9
+
+
+def test_custom_rules(copy_example, tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"C": {"Function": {"styles": ["camelCase"], "min_length": 5}}}))
+
+    warnings = check_example(copy_example, load_naming_rules(str(path)))
+
+    messages = [warning.message for warning in warnings[TypesOfWarning.FUNCTION]]
+    assert "Functions should have at least 5 characters (main)" in messages
+    assert "Functions should be named in camelCase (print_employee_info)" in messages
+    assert len(warnings[TypesOfWarning.VARIABLE]) == 13
+
+
+def test_underscore_names_are_ignored():
+    checker = NamingChecker(Languages.PYTHON)
+    identifiers = [("_", 1, TypesOfWarning.VARIABLE), ("__", 2, TypesOfWarning.VARIABLE), ("_private", 3, TypesOfWarning.VARIABLE)]
+
+    assert checker.check(identifiers) == []
+
+
+@pytest.mark.parametrize("rules", [
+    [],
+    {"Rust": {}},
+    {"C": []},
+    {"C": {"Constant": {}}},
+    {"C": {"Variable": "snake_case"}},
+    {"C": {"Variable": {"styles": "snake_case"}}},
+    {"C": {"Variable": {"styles": ["kebab-case"]}}},
+    {"C": {"Variable": {"min_length": True}}},
+    {"C": {"Variable": {"max_length": 3}}},
+])
+def test_invalid_rules_raise_value_error(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(rules))
+
+    with pytest.raises(ValueError):
+        load_naming_rules(str(path))
+
+
+def test_names_are_not_checked_twice_where_an_analyzer_checks_them(copy_example):
+    codes = [{'path': copy_example("test.py"), 'language': '.py'}]
+
+    # O pylint, habilitado por padrão, já verifica os nomes dos arquivos Python (invalid-name)
+    (result,), _ = analyze_batch(Languages.PYTHON, codes, analyzers=[])
+    assert result['naming_warnings'] == []
+
+    (result,), _ = analyze_batch(Languages.PYTHON, codes, analyzers=[], check_naming=True)
+    assert result['naming_warnings']
+    assert (result['naming_warnings'][0].message, result['naming_warnings'][0].line) == (
+        "Variables should be named in snake_case or UPPER_CASE (userName)", 1
+    )
@@ -0,0 +1,45 @@
+import json
+
+from perfeq.helpers.profiler import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.span("read", "io", file="a.py"):
+        pass
+    assert profiler.events == []
+
+
+def test_trace_events(tmp_path):
+    profiler = Profiler(True)
+    with profiler.span("discovery", "stage", children=True):
+        with profiler.span("cpplint", "analyzer", cpu=False, files=["a.c", "b.c"]):
+            pass
+    path = tmp_path / "results" / "perfeq_trace.json"
+    profiler.write_trace(str(path))
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    cpplint, discovery = trace["traceEvents"]
+    assert (cpplint["name"], cpplint["cat"], cpplint["ph"]) == ("cpplint", "analyzer", "X")
+    assert cpplint["args"]["files"] == ["a.c", "b.c"]
+    assert "cpu_ms" not in cpplint["args"] and "children_cpu_ms" not in cpplint["args"]
+    assert {"cpu_ms", "children_cpu_ms", "process_max_rss_kb", "children_max_rss_kb"} <= set(discovery["args"])
+    # O bloco interno termina antes e dentro do externo
+    assert discovery["ts"] <= cpplint["ts"] and cpplint["ts"] + cpplint["dur"] <= discovery["ts"] + discovery["dur"]
+
+
+def test_stage_summary_and_slowest_files():
+    profiler = Profiler(True)
+    profiler.add_events([
+        {"name": "pylint", "cat": "analyzer", "dur": 3e6, "args": {"cpu_ms": 2000, "files": ["a.py", "b.py"], "process_max_rss_kb": 10, "children_max_rss_kb": None}},
+        {"name": "cpplint", "cat": "analyzer", "dur": 1e6, "args": {"files": ["c.c"], "process_max_rss_kb": 20, "children_max_rss_kb": 30}},
+        {"name": "read", "cat": "io", "dur": 1e6, "args": {"cpu_ms": 500, "file": "a.py", "process_max_rss_kb": 10, "children_max_rss_kb": None}},
+    ])
+
+    assert profiler.stage_summary() == [
+        ("analyzer", "pylint", 1, 3.0, 2.0, 10),
+        ("analyzer", "cpplint", 1, 1.0, None, 30),
+        ("io", "read", 1, 1.0, 0.5, 10),
+    ]
+    assert profiler.slowest_files(2) == [("a.py", 2.5, {"pylint": 1.5, "read": 1.0}), ("b.py", 1.5, {"pylint": 1.5})]
@@ -0,0 +1,52 @@
+import pytest
+
+from perfeq.helpers.python_variable_counter import python_variable_counter
+from perfeq.models.source_file import SourceFile
+from perfeq.utils.enums import Languages, TypesOfWarning
+
+
+def test_example(copy_example):
+    path = copy_example("test.py")
+    with open(path, encoding="utf8") as file:
+        source = SourceFile(path, Languages.PYTHON, file.read())
+    identifiers = []
+
+    assert python_variable_counter(source, identifiers) == (11, 5)
+    assert source.lines_of_code == 58
+    assert identifiers[0] == ("userName", 1, TypesOfWarning.VARIABLE)
+    assert sum(kind == TypesOfWarning.FUNCTION for _, _, kind in identifiers) == 5
+
+
+@pytest.mark.parametrize("code, counts, names", [
+    ("a = b = 1\n", (2, 0), ["a", "b"]),
+    ("first, (second, *rest) = values\n", (1, 0), ["first", "second", "rest"]),
+    ("total: int = 0\ntotal += 1\n", (2, 0), ["total"]),
+    ("self.value = 1\nitems[0] = 2\n", (2, 0), []),
+    ("async def fetch():\n    pass\ndef outer():\n    def inner():\n        pass\n", (0, 3), ["fetch", "outer", "inner"]),
+])
+def test_snippets(code, counts, names):
+    identifiers = []
+    assert python_variable_counter(code, identifiers) == counts
+    assert [name for name, _, _ in identifiers] == names
+
+
+def test_code_with_syntax_errors_is_counted_with_the_fallback():
+    code = "def broken() -> :\nvalue = 1\nif value == 2\ndef fine(a):\n    x = 3\n"
+    source = SourceFile("broken.py", Languages.PYTHON, code)
+    identifiers = []
+
+    assert source.tree is None and isinstance(source.syntax_error, SyntaxError)
+    assert python_variable_counter(source, identifiers) == (2, 1)
+    assert identifiers == [
+        ("value", 2, TypesOfWarning.VARIABLE), ("fine", 4, TypesOfWarning.FUNCTION), ("x", 5, TypesOfWarning.VARIABLE),
+    ]
+
+
+@pytest.mark.parametrize("text, lines", [("", 0), ("a", 1), ("a\n", 1), ("a\r\nb\rc\n\n", 4)])
+def test_lines_are_counted_without_splitting(text, lines):
+    assert SourceFile("a.c", Languages.C, text).lines_of_code == lines
+
+
+def test_c_files_are_not_parsed_as_python():
+    source = SourceFile("a.c", Languages.C, "int main() { return 0; }\n")
+    assert source.tree is None and source.syntax_error is None
@@ -0,0 +1,53 @@
+import pickle
+import sqlite3
+
+from perfeq.helpers.result_cache import ResultCache
+
+VALUE = {'warnings': [], 'lines_of_code': 10}
+
+
+def make_cache(directory, entries):
+    size = len(pickle.dumps(VALUE, protocol=pickle.HIGHEST_PROTOCOL))
+    return ResultCache(str(directory), max_size=size * entries, settings="", timeout=0.1)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, 2)
+    cache.put_many([("a", VALUE)])
+    cache.put_many([("b", VALUE)])
+    # Lido por último, "a" passa a ser mais recente do que "b"
+    assert cache.get("a") == VALUE
+    cache.put_many([("c", VALUE)])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == VALUE
+    assert cache.get("c") == VALUE
+    cache.close()
+
+
+def test_entries_survive_reopening(tmp_path):
+    cache = make_cache(tmp_path, 2)
+    cache.put_many([("a", VALUE), (None, VALUE)])
+    cache.close()
+
+    cache = make_cache(tmp_path, 2)
+    assert cache.get("a") == VALUE
+    assert cache.get(None) is None
+    cache.close()
+
+
+def test_locked_cache_is_a_cache_miss(tmp_path):
+    cache = make_cache(tmp_path, 4)
+    cache.put_many([("a", VALUE)])
+    other = sqlite3.connect(str(tmp_path / "results.sqlite3"))
+    other.execute("BEGIN IMMEDIATE")
+
+    cache.put_many([("b", VALUE)])
+    # A leitura funciona com o banco bloqueado para escrita (WAL)
+    assert cache.get("a") == VALUE
+    cache.commit()
+    other.rollback()
+    other.close()
+
+    assert cache.get("b") is None
+    cache.close()
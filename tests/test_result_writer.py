@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from perfeq.constants import CSV_HEADER
+from perfeq.helpers.result_writer import CsvResultWriter, JsonLinesResultWriter, ParquetResultWriter, read_result_rows
+from perfeq.models.code import Code
+from perfeq.models.warning_message import WarningMessage
+from perfeq.models.warning_store import WarningStore
+from perfeq.utils.enums import TypesOfWarning
+
+WARNINGS = [
+    WarningMessage("Missing space before {", 3, TypesOfWarning.FORMATTING),
+    WarningMessage("Variable should be named in snake_case (userName)", 1, TypesOfWarning.VARIABLE),
+]
+
+
+def make_code(path, warnings=None, lines_of_code=10, variables_qty=4, functions_qty=0):
+    # Uma lista ou a visão de um WarningStore
+    warnings = [] if warnings is None else warnings
+    counts = {kind: sum(warning.type == kind for warning in warnings) for kind in TypesOfWarning}
+    return Code(
+        path, warnings, lines_of_code, variables_qty, functions_qty,
+        counts[TypesOfWarning.VARIABLE], counts[TypesOfWarning.FUNCTION], counts[TypesOfWarning.FORMATTING],
+    )
+
+
+def test_csv_rows(tmp_path):
+    path = tmp_path / "results" / "perfeq_output.csv"
+    writer = CsvResultWriter(str(path))
+    writer.write(make_code("a.py", list(WARNINGS)))
+    writer.write(make_code("b.py"))
+    writer.close()
+
+    assert path.read_text().splitlines() == [
+        CSV_HEADER,
+        "a.py,10,2,20.00,1,4,25.00,0,0,0.00,1,10.00",
+        "b.py,10,0,0.00,0,4,0.00,0,0,0.00,0,0.00",
+    ]
+
+
+def test_resume_drops_the_incomplete_last_row(tmp_path):
+    path = tmp_path / "perfeq_output.csv"
+    path.write_text(
+        CSV_HEADER + "\n"
+        "dir,with,commas/a.py,10,2,20.00,1,4,25.00,0,0,0.00,1,10.00\n"
+        "b.py,10,0,0.00,0,4,0.00,0,0,0.00,0,0.00\n"
+        "c.py,10,0,0."
+    )
+
+    writer = CsvResultWriter(str(path), resume=True)
+    assert writer.done_ids == {"dir,with,commas/a.py", "b.py"}
+    writer.write(make_code("c.py"))
+    writer.close()
+
+    rows = read_result_rows(str(path))
+    assert list(rows) == ["dir,with,commas/a.py", "b.py", "c.py"]
+    assert rows["c.py"] == "c.py,10,0,0.00,0,4,0.00,0,0,0.00,0,0.00"
+
+
+def test_kept_rows_replace_the_file_only_when_closed(tmp_path):
+    path = tmp_path / "perfeq_output.csv"
+    path.write_text(CSV_HEADER + "\nold.py,1,0,0.00,0,0,0.00,0,0,0.00,0,0.00\n")
+
+    writer = CsvResultWriter(str(path), kept_rows=["b.py,10,0,0.00,0,4,0.00,0,0,0.00,0,0.00"])
+    writer.write(make_code("c.py"))
+    assert "old.py" in path.read_text()
+    writer.close()
+
+    assert list(read_result_rows(str(path))) == ["b.py", "c.py"]
+
+
+def test_json_lines_tables(tmp_path):
+    paths = [str(tmp_path / f"perfeq_{name}.jsonl") for name in ("output", "warnings", "messages")]
+    store = WarningStore()
+    writer = JsonLinesResultWriter(*paths, store)
+    writer.write(make_code("a.py", store.add("a.py", WARNINGS)))
+    store.release()
+    writer.write(make_code("b.py", store.add("b.py", WARNINGS[:1]), lines_of_code=0, variables_qty=0))
+    store.release()
+    writer.close()
+
+    output, warnings, messages = ([json.loads(line) for line in open(path)] for path in paths)
+    assert [row["code_id"] for row in output] == ["a.py", "b.py"]
+    assert output[0]["WPL"] == 20.0
+    # As razões com denominador zero são sempre números reais
+    assert output[1]["WPL"] == 0.0 and isinstance(output[1]["WPL"], float)
+    assert [(row["code_id"], row["line"], row["type"]) for row in warnings] == [
+        ("a.py", 1, "Variable"), ("a.py", 3, "Formatting"), ("b.py", 3, "Formatting"),
+    ]
+    message_ids = {row["message"]: row["message_id"] for row in messages}
+    assert warnings[1]["message_id"] == warnings[2]["message_id"] == message_ids["Missing space before {"]
+
+
+def test_parquet_tables(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    paths = [str(tmp_path / f"perfeq_{name}.parquet") for name in ("output", "warnings", "messages")]
+    store = WarningStore()
+    writer = ParquetResultWriter(*paths, store, row_group_size=1)
+    writer.write(make_code("a.py", store.add("a.py", WARNINGS)))
+    store.release()
+    writer.close()
+
+    output, warnings, messages = (parquet.read_table(path).to_pylist() for path in paths)
+    assert [row["code_id"] for row in output] == ["a.py"]
+    assert [(row["line"], row["type"]) for row in warnings] == [(1, "Variable"), (3, "Formatting")]
+    assert len(messages) == 2
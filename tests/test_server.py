@@ -0,0 +1,89 @@
+import json
+import socket
+import threading
+import time
+from urllib import request
+
+import pytest
+
+from perfeq.analyzer.server import is_loopback, serve
+from perfeq.helpers.server_client import code_from_result, request_analysis
+
+# Sem os analisadores externos, apenas os contadores e o verificador de nomes rodam
+NO_ANALYZERS = {"pylint": {"enabled": False}, "cpplint": {"enabled": False}}
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def server_address():
+    """
+    Runs `perfeq serve` in a thread on a free local port and stops it through /shutdown.
+    """
+    port = free_port()
+    thread = threading.Thread(
+        target=serve, args=("127.0.0.1", port), kwargs={'use_cache': False, 'analyzer_config': NO_ANALYZERS},
+    )
+    thread.start()
+    address = f"127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while True:
+        try:
+            with request.urlopen(f"http://{address}/status", timeout=1) as response:
+                json.load(response)
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.05)
+    yield address
+    with request.urlopen(request.Request(f"http://{address}/shutdown", data=b""), timeout=5) as response:
+        assert json.load(response) == {'status': "stopping"}
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_a_file_makes_the_round_trip_through_the_server(server_address, copy_example):
+    path = copy_example("test.c")
+
+    result = request_analysis(server_address, path)
+    code = code_from_result(result)
+
+    assert code.id == path
+    assert (code.lines_of_code, code.variables_qty, code.functions_qty) == (68, 25, 7)
+    variable_warnings = [warning for warning in result['warnings'] if warning['type'] == "Variable"]
+    assert code.variables_warnings_qty == len(variable_warnings) > 0
+    assert result['analyzer_failures'] == [] and result['cached'] is False
+    with request.urlopen(f"http://{server_address}/status", timeout=5) as response:
+        assert json.load(response)['requests'] == 1
+
+
+def test_refused_requests_raise_value_error(server_address, tmp_path):
+    (tmp_path / "notes.txt").write_text("not code\n")
+    with pytest.raises(ValueError, match="unsupported file type"):
+        request_analysis(server_address, str(tmp_path / "notes.txt"))
+    with pytest.raises(ValueError):
+        request_analysis(server_address, str(tmp_path / "missing.c"), timeout=5)
+
+
+def test_an_unreachable_server_raises_connection_error(tmp_path):
+    with pytest.raises(ConnectionError):
+        request_analysis(f"127.0.0.1:{free_port()}", str(tmp_path / "a.c"), timeout=2)
+
+
+def test_only_loopback_addresses_are_local():
+    assert is_loopback("127.0.0.1")
+    assert is_loopback("::1")
+    assert is_loopback("localhost")
+    assert not is_loopback("0.0.0.0")
+    assert not is_loopback("")
+    assert not is_loopback("192.168.0.10")
+
+
+def test_a_non_loopback_host_requires_allow_remote():
+    with pytest.raises(ValueError, match="--allow-remote"):
+        serve("0.0.0.0", free_port(), use_cache=False, analyzer_config=NO_ANALYZERS)
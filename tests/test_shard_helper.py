@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from perfeq.helpers.shard_helper import order_partials, parse_shard, partial_name, shard_of
+
+
+def test_shards_are_parsed_as_index_and_count():
+    assert parse_shard("2/8") == (2, 8)
+    assert parse_shard("1/1") == (1, 1)
+
+
+@pytest.mark.parametrize("value", ["2", "0/4", "5/4", "a/4", "1/", "-1/4"])
+def test_invalid_shards_are_rejected(value):
+    with pytest.raises(ValueError, match="invalid shard"):
+        parse_shard(value)
+
+
+def test_every_file_belongs_to_exactly_one_shard():
+    paths = [f"dir{index % 7}/file{index}.py" for index in range(1000)]
+    shards = [shard_of(path, 4) for path in paths]
+
+    assert set(shards) == {1, 2, 3, 4}
+    # O hash espalha os arquivos: nenhuma parte fica com muito mais que um quarto deles
+    assert max(shards.count(shard) for shard in range(1, 5)) < 300
+
+
+def test_the_shard_depends_only_on_the_relative_path():
+    assert shard_of("src/a.py", 8) == shard_of("src/a.py", 8)
+    assert shard_of(os.path.join("src", "a.py"), 8) == shard_of("src/a.py", 8)
+    assert shard_of("src/a.py", 1) == 1
+
+
+def test_partials_are_ordered_by_shard():
+    paths = [f"results/{partial_name((index, 3))}.csv" for index in (3, 1, 2)]
+
+    assert order_partials(paths) == [f"results/{partial_name((index, 3))}.csv" for index in (1, 2, 3)]
+
+
+@pytest.mark.parametrize("names, message", [
+    ([], "no partial results files"),
+    (["perfeq_output.csv"], "is not a partial results file"),
+    (["perfeq_output.shard-1-of-2.csv", "perfeq_output.shard-2-of-3.csv"], "different numbers of shards"),
+    (["perfeq_output.shard-1-of-2.csv", "perfeq_output.shard-1-of-2.csv"], "given twice"),
+])
+def test_inconsistent_partials_are_rejected(names, message):
+    with pytest.raises(ValueError, match=message):
+        order_partials(names)
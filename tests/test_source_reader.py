@@ -0,0 +1,94 @@
+import codecs
+import threading
+import time
+
+import pytest
+
+from perfeq.helpers.source_reader import SourceReader, count_lines, detect_encoding, read_source
+
+
+@pytest.mark.parametrize("head, language, encoding", [
+    (codecs.BOM_UTF8 + b"x = 1\n", '.c', "utf-8-sig"),
+    (codecs.BOM_UTF16_LE + "x".encode("utf-16-le"), '.c', "utf-16"),
+    (codecs.BOM_UTF32_LE + "x".encode("utf-32-le"), '.c', "utf-32"),
+    (b"# -*- coding: latin-1 -*-\nx = 1\n", '.py', "iso8859-1"),
+    (b"#!/usr/bin/env python\n# vim: set fileencoding=cp1252 :\n", '.py', "cp1252"),
+    (b"\n\n# coding: latin-1\n", '.py', "utf-8"),
+    (b"# coding: latin-1\n", '.c', "utf-8"),
+    (b"# coding: unknown-encoding\n", '.py', "utf-8"),
+    (b"int main() {}\n", '.c', "utf-8"),
+])
+def test_the_encoding_is_detected_from_the_first_bytes(head, language, encoding):
+    assert detect_encoding(head, language) == encoding
+
+
+@pytest.mark.parametrize("mmap_threshold", [1, 1 << 30])
+def test_files_are_decoded_with_their_encoding(tmp_path, mmap_threshold):
+    path = tmp_path / "a.py"
+    path.write_bytes("# coding: latin-1\nnome = 'ação'\n".encode("latin-1"))
+
+    text, encoding = read_source(str(path), '.py', mmap_threshold=mmap_threshold)
+
+    assert encoding == "iso8859-1"
+    assert text == "# coding: latin-1\nnome = 'ação'\n"
+
+
+def test_undecodable_bytes_and_empty_files_are_read(tmp_path):
+    broken = tmp_path / "broken.c"
+    broken.write_bytes(b"int x = 1; // \xff\n")
+    empty = tmp_path / "empty.c"
+    empty.write_bytes(b"")
+
+    assert read_source(str(broken), '.c', mmap_threshold=1)[0] == "int x = 1; // �\n"
+    assert read_source(str(empty), '.c', mmap_threshold=1) == ("", "utf-8")
+
+
+@pytest.mark.parametrize("text, lines", [
+    ("", 0),
+    ("a", 1),
+    ("a\n", 1),
+    ("a\nb", 2),
+    ("a\r\nb\r\n", 2),
+    ("a\rb\r", 2),
+    ("\n\n", 2),
+])
+def test_lines_are_counted_by_their_breaks(text, lines):
+    assert count_lines(text) == lines
+
+
+def test_files_wait_until_the_budget_has_room(tmp_path):
+    paths = []
+    for name in ("a.c", "b.c", "c.c"):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 60)
+        paths.append(str(path))
+    reader = SourceReader(budget=100)
+    peaks = []
+
+    def read(path):
+        with reader.reserve(path) as size:
+            assert size == 60
+            peaks.append(reader.in_flight)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=read, args=(path,)) for path in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Dois arquivos de 60 bytes não cabem juntos num orçamento de 100
+    assert peaks == [60, 60, 60]
+    assert reader.in_flight == 0
+
+
+def test_a_file_larger_than_the_budget_is_processed_alone(tmp_path):
+    path = tmp_path / "large.c"
+    path.write_bytes(b"x" * 500)
+    reader = SourceReader(budget=100)
+
+    with reader.reserve(str(path)) as size:
+        assert size == 500
+    with reader.reserve(str(tmp_path / "missing.c")) as size:
+        assert size == 0
+    assert reader.in_flight == 0
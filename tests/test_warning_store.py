@@ -0,0 +1,51 @@
+import pickle
+
+import pytest
+
+from perfeq.models.warning_message import WarningMessage
+from perfeq.models.warning_store import WarningStore
+from perfeq.utils.enums import TypesOfWarning
+
+SPACE = "Missing space before {"
+
+
+def as_tuples(warnings):
+    return [(warning.message, warning.line, warning.type) for warning in warnings]
+
+
+def test_views_are_sorted_by_line_and_share_the_messages():
+    store = WarningStore()
+    first = store.add("a.c", [
+        WarningMessage(SPACE, 7, TypesOfWarning.FORMATTING),
+        WarningMessage("Functions should be named in snake_case (doIt)", 2, TypesOfWarning.FUNCTION),
+    ])
+    second = store.add("b.c", [WarningMessage(SPACE, 1, TypesOfWarning.FORMATTING)])
+    empty = store.add("c.c", [])
+
+    assert as_tuples(first) == [
+        ("Functions should be named in snake_case (doIt)", 2, TypesOfWarning.FUNCTION),
+        (SPACE, 7, TypesOfWarning.FORMATTING),
+    ]
+    assert as_tuples(second[-1:]) == [(SPACE, 1, TypesOfWarning.FORMATTING)]
+    assert len(empty) == 0 and len(store) == 3 and len(store.messages) == 2
+    assert list(second.rows()) == [(1, TypesOfWarning.FORMATTING, store.messages.get_id(SPACE))]
+    assert [row[0] for row in store.rows()] == ["a.c", "a.c", "b.c"]
+    with pytest.raises(IndexError):
+        second[1]
+
+
+def test_release_keeps_only_the_messages():
+    store = WarningStore()
+    store.add("a.c", [WarningMessage(SPACE, 7, TypesOfWarning.FORMATTING)])
+    store.release()
+
+    view = store.add("b.c", [WarningMessage(SPACE, 3, TypesOfWarning.FORMATTING)])
+
+    assert len(store) == 1 and list(store.rows()) == [("b.c", 3, TypesOfWarning.FORMATTING, SPACE)]
+    assert store.messages.messages == [SPACE]
+    assert as_tuples(view) == [(SPACE, 3, TypesOfWarning.FORMATTING)]
+
+
+def test_warning_messages_survive_pickling():
+    warning = pickle.loads(pickle.dumps(WarningMessage(SPACE, 7, TypesOfWarning.FORMATTING)))
+    assert as_tuples([warning]) == [(SPACE, 7, TypesOfWarning.FORMATTING)]